@@ -0,0 +1,287 @@
+"""
+Admin Blueprint - investment requirement seeds and customer inquiries
+"""
+import os
+from datetime import datetime, timezone
+
+from flask import (Blueprint, Response, abort, current_app, flash, jsonify, redirect, render_template, request,
+                   send_file, url_for)
+from flask_login import current_user, login_required
+
+from app.mail import send_email
+from app.visa_requirements import list_countries, reload_seed
+from models import db, Inquiry
+
+admin = Blueprint('admin', __name__)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@admin.route('/admin/import-investment-requirements', methods=['GET','POST'])
+@admin.route('/admin/import-visa-requirements', methods=['GET','POST'])
+@login_required
+def admin_import_investment():
+    # Simple admin check
+    if not getattr(current_user, 'is_admin', False):
+        return render_template('admin_import_investment.html', countries=[])
+
+    # show countries list on GET
+    countries = list_countries()
+
+    if request.method == 'POST':
+        if 'file' not in request.files:
+            flash('No file selected')
+            return redirect(request.url)
+        file = request.files['file']
+        if file.filename == '':
+            flash('No selected file')
+            return redirect(request.url)
+        # Validate JSON structure
+        try:
+            import json
+            data = json.load(file)
+        except Exception as e:
+            flash('Invalid JSON file')
+            return redirect(request.url)
+
+        # Validate structure using script helper
+        try:
+            from scripts.import_visa_requirements import validate_structure
+            ok, err = validate_structure(data)
+            if not ok:
+                flash(f'Invalid schema: {err}')
+                return redirect(request.url)
+        except Exception as e:
+            flash('Validation routine not available')
+            return redirect(request.url)
+
+        # Write to seed and reload
+        try:
+            # Write to the canonical seed path used by app.visa_requirements
+            try:
+                from app.visa_requirements import SEED_PATH as seed_path
+            except Exception:
+                seed_path = os.path.join(PROJECT_ROOT, 'data', 'investment_requirements_seed.json')
+            os.makedirs(os.path.dirname(seed_path), exist_ok=True)
+            with open(seed_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Reload in-memory representation
+            try:
+                reload_seed()
+            except Exception:
+                pass
+            flash('Investment requirements imported successfully')
+            return redirect(url_for('main.investment_requirements'))
+        except Exception as e:
+            print('Import error:', e)
+            flash('Error writing seed file')
+            return redirect(request.url)
+
+    return render_template('admin_import_investment.html', countries=countries)
+
+
+@admin.route('/admin/investment-management', methods=['GET','POST'])
+@admin.route('/admin/visa-management', methods=['GET','POST'])
+@login_required
+def admin_investment_manage():
+    # admin UI to view countries and restore defaults
+    if not getattr(current_user, 'is_admin', False):
+        return render_template('admin_investment_manage.html', countries=[])
+
+    from app.visa_requirements import list_countries, restore_default_seed
+    countries = list_countries()
+
+    if request.method == 'POST':
+        action = request.form.get('action')
+        if action == 'restore':
+            restored = restore_default_seed()
+            if restored is None:
+                flash('Failed to restore default seed')
+            else:
+                flash('Default seed restored successfully')
+            return redirect(url_for('admin.admin_investment_manage'))
+        elif action == 'download':
+            try:
+                from app.visa_requirements import SEED_PATH as seed_path
+            except Exception:
+                seed_path = os.path.join(PROJECT_ROOT, 'data', 'investment_requirements_seed.json')
+            if os.path.exists(seed_path):
+                return send_file(seed_path, as_attachment=True)
+            else:
+                flash('Seed file not found')
+                return redirect(url_for('admin.admin_investment_manage'))
+
+    return render_template('admin_investment_manage.html', countries=countries)
+
+
+# ---------------- Admin: inquiries ----------------
+@admin.route('/admin/inquiries')
+@login_required
+def admin_inquiries():
+    if not getattr(current_user, 'is_admin', False):
+        flash('Unauthorized', 'danger')
+        return redirect(url_for('main.index'))
+    status = request.args.get('status')  # optional filter
+    page = int(request.args.get('page', 1))
+    per_page = 5
+    query = Inquiry.query
+    if status == 'unresponded':
+        query = query.filter(Inquiry.response == None, Inquiry.status == 'open')
+    elif status == 'closed':
+        query = query.filter(Inquiry.status == 'closed')
+    pagination = query.order_by(Inquiry.created_at.asc()).paginate(page=page, per_page=per_page, error_out=False)
+    inquiries = pagination.items
+    return render_template('admin_inquiries.html', inquiries=inquiries, filter_status=status, pagination=pagination)
+
+
+@admin.route('/admin/inquiries/respond/<int:inq_id>', methods=['GET','POST'])
+@login_required
+def admin_respond_inquiry(inq_id):
+    if not getattr(current_user, 'is_admin', False):
+        flash('Unauthorized', 'danger')
+        return redirect(url_for('main.index'))
+    from flask import abort
+    inq = db.session.get(Inquiry, inq_id)
+    if not inq:
+        abort(404)
+    if request.method == 'POST':
+        response = request.form.get('response','').strip()
+        if not response:
+            flash('Response cannot be empty', 'danger')
+            return redirect(request.url)
+        inq.response = response
+        inq.responded_at = datetime.now(timezone.utc)
+        inq.responded_by = current_user.id
+        inq.status = 'responded'
+        db.session.commit()
+        # Email using template
+        try:
+            if not current_app.config.get('TESTING', False):
+                # render email body from templates
+                body = render_template('emails/inquiry_response.txt', inquiry=inq, response=response)
+                html = render_template('emails/inquiry_response.html', inquiry=inq, response=response)
+                send_email(inq.email, f'Response to your inquiry', body=body, html_content=html)
+        except Exception as e:
+            print('Could not send response email:', e)
+        flash('Response saved and sent', 'success')
+        return redirect(url_for('admin.admin_inquiries'))
+    return render_template('admin_respond.html', inquiry=inq)
+
+
+@admin.route('/admin/inquiries/quick_reply/<int:inq_id>', methods=['POST'])
+@login_required
+def admin_quick_reply(inq_id):
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from flask import abort
+    inq = db.session.get(Inquiry, inq_id)
+    if not inq:
+        abort(404)
+    # Create a quick templated response
+    response = render_template('emails/inquiry_response.txt', inquiry=inq, response='')
+    inq.response = response
+    inq.responded_at = datetime.now(timezone.utc)
+    inq.responded_by = current_user.id
+    inq.status = 'responded'
+    db.session.commit()
+    # Send email
+    try:
+        if not current_app.config.get('TESTING', False):
+            body = response
+            html = render_template('emails/inquiry_response.html', inquiry=inq, response=response)
+            send_email(inq.email, f'Response to your inquiry', body=body, html_content=html)
+    except Exception as e:
+        print('Could not send quick reply email:', e)
+    return ('OK', 200)
+
+
+@admin.route('/admin/inquiries/close/<int:inq_id>', methods=['POST'])
+@login_required
+def admin_close_inquiry(inq_id):
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from flask import abort
+    inq = db.session.get(Inquiry, inq_id)
+    if not inq:
+        abort(404)
+    inq.status = 'closed'
+    inq.closed_at = datetime.now(timezone.utc)
+    db.session.commit()
+    return ('OK', 200)
+
+
+@admin.route('/admin/jobs-cache')
+@login_required
+def admin_jobs_cache():
+    """Hit/miss counters of this worker's job search cache."""
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from app.jobs.cache import get_cache
+    cache = get_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    metrics = cache.metrics()
+    limiter = current_app.extensions.get('jobs_prefetch')
+    if limiter is not None:
+        metrics['prefetch'] = dict(limiter.stats)
+    return jsonify(metrics)
+
+
+@admin.route('/admin/eligibility-cache')
+@login_required
+def admin_eligibility_cache():
+    """Hit/miss counters of this worker's eligibility result cache."""
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from app.residencies.eligibility_cache import get_eligibility_cache
+    cache = get_eligibility_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    return jsonify(cache.metrics())
+
+
+@admin.route('/admin/profiles')
+@login_required
+def admin_profiles():
+    """Slowest endpoints among the sampled request profiles."""
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from app.profiler import get_profiler
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'enabled': False})
+    return jsonify({
+        'enabled': True,
+        'sample_rate': profiler.rate,
+        'mode': profiler.mode,
+        'endpoints': profiler.store.slowest_endpoints(request.args.get('limit', 20, type=int)),
+    })
+
+
+@admin.route('/admin/profiles/<int:sample_id>')
+@login_required
+def admin_profile_sample(sample_id):
+    """One sampled request, with its folded stacks."""
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from app.profiler import format_folded, get_profiler
+    profiler = get_profiler()
+    sample = profiler.store.get(sample_id) if profiler is not None else None
+    if sample is None:
+        abort(404)
+    if request.args.get('format') == 'folded':
+        return Response(format_folded(sample['folded']), mimetype='text/plain')
+    return jsonify(sample)
+
+
+@admin.route('/admin/profiles/flame')
+@login_required
+def admin_profile_flame():
+    """Folded stacks of one endpoint's samples, for flamegraph.pl or speedscope."""
+    if not getattr(current_user, 'is_admin', False):
+        return ('Unauthorized', 403)
+    from app.profiler import format_folded, get_profiler
+    profiler = get_profiler()
+    endpoint = request.args.get('endpoint')
+    if profiler is None or not endpoint:
+        abort(404)
+    return Response(format_folded(profiler.store.flame(endpoint)), mimetype='text/plain')
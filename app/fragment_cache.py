@@ -0,0 +1,88 @@
+"""Jinja fragment caching and per-process template globals.
+
+Adds a ``{% cache %}`` tag that stores the rendered HTML of a block:
+
+    {% cache 'navbar', current_locale(), current_user.is_authenticated, timeout=3600 %}
+        ...
+    {% endcache %}
+
+The first argument names the fragment, the remaining ones form its key;
+``timeout`` (seconds) is optional. Fragments live in the page cache backend
+and share its version, so a deploy or template edit invalidates them too.
+With the page cache disabled the block is simply rendered every time.
+
+Company info and the ``now()`` helper are registered as Jinja globals once
+per process instead of being rebuilt by a context processor on every render.
+"""
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+from flask import current_app, has_request_context, request
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+DEFAULT_FRAGMENT_TIMEOUT = 3600
+DEFAULT_LOCALE = 'en'
+
+COMPANY_INFO = MappingProxyType({
+    "name": "Aidni Global LLP",
+    "contact_number": "+919879428291",
+    "email": "phoenixairticket@gmail.com",
+    "address": "Aidni Global LLP, India"
+})
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+def current_locale() -> str:
+    """Best supported locale for the current request (used in fragment keys)."""
+    default = current_app.config.get('DEFAULT_LOCALE', DEFAULT_LOCALE)
+    if not has_request_context():
+        return default
+    supported = current_app.config.get('SUPPORTED_LOCALES', (default,))
+    return request.accept_languages.best_match(supported) or default
+
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        keys = [parser.parse_expression()]
+        timeout = nodes.Const(None)
+        while parser.stream.skip_if('comma'):
+            if parser.stream.current.test('name:timeout') and parser.stream.look().test('assign'):
+                next(parser.stream)
+                next(parser.stream)
+                timeout = parser.parse_expression()
+            else:
+                keys.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render_cached', [nodes.List(keys), timeout])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, keys, timeout, caller):
+        state = current_app.extensions.get('page_cache')
+        if state is None or not state.enabled:
+            return caller()
+        key = f'fragment:{state.version}:' + ':'.join(str(k) for k in keys)
+        cached = state.backend.get(key)
+        if cached is not None:
+            return Markup(cached)
+        rendered = caller()
+        state.backend.set(key, str(rendered),
+                          timeout or current_app.config.get('FRAGMENT_CACHE_TIMEOUT', DEFAULT_FRAGMENT_TIMEOUT))
+        return rendered
+
+
+def init_app(app):
+    """Enable the {% cache %} tag and register the shared template globals."""
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.globals.update(
+        company_info=COMPANY_INFO,
+        now=utcnow,
+        current_locale=current_locale,
+    )
@@ -0,0 +1,303 @@
+"""Image intake helpers.
+
+Uploaded images are inspected by reading only their header: format and
+dimensions are parsed straight from the first bytes of the stream, so
+oversized images (decompression bombs) are rejected before any pixel data
+is decoded. Accepted images get normalised, size-capped derivatives
+(display copy + thumbnail, JPEG and WebP) rendered in a background worker
+so pages can serve small files instead of the raw upload.
+"""
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional, Dict
+
+from flask import current_app, has_app_context
+
+# Defaults used when the app config does not override them
+DEFAULT_MAX_PIXELS = 40_000_000        # ~40 megapixels
+DEFAULT_MAX_DIMENSION = 10_000         # longest side in pixels
+DEFAULT_DISPLAY_SIZE = 1600            # longest side of the display derivative
+DEFAULT_THUMB_SIZE = 256               # longest side of the thumbnail
+DEFAULT_FORMATS = ('jpeg', 'webp')
+DEFAULT_WORKERS = 2
+
+# How far into a JPEG we are willing to walk looking for the SOF marker
+_JPEG_SCAN_LIMIT = 512 * 1024
+
+_EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp'}
+
+
+class ImageInfo(NamedTuple):
+    format: str
+    width: int
+    height: int
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+    @property
+    def aspect_ratio(self) -> float:
+        return self.width / self.height if self.height else 0.0
+
+
+class ImageRejected(ValueError):
+    """Raised when an upload is not a supported image or is too large."""
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+# ---------------------------------------------------------------------------
+# Header parsing
+# ---------------------------------------------------------------------------
+
+def _read_exact(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ImageRejected('Truncated image header.')
+    return data
+
+
+def _probe_png(head: bytes) -> ImageInfo:
+    # 8 byte signature, then the IHDR chunk: length(4) type(4) width(4) height(4)
+    if head[12:16] != b'IHDR':
+        raise ImageRejected('Invalid PNG header.')
+    width, height = struct.unpack('>II', head[16:24])
+    return ImageInfo('png', width, height)
+
+
+def _probe_gif(head: bytes) -> ImageInfo:
+    width, height = struct.unpack('<HH', head[6:10])
+    return ImageInfo('gif', width, height)
+
+
+def _probe_webp(head: bytes) -> ImageInfo:
+    chunk = head[12:16]
+    if chunk == b'VP8 ':
+        # Lossy: frame tag (3 bytes) + start code (3 bytes) + 14 bit dimensions
+        width, height = struct.unpack('<HH', head[26:30])
+        return ImageInfo('webp', width & 0x3FFF, height & 0x3FFF)
+    if chunk == b'VP8L':
+        bits = struct.unpack('<I', head[21:25])[0]
+        return ImageInfo('webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if chunk == b'VP8X':
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return ImageInfo('webp', width, height)
+    raise ImageRejected('Unsupported WebP variant.')
+
+
+def _probe_jpeg(stream, start: int) -> ImageInfo:
+    # Walk the marker segments until a Start Of Frame marker is found,
+    # seeking over segment payloads (EXIF, ICC profiles) instead of reading them.
+    stream.seek(start + 2)
+    while stream.tell() - start < _JPEG_SCAN_LIMIT:
+        byte = stream.read(1)
+        if not byte:
+            break
+        if byte != b'\xff':
+            continue
+        marker = stream.read(1)
+        while marker == b'\xff':
+            marker = stream.read(1)
+        if not marker:
+            break
+        code = marker[0]
+        if code in (0x01, 0xD8) or 0xD0 <= code <= 0xD7:
+            continue  # standalone markers have no payload
+        if code == 0xD9:
+            break
+        length = struct.unpack('>H', _read_exact(stream, 2))[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>xHH', _read_exact(stream, 5))
+            return ImageInfo('jpeg', width, height)
+        stream.seek(length - 2, os.SEEK_CUR)
+    raise ImageRejected('Could not find JPEG dimensions.')
+
+
+def probe_image(stream) -> ImageInfo:
+    """Return format and dimensions by reading only the image header.
+
+    The stream position is restored afterwards so the upload can still be saved.
+    """
+    start = stream.tell()
+    try:
+        head = stream.read(32)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and len(head) >= 24:
+            return _probe_png(head)
+        if head[:6] in (b'GIF87a', b'GIF89a') and len(head) >= 10:
+            return _probe_gif(head)
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) >= 30:
+            return _probe_webp(head)
+        if head[:2] == b'\xff\xd8':
+            return _probe_jpeg(stream, start)
+        raise ImageRejected('Unsupported image format.')
+    except struct.error:
+        raise ImageRejected('Invalid image header.')
+    finally:
+        stream.seek(start)
+
+
+def check_image(stream, allowed_formats=None) -> ImageInfo:
+    """Probe an upload and enforce the configured size limits.
+
+    Raises ImageRejected for unsupported formats, empty images and images
+    whose dimensions exceed IMAGE_MAX_DIMENSION or IMAGE_MAX_PIXELS.
+    """
+    info = probe_image(stream)
+    if allowed_formats and info.format not in allowed_formats:
+        raise ImageRejected(f'Images must be one of: {", ".join(sorted(allowed_formats))}.')
+    if info.width <= 0 or info.height <= 0:
+        raise ImageRejected('Image has no pixels.')
+    max_dimension = _config('IMAGE_MAX_DIMENSION', DEFAULT_MAX_DIMENSION)
+    if max(info.width, info.height) > max_dimension:
+        raise ImageRejected(f'Image dimensions must not exceed {max_dimension}px.')
+    max_pixels = _config('IMAGE_MAX_PIXELS', DEFAULT_MAX_PIXELS)
+    if info.pixels > max_pixels:
+        raise ImageRejected('Image is too large to process.')
+    return info
+
+
+def check_image_file(path: str, allowed_formats=None) -> ImageInfo:
+    with open(path, 'rb') as f:
+        return check_image(f, allowed_formats)
+
+
+# ---------------------------------------------------------------------------
+# Derivatives
+# ---------------------------------------------------------------------------
+
+def derivative_dir(src_path: str) -> str:
+    return os.path.join(os.path.dirname(src_path), 'derivatives')
+
+
+def derivative_path(src_path: str, variant: str, fmt: str) -> str:
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    return os.path.join(derivative_dir(src_path), f'{stem}.{variant}.{_EXTENSIONS[fmt]}')
+
+
+def open_normalised(src_path: str, max_size: int):
+    from PIL import Image, ImageOps
+
+    # Probe the header here too, in case a file bypassed check_image; Pillow's own
+    # Image.MAX_IMAGE_PIXELS is process-wide and left alone for other image users
+    check_image_file(src_path)
+    img = Image.open(src_path)
+    # For JPEGs let the decoder downscale by a power of two while decoding
+    img.draft('RGB', (max_size, max_size))
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
+
+
+def save_derivative(img, dest: str, fmt: str):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = f'{dest}.tmp'
+    if fmt == 'webp':
+        img.save(tmp, 'WEBP', quality=80, method=4)
+    else:
+        img.save(tmp, 'JPEG', quality=85, optimize=True, progressive=True)
+    os.replace(tmp, dest)
+
+
+def render_derivatives(src_path: str, formats=None) -> Dict[str, str]:
+    """Render display and thumbnail derivatives next to the source image.
+
+    Returns a mapping like {'display.jpeg': path, 'thumb.webp': path}.
+    """
+    from PIL import features
+
+    check_image_file(src_path)
+    formats = formats or _config('IMAGE_DERIVATIVE_FORMATS', DEFAULT_FORMATS)
+    if 'webp' in formats and not features.check('webp'):
+        formats = [f for f in formats if f != 'webp']
+    sizes = {
+        'display': _config('IMAGE_DISPLAY_SIZE', DEFAULT_DISPLAY_SIZE),
+        'thumb': _config('IMAGE_THUMB_SIZE', DEFAULT_THUMB_SIZE),
+    }
+
+    outputs = {}
+    img = open_normalised(src_path, sizes['display'])
+    # Largest first so each smaller variant is resized from the previous one
+    for variant, size in sorted(sizes.items(), key=lambda item: -item[1]):
+        img.thumbnail((size, size))
+        for fmt in formats:
+            dest = derivative_path(src_path, variant, fmt)
+            save_derivative(img, dest, fmt)
+            outputs[f'{variant}.{fmt}'] = dest
+    return outputs
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_config('IMAGE_WORKERS', DEFAULT_WORKERS),
+                thread_name_prefix='image-derivatives',
+            )
+        return _executor
+
+
+def reset_executor(app=None):
+    """Forget the worker pool; its threads do not survive a fork."""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+def init_app(app):
+    from app import prefork
+    prefork.on_after_fork(app, reset_executor)
+
+
+def _run_in_context(app, fn, *args):
+    with app.app_context():
+        try:
+            return fn(*args)
+        except Exception as e:
+            print(f'Background image task {fn.__name__}{args} failed: {e}')
+            return None
+
+
+def submit_background(fn, *args):
+    """Run fn(*args) on the image worker pool inside an app context.
+
+    With IMAGE_DERIVATIVES_SYNC set (handy in tests) the work runs inline.
+    """
+    app = current_app._get_current_object()
+    if app.config.get('IMAGE_DERIVATIVES_SYNC', False):
+        from concurrent.futures import Future
+        future = Future()
+        future.set_result(_run_in_context(app, fn, *args))
+        return future
+    return _get_executor().submit(_run_in_context, app, fn, *args)
+
+
+def _render_and_warm(src_path: str):
+    from app.thumbnails import warm_thumbnails
+
+    outputs = render_derivatives(src_path)
+    warm_thumbnails(src_path)
+    return outputs
+
+
+def schedule_derivatives(src_path: str):
+    """Queue derivative and thumbnail rendering for an uploaded image; returns the Future."""
+    return submit_background(_render_and_warm, src_path)
@@ -0,0 +1,18 @@
+"""
+Jobs Blueprint - Handles job search and job application routes
+"""
+from flask import Blueprint
+
+jobs = Blueprint('jobs', __name__)
+
+
+def init_app(app):
+    from app.jobs import aggregator, cache, client, index, prefetch
+    client.init_app(app)
+    index.init_app(app)
+    cache.init_app(app)
+    aggregator.init_app(app)
+    prefetch.init_app(app)
+
+
+from . import routes, api
@@ -0,0 +1,141 @@
+"""Fan-out job search across several providers.
+
+``JOBS_PROVIDER = 'aggregate'`` queries every provider named in
+``JOBS_AGGREGATE_PROVIDERS`` at the same time on a small thread pool. The
+search waits at most ``JOBS_AGGREGATE_DEADLINE`` seconds. Providers that
+have not answered by then are left out, and the result is marked
+``partial``. Page latency is therefore bounded by the deadline, not by the
+sum of all providers. Provider HTTP calls run under the same deadline
+(``app.jobs.client.deadline``) without retries, so a slow provider frees
+its pool thread when the search gives up on it instead of holding it
+through every retry.
+
+Listings are merged and deduplicated on normalised (title, company,
+location). They are then ranked:
+
+* postings found by more providers come first;
+* then postings whose title matches more of the search keywords;
+* ties keep provider order, then each provider's own order.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Tuple
+
+from flask import copy_current_request_context, current_app, has_request_context
+
+from app.jobs.cache import normalise
+from app.jobs.client import UpstreamError, deadline
+from app.jobs.providers import Job, JobProvider, PROVIDERS, SearchResult, register_provider
+
+DEFAULT_DEADLINE = 2.5
+
+
+def dedupe_key(job: Job) -> Tuple[str, str, str]:
+    return normalise(job.title), normalise(job.company), normalise(job.location)
+
+
+def merge(results: List[SearchResult], keywords: str) -> List[Job]:
+    """Dedupe and rank jobs from several providers (``results`` in provider order)."""
+    terms = set(normalise(keywords).split())
+    seen: Dict[Tuple[str, str, str], List] = {}
+    for rank, result in enumerate(results):
+        for position, job in enumerate(result.jobs):
+            key = dedupe_key(job)
+            if key in seen:
+                seen[key][1] += 1
+            else:
+                seen[key] = [job, 1, rank, position]
+
+    def score(entry):
+        job, sources, rank, position = entry
+        title_hits = len(terms & set(normalise(job.title).split()))
+        return -sources, -title_hits, rank, position
+
+    return [entry[0] for entry in sorted(seen.values(), key=score)]
+
+
+class AggregateProvider(JobProvider):
+    name = 'aggregate'
+
+    def __init__(self, providers: Dict[str, JobProvider], executor: ThreadPoolExecutor,
+                 deadline: float = DEFAULT_DEADLINE):
+        self.providers = providers
+        self.executor = executor
+        self.deadline = deadline
+
+    def search_url(self, keywords, location, page=1):
+        for provider in self.providers.values():
+            url = provider.search_url(keywords, location, page)
+            if url:
+                return url
+        return ''
+
+    def search(self, keywords, location, page=1, page_size=20):
+        app = current_app._get_current_object()
+        in_request = has_request_context()
+
+        expires_at = time.monotonic() + self.deadline
+
+        def task(provider):
+            def call():
+                with deadline(expires_at):
+                    return provider.search(keywords, location, page=page, page_size=page_size)
+            if in_request:
+                # Providers may read the end user's IP and agent from the request
+                return copy_current_request_context(call)
+
+            def with_app():
+                with app.app_context():
+                    return call()
+            return with_app
+
+        futures = {name: self.executor.submit(task(provider)) for name, provider in self.providers.items()}
+        wait(futures.values(), timeout=max(0.0, expires_at - time.monotonic()))
+
+        results, failed = [], {}
+        for name, future in futures.items():
+            if not future.done():
+                failed[name] = 'timeout'
+                future.cancel()
+            elif future.exception() is not None:
+                failed[name] = str(future.exception())
+            else:
+                results.append(future.result())
+        if failed:
+            app.logger.warning('Job providers left out of search: %s', failed)
+        if not results and failed:
+            raise UpstreamError(f'no job provider answered: {failed}')
+
+        jobs = merge(results, keywords)
+        return SearchResult(jobs=jobs, total=max([len(jobs)] + [r.total for r in results]),
+                            pages=max([1] + [r.pages for r in results]), provider=self.name,
+                            partial=bool(failed))
+
+
+def _aggregate_from_config() -> AggregateProvider:
+    config = current_app.config
+    names = [n.strip() for n in config.get('JOBS_AGGREGATE_PROVIDERS', 'sample').split(',') if n.strip()]
+    providers = {name: PROVIDERS[name]() for name in names if name != AggregateProvider.name}
+    return AggregateProvider(providers, get_executor(), config.get('JOBS_AGGREGATE_DEADLINE', DEFAULT_DEADLINE))
+
+
+def get_executor(app=None) -> ThreadPoolExecutor:
+    app = app or current_app
+    state = app.extensions['jobs_aggregator']
+    if state['executor'] is None:
+        state['executor'] = ThreadPoolExecutor(max_workers=state['workers'], thread_name_prefix='jobs-fanout')
+    return state['executor']
+
+
+def reset_executor(app):
+    app.extensions['jobs_aggregator']['executor'] = None
+
+
+def init_app(app):
+    from app import prefork
+    app.extensions['jobs_aggregator'] = {'executor': None,
+                                         'workers': app.config.get('JOBS_AGGREGATE_WORKERS', 8)}
+    prefork.on_after_fork(app, reset_executor)
+
+
+register_provider(AggregateProvider.name, _aggregate_from_config)
@@ -0,0 +1,177 @@
+"""
+Bulk job application API for recruiters and agency partners.
+
+    POST /api/job-applications/bulk    {"applications": [{...}, ...]}
+    POST /api/job-applications/status  {"updates": [{"id": 1, "status": "Viewed"}, ...]}
+
+Callers are admins (session login) or partners sending a key from
+JOBS_PARTNER_API_KEYS in the ``X-API-Key`` header. The whole payload is
+validated first. If any item is invalid, nothing is written and every
+error comes back with its item's index. Valid payloads are written with one
+executemany inside a single transaction. The applicant emails go through
+the notification queue (app/notifications.py), after the commit.
+"""
+import hmac
+from datetime import datetime, timezone
+
+from flask import current_app, jsonify, request
+from flask_login import current_user
+from sqlalchemy import insert, select, update
+
+from app.jobs import jobs
+from app.notifications import Notification, notify
+from models import db, JobApplication
+
+STATUSES = ('Applied', 'Viewed', 'In Review', 'Rejected', 'Accepted')
+TRANSITIONS = {
+    'Applied': {'Viewed', 'In Review', 'Rejected', 'Accepted'},
+    'Viewed': {'In Review', 'Rejected', 'Accepted'},
+    'In Review': {'Rejected', 'Accepted'},
+    'Rejected': set(),
+    'Accepted': set(),
+}
+REQUIRED_FIELDS = ('job_id', 'job_title', 'company', 'full_name', 'email', 'phone')
+OPTIONAL_FIELDS = ('location', 'job_url', 'resume_url', 'cover_letter', 'message')
+# Column lengths from models.JobApplication
+MAX_LENGTHS = {'job_id': 100, 'job_title': 200, 'company': 200, 'location': 150, 'job_url': 500,
+               'full_name': 150, 'email': 120, 'phone': 20, 'resume_url': 500}
+DEFAULT_MAX_ITEMS = 1000
+
+
+def _authorised() -> bool:
+    if getattr(current_user, 'is_admin', False):
+        return True
+    key = request.headers.get('X-API-Key', '')
+    keys = [k.strip() for k in (current_app.config.get('JOBS_PARTNER_API_KEYS') or '').split(',') if k.strip()]
+    return bool(key) and any(hmac.compare_digest(key, k) for k in keys)
+
+
+def _items(name: str):
+    """The list under `name` in the JSON body, or an error response."""
+    if not _authorised():
+        return None, (jsonify({'error': 'Unauthorized'}), 403)
+    data = request.get_json(silent=True) or {}
+    items = data.get(name)
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'error': f'"{name}" must be a non-empty list'}), 400)
+    limit = current_app.config.get('JOBS_BULK_MAX_ITEMS', DEFAULT_MAX_ITEMS)
+    if len(items) > limit:
+        return None, (jsonify({'error': f'at most {limit} {name} per call'}), 400)
+    return items, None
+
+
+def _validate_application(item) -> str:
+    if not isinstance(item, dict):
+        return 'must be an object'
+    missing = [f for f in REQUIRED_FIELDS if not str(item.get(f) or '').strip()]
+    if missing:
+        return 'missing ' + ', '.join(missing)
+    if '@' not in str(item['email']):
+        return 'invalid email'
+    too_long = [f for f, n in MAX_LENGTHS.items() if len(str(item.get(f) or '')) > n]
+    if too_long:
+        return 'too long: ' + ', '.join(too_long)
+    return ''
+
+
+def _confirmation(row) -> Notification:
+    return Notification(
+        row['email'],
+        f"Application Submitted - {row['job_title']}",
+        f"""Dear {row['full_name']},
+
+Your application for {row['job_title']} at {row['company']} has been submitted successfully!
+
+Job: {row['job_title']}
+Company: {row['company']}
+Location: {row.get('location') or ''}
+
+Best regards,
+Nexora Global - Career Services
+""")
+
+
+def _status_changed(app, status) -> Notification:
+    return Notification(
+        app.email,
+        f'Application update - {app.job_title}: {status}',
+        f"""Dear {app.full_name},
+
+The status of your application for {app.job_title} at {app.company} is now: {status}.
+
+Best regards,
+Nexora Global - Career Services
+""")
+
+
+@jobs.route('/api/job-applications/bulk', methods=['POST'])
+def api_bulk_applications():
+    """Create many job applications in one transaction"""
+    items, error = _items('applications')
+    if error:
+        return error
+    errors = [{'index': i, 'error': e} for i, e in enumerate(map(_validate_application, items)) if e]
+    if errors:
+        return jsonify({'created': 0, 'errors': errors}), 400
+
+    now = datetime.now(timezone.utc)
+    user_id = current_user.id if current_user.is_authenticated else None
+    rows = [dict({f: str(item[f]).strip() for f in REQUIRED_FIELDS},
+                 **{f: item.get(f) for f in OPTIONAL_FIELDS},
+                 user_id=user_id, status='Applied', created_at=now) for item in items]
+    try:
+        db.session.execute(insert(JobApplication), rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error('Bulk application insert failed: %s', e)
+        return jsonify({'error': 'Could not save applications'}), 500
+
+    notify(*[_confirmation(row) for row in rows])
+    return jsonify({'created': len(rows), 'errors': []}), 201
+
+
+@jobs.route('/api/job-applications/status', methods=['POST'])
+def api_bulk_status():
+    """Apply many status transitions in one transaction"""
+    items, error = _items('updates')
+    if error:
+        return error
+
+    errors, wanted = [], {}
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('id'), int):
+            errors.append({'index': i, 'error': 'id must be an integer'})
+        elif item.get('status') not in STATUSES:
+            errors.append({'index': i, 'error': f'status must be one of {", ".join(STATUSES)}'})
+        else:
+            wanted[item['id']] = (i, item['status'])
+
+    current = {app.id: app for app in db.session.execute(
+        select(JobApplication).where(JobApplication.id.in_(list(wanted)))).scalars()}
+    changes = []
+    for app_id, (i, status) in wanted.items():
+        app = current.get(app_id)
+        if app is None:
+            errors.append({'index': i, 'error': f'application {app_id} not found'})
+        elif status != app.status:
+            if status not in TRANSITIONS.get(app.status or 'Applied', set()):
+                errors.append({'index': i, 'error': f'cannot move from {app.status} to {status}'})
+            else:
+                changes.append((app, status))
+    if errors:
+        return jsonify({'updated': 0, 'errors': sorted(errors, key=lambda e: e['index'])}), 400
+
+    if changes:
+        # Built before the commit expires the loaded rows
+        messages = [_status_changed(app, status) for app, status in changes]
+        try:
+            # Bulk UPDATE by primary key: one executemany, one transaction
+            db.session.execute(update(JobApplication), [{'id': app.id, 'status': status} for app, status in changes])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error('Bulk status update failed: %s', e)
+            return jsonify({'error': 'Could not update applications'}), 500
+        notify(*messages)
+    return jsonify({'updated': len(changes), 'unchanged': len(wanted) - len(changes), 'errors': []})
@@ -0,0 +1,225 @@
+"""Job search result cache with stale-while-revalidate.
+
+Results are keyed on the normalised query: provider, locale, keywords,
+location and page. Case and whitespace do not create new entries. Each entry
+has three phases:
+
+* fresh (``JOBS_CACHE_TTL``): served straight from the cache;
+* stale (``JOBS_CACHE_STALE_TTL`` more): still served at once, while a
+  background thread fetches a new copy from the provider;
+* expired: the request fetches the result itself.
+
+Empty results are cached too, for a shorter ``JOBS_CACHE_NEGATIVE_TTL``, so
+that a query with no matches does not reach the provider on every search.
+Partial results (a provider missed the aggregation deadline) get the same
+short lifetime.
+Concurrent misses for the same key share one upstream call.
+
+Entries live in a backend of their own, separate from the page cache, so
+a burst of distinct searches cannot evict cached pages or the other way
+round. ``JOBS_CACHE_BACKEND`` picks the kind (in-process LRU, filesystem
+or Redis, see app/page_cache.py) and defaults to the page cache's kind, so
+with a shared backend every worker sees the entries. The LRU and the
+filesystem backend hold at most ``JOBS_CACHE_MAX_ENTRIES`` results.
+"""
+import hashlib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from flask import current_app
+
+from app.jobs.providers import Job, JobProvider, SearchResult, get_provider
+from app.page_cache import create_backend
+
+DEFAULT_TTL = 300
+DEFAULT_STALE_TTL = 1800
+DEFAULT_NEGATIVE_TTL = 60
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalise(text: str) -> str:
+    return _SPACES.sub(' ', (text or '').strip()).casefold()
+
+
+class JobSearchCache:
+    def __init__(self, backend, ttl: int = DEFAULT_TTL, stale_ttl: int = DEFAULT_STALE_TTL,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL, refresh_workers: int = 2,
+                 clock: Callable[[], float] = time.time):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_workers = refresh_workers
+        self.clock = clock
+        self.stats = {'hits': 0, 'stale_hits': 0, 'negative_hits': 0, 'misses': 0,
+                      'refreshes': 0, 'refresh_errors': 0, 'prefetches': 0}
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._refreshing = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # -- keys and entries ---------------------------------------------------
+
+    @staticmethod
+    def make_key(provider: str, keywords: str, location: str, page: int, locale: str) -> str:
+        raw = '\x1f'.join((provider, locale, normalise(keywords), normalise(location), str(int(page))))
+        return 'jobs:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _entry(self, result: SearchResult) -> Dict:
+        now = self.clock()
+        if result.jobs and not result.partial:
+            fresh_until, stale_until = now + self.ttl, now + self.ttl + self.stale_ttl
+        else:
+            fresh_until = stale_until = now + self.negative_ttl
+        return {
+            'jobs': [job.to_dict() for job in result.jobs],
+            'total': result.total,
+            'pages': result.pages,
+            'provider': result.provider,
+            'partial': result.partial,
+            'fresh_until': fresh_until,
+            'stale_until': stale_until,
+        }
+
+    @staticmethod
+    def _result(entry: Dict) -> SearchResult:
+        return SearchResult(jobs=[Job(**job) for job in entry['jobs']], total=entry['total'],
+                            pages=entry['pages'], provider=entry['provider'],
+                            partial=entry.get('partial', False))
+
+    def _store(self, key: str, result: SearchResult):
+        entry = self._entry(result)
+        self.backend.set(key, entry, max(1, int(entry['stale_until'] - self.clock())))
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    # -- lookups --------------------------------------------------------------
+
+    def search(self, provider: JobProvider, keywords: str, location: str, page: int = 1,
+               locale: str = 'en') -> SearchResult:
+        key = self.make_key(provider.name, keywords, location, page, locale)
+        entry = self.backend.get(key)
+        now = self.clock()
+        if entry is not None and now < entry['stale_until']:
+            if now < entry['fresh_until']:
+                self._count('hits' if entry['jobs'] else 'negative_hits')
+            else:
+                self._count('stale_hits')
+                self._refresh_in_background(key, provider, keywords, location, page)
+            return self._result(entry)
+
+        self._count('misses')
+        return self._fetch_once(key, provider, keywords, location, page)
+
+    def _fetch_once(self, key, provider, keywords, location, page) -> SearchResult:
+        """Fetch and store; concurrent callers for the same key wait for the first one."""
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+        if not leader:
+            event.wait(timeout=30)
+            entry = self.backend.get(key)
+            if entry is not None:
+                return self._result(entry)
+        try:
+            result = provider.search(normalise(keywords), normalise(location), page=page)
+            self._store(key, result)
+            return result
+        finally:
+            if leader:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    # -- background refresh ---------------------------------------------------
+
+    def is_fresh(self, provider: JobProvider, keywords: str, location: str, page: int, locale: str) -> bool:
+        entry = self.backend.get(self.make_key(provider.name, keywords, location, page, locale))
+        return entry is not None and self.clock() < entry['fresh_until']
+
+    def prefetch(self, provider: JobProvider, keywords: str, location: str, page: int, locale: str):
+        """Fetch a page nobody asked for yet into the cache (see app/jobs/prefetch.py)."""
+        key = self.make_key(provider.name, keywords, location, page, locale)
+        future = self._refresh_in_background(key, provider, keywords, location, page)
+        if future is not None:
+            self._count('prefetches')
+        return future
+
+    def _refresh_in_background(self, key, provider, keywords, location, page):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers,
+                                                    thread_name_prefix='jobs-cache-refresh')
+            executor = self._executor
+        app = current_app._get_current_object()
+        return executor.submit(self._refresh, app, key, provider, keywords, location, page)
+
+    def _refresh(self, app, key, provider, keywords, location, page):
+        try:
+            with app.app_context():
+                self._store(key, provider.search(normalise(keywords), normalise(location), page=page))
+            self._count('refreshes')
+        except Exception as e:
+            # Keep serving the stale copy; the next stale hit tries again
+            self._count('refresh_errors')
+            app.logger.warning('Background job search refresh failed: %s', e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def reset_after_fork(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._refreshing = set()
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        served = stats['hits'] + stats['stale_hits'] + stats['negative_hits']
+        lookups = served + stats['misses']
+        stats['hit_ratio'] = round(served / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def get_cache() -> Optional[JobSearchCache]:
+    return current_app.extensions.get('jobs_cache')
+
+
+def search_jobs(keywords: str, location: str, page: int = 1, provider: Optional[JobProvider] = None) -> SearchResult:
+    """Search through the cache (if enabled) with the configured provider."""
+    from app.fragment_cache import current_locale
+    provider = provider or get_provider()
+    cache = get_cache()
+    if cache is None:
+        return provider.search(keywords, location, page=page)
+    return cache.search(provider, keywords, location, page=page, locale=current_locale())
+
+
+def init_app(app):
+    if not app.config.get('JOBS_CACHE_ENABLED', True):
+        return
+    from app import prefork
+    kind = (app.config.get('JOBS_CACHE_BACKEND') or app.config.get('PAGE_CACHE_BACKEND') or 'lru').lower()
+    # A disabled page cache does not disable this one (JOBS_CACHE_ENABLED does)
+    backend = create_backend(app.config, prefix='JOBS_CACHE', kind='lru' if kind == 'null' else kind)
+    cache = app.extensions['jobs_cache'] = JobSearchCache(
+        backend,
+        ttl=app.config.get('JOBS_CACHE_TTL', DEFAULT_TTL),
+        stale_ttl=app.config.get('JOBS_CACHE_STALE_TTL', DEFAULT_STALE_TTL),
+        negative_ttl=app.config.get('JOBS_CACHE_NEGATIVE_TTL', DEFAULT_NEGATIVE_TTL),
+        refresh_workers=app.config.get('JOBS_CACHE_REFRESH_WORKERS', 2),
+    )
+    prefork.on_after_fork(app, lambda app: cache.reset_after_fork())
+    prefork.on_after_fork(app, lambda app: getattr(backend, 'reset', lambda: None)())
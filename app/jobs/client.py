@@ -0,0 +1,234 @@
+"""Shared outbound HTTP client for job providers.
+
+One pooled ``requests.Session`` per worker process keeps connections to each
+provider host alive between searches. Every call has strict connect/read
+timeouts, transient failures (connection errors, 429, 5xx) are retried with
+exponential backoff and full jitter, and a per-host circuit breaker stops
+calling a provider that keeps failing until it has had time to recover.
+
+Code with its own time budget (the aggregate search) wraps calls in
+``deadline(expires_at)``: inside it, timeouts are cut to the time left and
+failed calls are not retried, so a slow provider gives its thread back
+when the budget runs out.
+
+``requests`` is imported when the first request is made.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from flask import current_app
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_deadline: ContextVar[Optional[float]] = ContextVar('jobs_http_deadline', default=None)
+
+
+class UpstreamError(Exception):
+    """A provider call failed after all retries."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpen(UpstreamError):
+    """The provider host is failing; calls are short-circuited for now."""
+
+
+class CircuitBreaker:
+    """Closed → open after `failure_threshold` consecutive failures; half-open after `reset_timeout`.
+
+    While half-open a single trial call is let through: success closes the
+    circuit, failure opens it again for another `reset_timeout`.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = self.clock()
+                self._trial_in_flight = False
+
+
+@contextmanager
+def deadline(expires_at: float):
+    """Bound get_json calls in this context to end by ``expires_at`` (time.monotonic())."""
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class HttpClient:
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 5.0, retries: int = 2,
+                 backoff: float = 0.2, backoff_cap: float = 2.0, pool_size: int = 10,
+                 breaker_threshold: int = 5, breaker_reset: float = 30.0,
+                 user_agent: str = 'Nexora/1.0 (+job-search)', sleep: Callable[[float], None] = time.sleep):
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_cap = backoff_cap
+        self.pool_size = pool_size
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.user_agent = user_agent
+        self.sleep = sleep
+        self._session = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'HttpClient':
+        return cls(
+            connect_timeout=config.get('JOBS_HTTP_CONNECT_TIMEOUT', 3.05),
+            read_timeout=config.get('JOBS_HTTP_READ_TIMEOUT', 5.0),
+            retries=config.get('JOBS_HTTP_RETRIES', 2),
+            backoff=config.get('JOBS_HTTP_BACKOFF', 0.2),
+            pool_size=config.get('JOBS_HTTP_POOL_SIZE', 10),
+            breaker_threshold=config.get('JOBS_BREAKER_THRESHOLD', 5),
+            breaker_reset=config.get('JOBS_BREAKER_RESET', 30.0),
+        )
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # Retries are ours (with jitter and the breaker), not urllib3's
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = self.user_agent
+                self._session = session
+            return self._session
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+            return breaker
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(cap, backoff * 2**attempt)]."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff * (2 ** attempt)))
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Tuple[float, float]] = None) -> Any:
+        import requests
+
+        timeout = timeout or self.timeout
+        retries = self.retries
+        expires_at = _deadline.get()
+        if expires_at is not None:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                raise UpstreamError('deadline exceeded before the call')
+            timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+            retries = 0
+
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise CircuitOpen(f'circuit open for {urlsplit(url).netloc}')
+
+        last_error: Optional[UpstreamError] = None
+        healthy = False
+        try:
+            for attempt in range(retries + 1):
+                if attempt:
+                    self.sleep(self.backoff_delay(attempt - 1))
+                try:
+                    response = self.session.get(url, params=params, timeout=timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    last_error = UpstreamError(f'{type(e).__name__}: {e}')
+                    continue
+                except requests.RequestException as e:
+                    # Redirect loops, bad encodings, broken chunking: retrying will not help
+                    last_error = UpstreamError(f'{type(e).__name__}: {e}')
+                    break
+                if response.status_code in RETRY_STATUSES:
+                    last_error = UpstreamError(f'HTTP {response.status_code}', response.status_code)
+                    continue
+                if response.status_code >= 400:
+                    # Client errors are our fault, not the provider's: no retry, breaker untouched
+                    healthy = True
+                    raise UpstreamError(f'HTTP {response.status_code}', response.status_code)
+                try:
+                    data = response.json()
+                except ValueError:
+                    last_error = UpstreamError('invalid JSON from provider', response.status_code)
+                    break
+                healthy = True
+                return data
+            raise last_error
+        finally:
+            # Every call settles the breaker, so a half-open trial can never stay in flight
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+
+
+def get_client() -> HttpClient:
+    """The current app's job-provider client (one per worker process)."""
+    return current_app.extensions['jobs_http']
+
+
+def init_app(app):
+    from app import prefork
+    client = app.extensions['jobs_http'] = HttpClient.from_config(app.config)
+    # Pooled sockets must not be shared across forked workers
+    prefork.on_after_fork(app, lambda app: client.close())
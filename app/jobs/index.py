@@ -0,0 +1,322 @@
+"""Local job index: ingested feeds, searched offline with SQLite FTS5.
+
+Job feeds (CareerJet-style XML or JSON-lines dumps, optionally gzipped) are
+ingested into a separate SQLite file at ``JOBS_INDEX_PATH``::
+
+    flask --app run:app ingest-jobs feeds/careerjet-gb.xml.gz feeds/extra.jsonl
+
+Ingestion streams the feed, so memory stays flat however large the dump
+is. It is also incremental:
+
+* each posting's content is fingerprinted, and only new or changed postings
+  are written (which also re-indexes them);
+* unchanged postings just have their expiry pushed back;
+* postings that no feed has listed for ``JOBS_INDEX_MAX_AGE_DAYS`` are
+  removed by ``expire``.
+
+Title, company and description are full-text indexed (title weighted
+highest). Locations are normalised ("London, UK" and "london united
+kingdom" match). ``JOBS_PROVIDER = 'local'`` serves job search from the
+index.
+"""
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import click
+from flask import current_app
+
+from app.jobs.providers import Job, JobProvider, SearchResult, job_id, register_provider
+
+FIELDS = ('title', 'company', 'location', 'url', 'salary', 'description', 'date')
+BATCH_SIZE = 500
+DEFAULT_MAX_AGE_DAYS = 30
+
+LOCATION_ALIASES = {
+    'uk': 'united kingdom', 'gb': 'united kingdom', 'great britain': 'united kingdom', 'england': 'united kingdom',
+    'us': 'united states', 'usa': 'united states', 'u.s.': 'united states', 'america': 'united states',
+    'uae': 'united arab emirates', 'nyc': 'new york', 'ny': 'new york',
+}
+_WORDS = re.compile(r'\w+', re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    location_norm TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    salary TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    fingerprint TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_postings_expires_at ON postings (expires_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    title, company, description, content='postings', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS postings_ai AFTER INSERT ON postings BEGIN
+    INSERT INTO postings_fts (rowid, title, company, description)
+    VALUES (new.rowid, new.title, new.company, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_ad AFTER DELETE ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_au AFTER UPDATE OF title, company, description ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description);
+    INSERT INTO postings_fts (rowid, title, company, description)
+    VALUES (new.rowid, new.title, new.company, new.description);
+END;
+"""
+
+
+def normalise_location(text: str) -> str:
+    """Lowercase words with country/city aliases expanded: 'London, UK' → 'london united kingdom'."""
+    parts = []
+    for part in re.split(r'[,/;|]+', (text or '').casefold()):
+        part = ' '.join(_WORDS.findall(part))
+        if part:
+            parts.append(LOCATION_ALIASES.get(part, part))
+    return ' '.join(parts)
+
+
+def like_escape(text: str) -> str:
+    """`text` matched literally inside a LIKE pattern with ESCAPE '\\'."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def fts_query(keywords: str) -> str:
+    """Every keyword must match (as a prefix); quoting keeps user input out of FTS syntax."""
+    return ' AND '.join(f'"{word}"*' for word in _WORDS.findall((keywords or '').casefold()))
+
+
+def fingerprint(posting: Dict) -> str:
+    raw = '\x1f'.join(posting.get(field, '') for field in FIELDS)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Feed readers (streaming)
+# ---------------------------------------------------------------------------
+
+def _posting(item: Dict) -> Dict:
+    posting = {field: str(item.get(field) or '').strip() for field in FIELDS}
+    if not posting['location']:
+        posting['location'] = str(item.get('locations') or '').strip()
+    posting['id'] = str(item.get('id') or '').strip() or job_id(posting['url'])
+    return posting
+
+
+def _open(path: str):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def iter_xml(stream) -> Iterator[Dict]:
+    """``<job>`` elements anywhere in the document, one at a time."""
+    parents = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag == 'job':
+            yield _posting({child.tag: (child.text or '') for child in elem})
+            # Drop the parsed posting so the tree never grows
+            if parents:
+                parents[-1].remove(elem)
+
+
+def iter_jsonl(stream) -> Iterator[Dict]:
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield _posting(json.loads(line))
+
+
+def iter_feed(path: str) -> Iterator[Dict]:
+    name = path[:-3] if path.endswith('.gz') else path
+    reader = iter_xml if name.endswith('.xml') else iter_jsonl
+    with _open(path) as stream:
+        yield from reader(stream)
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+@dataclass
+class IngestStats:
+    seen: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+class JobIndex:
+    def __init__(self, path: str, max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self._local = threading.local()
+
+    def ingest(self, postings: Iterable[Dict], source: str = '', now: Optional[float] = None) -> IngestStats:
+        now = time.time() if now is None else now
+        expires_at = now + self.max_age
+        stats = IngestStats()
+        conn = self.connection()
+        with conn:
+            for batch in _batches(postings, BATCH_SIZE):
+                stats.seen += len(batch)
+                # Last copy wins if a feed lists the same posting twice
+                by_id = {p['id']: p for p in batch}
+                placeholders = ','.join('?' * len(by_id))
+                known = dict(conn.execute(f'SELECT id, fingerprint FROM postings WHERE id IN ({placeholders})',
+                                          list(by_id)).fetchall())
+                writes, touches = [], []
+                for pid, posting in by_id.items():
+                    fp = fingerprint(posting)
+                    if known.get(pid) == fp:
+                        touches.append((expires_at, pid))
+                        continue
+                    if pid in known:
+                        stats.updated += 1
+                    else:
+                        stats.inserted += 1
+                    writes.append((pid, *(posting[f] for f in FIELDS), normalise_location(posting['location']),
+                                   source, fp, now, expires_at))
+                stats.unchanged += len(touches)
+                conn.executemany(
+                    'INSERT INTO postings (id, title, company, location, url, salary, description, date,'
+                    ' location_norm, source, fingerprint, updated_at, expires_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+                    ' ON CONFLICT(id) DO UPDATE SET title=excluded.title, company=excluded.company,'
+                    ' location=excluded.location, url=excluded.url, salary=excluded.salary,'
+                    ' description=excluded.description, date=excluded.date, location_norm=excluded.location_norm,'
+                    ' source=excluded.source, fingerprint=excluded.fingerprint, updated_at=excluded.updated_at,'
+                    ' expires_at=excluded.expires_at', writes)
+                conn.executemany('UPDATE postings SET expires_at = ? WHERE id = ?', touches)
+        return stats
+
+    def ingest_file(self, path: str, now: Optional[float] = None) -> IngestStats:
+        return self.ingest(iter_feed(path), source=os.path.basename(path), now=now)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        conn = self.connection()
+        with conn:
+            return conn.execute('DELETE FROM postings WHERE expires_at < ?',
+                                (time.time() if now is None else now,)).rowcount
+
+    def count(self) -> int:
+        return self.connection().execute('SELECT count(*) FROM postings').fetchone()[0]
+
+    def search(self, keywords: str, location: str = '', page: int = 1, page_size: int = 20,
+               now: Optional[float] = None) -> SearchResult:
+        query = fts_query(keywords)
+        if not query:
+            return SearchResult(provider=LocalIndexProvider.name)
+        where = ['postings_fts MATCH ?', 'p.expires_at >= ?']
+        params: List = [query, time.time() if now is None else now]
+        place = normalise_location(location)
+        if place:
+            where.append("(' ' || p.location_norm || ' ') LIKE ? ESCAPE '\\'")
+            params.append(f'% {like_escape(place)} %')
+        sql_from = f"FROM postings_fts JOIN postings p ON p.rowid = postings_fts.rowid WHERE {' AND '.join(where)}"
+
+        conn = self.connection()
+        total = conn.execute(f'SELECT count(*) {sql_from}', params).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT p.* {sql_from} ORDER BY bm25(postings_fts, 10.0, 3.0, 1.0), p.updated_at DESC LIMIT ? OFFSET ?',
+            params + [page_size, max(0, page - 1) * page_size]).fetchall()
+        jobs = [Job(row['id'], row['title'], row['company'], row['location'], row['url'], row['salary'],
+                    row['description'], row['date'], LocalIndexProvider.name) for row in rows]
+        return SearchResult(jobs=jobs, total=total, pages=max(1, math.ceil(total / page_size)),
+                            provider=LocalIndexProvider.name)
+
+
+class LocalIndexProvider(JobProvider):
+    """Job search against the ingested local index."""
+    name = 'local'
+
+    def __init__(self, index: JobIndex):
+        self.index = index
+
+    def search(self, keywords, location, page=1, page_size=20):
+        return self.index.search(keywords, location, page=page, page_size=page_size)
+
+
+def get_index() -> JobIndex:
+    return current_app.extensions['jobs_index']
+
+
+register_provider(LocalIndexProvider.name, lambda: LocalIndexProvider(get_index()))
+
+
+def init_app(app):
+    from app import prefork
+    index = app.extensions['jobs_index'] = JobIndex(
+        app.config.get('JOBS_INDEX_PATH') or os.path.join(app.instance_path, 'jobs_index.db'),
+        app.config.get('JOBS_INDEX_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS),
+    )
+    # SQLite connections must not cross a fork
+    prefork.on_after_fork(app, lambda app: index.close())
+
+    @app.cli.command('ingest-jobs')
+    @click.argument('feeds', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+    @click.option('--expire/--no-expire', default=True, show_default=True,
+                  help='Remove postings no feed has listed for JOBS_INDEX_MAX_AGE_DAYS')
+    def ingest_jobs_command(feeds, expire):
+        """Ingest job feeds (.xml or .jsonl, optionally .gz) into the local job index."""
+        for path in feeds:
+            started = time.perf_counter()
+            stats = index.ingest_file(path)
+            click.echo(f'{path}: {stats.seen} postings, {stats.inserted} new, {stats.updated} changed,'
+                       f' {stats.unchanged} unchanged ({time.perf_counter() - started:.1f}s)')
+        if expire:
+            click.echo(f'expired {index.expire()} postings')
+        click.echo(f'✓ {index.count()} postings in {index.path}')
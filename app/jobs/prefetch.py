@@ -0,0 +1,121 @@
+"""Prefetch the next page of job search results.
+
+After page N is served, page N+1 is fetched in the background into the job
+search cache (app/jobs/cache.py). When the user clicks "next", the page is
+usually already there. Prefetches are extra upstream calls the user never
+asked for, so each one has to get past two token buckets first:
+
+* per user (or per client IP when anonymous): ``JOBS_PREFETCH_USER_RATE``
+  prefetches per minute, so a user paging quickly cannot queue up a burst;
+* per provider: ``JOBS_PREFETCH_PROVIDER_RATE`` prefetches per second, kept
+  well below the provider's rate limit so that real searches always have
+  headroom.
+
+A prefetch is skipped, not queued, when either bucket is empty.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from flask import current_app, request
+
+from app.jobs.providers import JobProvider, SearchResult
+
+MAX_TRACKED_USERS = 10000
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def take(self) -> bool:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class PrefetchLimiter:
+    def __init__(self, user_rate_per_minute: float = 6, provider_rate: float = 2.0,
+                 provider_burst: float = 5, clock: Callable[[], float] = time.monotonic):
+        self.user_rate = user_rate_per_minute / 60.0
+        self.user_burst = max(1.0, min(3.0, user_rate_per_minute))
+        self.provider_rate = provider_rate
+        self.provider_burst = provider_burst
+        self.clock = clock
+        self.stats = {'scheduled': 0, 'throttled_user': 0, 'throttled_provider': 0}
+        self._users: 'OrderedDict[str, TokenBucket]' = OrderedDict()
+        self._providers = {}
+        self._lock = threading.Lock()
+
+    def _user_bucket(self, user: str) -> TokenBucket:
+        bucket = self._users.get(user)
+        if bucket is None:
+            bucket = self._users[user] = TokenBucket(self.user_rate, self.user_burst, self.clock)
+            if len(self._users) > MAX_TRACKED_USERS:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user)
+        return bucket
+
+    def allow(self, user: str, provider: str) -> bool:
+        with self._lock:
+            if not self._user_bucket(user).take():
+                self.stats['throttled_user'] += 1
+                return False
+            bucket = self._providers.get(provider)
+            if bucket is None:
+                bucket = self._providers[provider] = TokenBucket(self.provider_rate, self.provider_burst, self.clock)
+            if not bucket.take():
+                self.stats['throttled_provider'] += 1
+                return False
+            self.stats['scheduled'] += 1
+            return True
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+
+def _user_key() -> str:
+    from flask_login import current_user
+    if current_user.is_authenticated:
+        return f'user:{current_user.id}'
+    return f'ip:{request.remote_addr}'
+
+
+def prefetch_next_page(provider: JobProvider, keywords: str, location: str, page: int, result: SearchResult):
+    """Warm the cache with page + 1 if there is one and the limits allow it. Returns the future, if any."""
+    from app.fragment_cache import current_locale
+    from app.jobs.cache import get_cache
+    limiter: Optional[PrefetchLimiter] = current_app.extensions.get('jobs_prefetch')
+    cache = get_cache()
+    if limiter is None or cache is None or result.partial or page >= result.pages:
+        return None
+    locale = current_locale()
+    if cache.is_fresh(provider, keywords, location, page + 1, locale):
+        return None
+    if not limiter.allow(_user_key(), provider.name):
+        return None
+    return cache.prefetch(provider, keywords, location, page + 1, locale)
+
+
+def init_app(app):
+    if not app.config.get('JOBS_PREFETCH_ENABLED', True) or not app.config.get('JOBS_CACHE_ENABLED', True):
+        return
+    from app import prefork
+    limiter = app.extensions['jobs_prefetch'] = PrefetchLimiter(
+        user_rate_per_minute=app.config.get('JOBS_PREFETCH_USER_RATE', 6),
+        provider_rate=app.config.get('JOBS_PREFETCH_PROVIDER_RATE', 2.0),
+        provider_burst=app.config.get('JOBS_PREFETCH_PROVIDER_BURST', 5),
+    )
+    prefork.on_after_fork(app, lambda app: limiter.reset_after_fork())
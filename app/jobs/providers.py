@@ -0,0 +1,169 @@
+"""Job providers: one interface, several sources.
+
+A provider turns (keywords, location, page) into a :class:`SearchResult`.
+``JOBS_PROVIDER`` picks the one used by the search page:
+
+* ``sample``    – built-in listings pointing at CareerJet's site (no network)
+* ``careerjet`` – CareerJet's public search API through the shared HTTP client
+* ``local``     – the ingested offline index (see app/jobs/index.py)
+* ``aggregate`` – several of the above at once (see app/jobs/aggregator.py)
+
+Register more with :func:`register_provider`.
+"""
+import hashlib
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from flask import current_app, has_request_context, request
+
+from app.jobs.client import HttpClient, UpstreamError, get_client
+
+DEFAULT_CAREERJET_AFFID = '22926d61e8d645ae480bb1297fa3022f'
+CAREERJET_SITE_URL = 'https://www.careerjet.com/'
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    title: str
+    company: str
+    location: str
+    url: str
+    salary: str = ''
+    description: str = ''
+    date: str = ''
+    provider: str = ''
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class SearchResult:
+    jobs: List[Job] = field(default_factory=list)
+    total: int = 0
+    pages: int = 0
+    provider: str = ''
+    # Some sources did not answer in time; the jobs are what the others returned
+    partial: bool = False
+
+
+class JobProvider:
+    name = 'base'
+
+    def search(self, keywords: str, location: str, page: int = 1, page_size: int = 20) -> SearchResult:
+        raise NotImplementedError
+
+    def search_url(self, keywords: str, location: str, page: int = 1) -> str:
+        """Where a user can browse the full result list on the provider's own site."""
+        return ''
+
+
+def job_id(url: str) -> str:
+    """Stable id for a posting that only has a URL."""
+    return 'cj-' + hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+
+
+def _careerjet_site_url(affid: str, keywords: str, location: str, page: int) -> str:
+    return f"{CAREERJET_SITE_URL}?{urlencode({'affid': affid, 'k': keywords, 'l': location, 'p': page})}"
+
+
+class SampleProvider(JobProvider):
+    """Placeholder listings that link to CareerJet's own search page."""
+    name = 'sample'
+
+    def __init__(self, affid: str = DEFAULT_CAREERJET_AFFID):
+        self.affid = affid
+
+    def search_url(self, keywords, location, page=1):
+        return _careerjet_site_url(self.affid, keywords, location, page)
+
+    def search(self, keywords, location, page=1, page_size=20):
+        url = self.search_url(keywords, location, page)
+        jobs = [
+            Job('cj-001', f'{keywords.title()} Position', 'Global Tech Company', location, url,
+                '$50,000 - $120,000', f'Exciting opportunity for {keywords} professionals. Join our international team.',
+                'Recently posted', self.name),
+            Job('cj-002', f'Senior {keywords.title()} Role', 'International Enterprise', location, url,
+                '$70,000 - $150,000', f'Seeking experienced {keywords} specialists for expanding operations.',
+                '2 days ago', self.name),
+            Job('cj-003', f'{keywords.title()} Developer Needed', 'Startup Ventures', location, url,
+                '$40,000 - $100,000', f'Fast-growing startup looking for talented {keywords} professionals.',
+                '1 day ago', self.name),
+        ]
+        return SearchResult(jobs=jobs, total=len(jobs), pages=1, provider=self.name)
+
+
+class CareerJetProvider(JobProvider):
+    """CareerJet public search API (JSON)."""
+    name = 'careerjet'
+
+    def __init__(self, client: HttpClient, api_url: str, affid: str = DEFAULT_CAREERJET_AFFID, locale: str = 'en_GB'):
+        self.client = client
+        self.api_url = api_url
+        self.affid = affid
+        self.locale = locale
+
+    def search_url(self, keywords, location, page=1):
+        return _careerjet_site_url(self.affid, keywords, location, page)
+
+    def search(self, keywords, location, page=1, page_size=20):
+        params = {
+            'affid': self.affid,
+            'locale_code': self.locale,
+            'keywords': keywords,
+            'location': location,
+            'page': page,
+            'pagesize': page_size,
+            # CareerJet asks partners to forward the end user's IP and agent
+            'user_ip': request.remote_addr if has_request_context() else '127.0.0.1',
+            'user_agent': request.headers.get('User-Agent', '') if has_request_context() else '',
+        }
+        data = self.client.get_json(self.api_url, params=params)
+        if not isinstance(data, dict):
+            raise UpstreamError(f'unexpected {type(data).__name__} from provider')
+        try:
+            jobs = [self._job(item) for item in data.get('jobs') or []]
+            return SearchResult(jobs=jobs, total=int(data.get('hits') or len(jobs)),
+                                pages=int(data.get('pages') or 1), provider=self.name)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise UpstreamError(f'malformed provider response: {e}') from e
+
+    def _job(self, item: Dict) -> Job:
+        url = item.get('url', '')
+        return Job(
+            id=job_id(url),
+            title=item.get('title', ''),
+            company=item.get('company', ''),
+            location=item.get('locations', ''),
+            url=url,
+            salary=item.get('salary', ''),
+            description=item.get('description', ''),
+            date=item.get('date', ''),
+            provider=self.name,
+        )
+
+
+ProviderFactory = Callable[[], JobProvider]
+PROVIDERS: Dict[str, ProviderFactory] = {
+    'sample': lambda: SampleProvider(current_app.config.get('CAREERJET_AFFID', DEFAULT_CAREERJET_AFFID)),
+    'careerjet': lambda: CareerJetProvider(
+        get_client(),
+        current_app.config['CAREERJET_API_URL'],
+        current_app.config.get('CAREERJET_AFFID', DEFAULT_CAREERJET_AFFID),
+        current_app.config.get('CAREERJET_LOCALE', 'en_GB'),
+    ),
+}
+
+
+def register_provider(name: str, factory: ProviderFactory):
+    PROVIDERS[name] = factory
+
+
+def get_provider(name: Optional[str] = None) -> JobProvider:
+    name = name or current_app.config.get('JOBS_PROVIDER', 'sample')
+    try:
+        return PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(f'Unknown job provider {name!r}')
@@ -0,0 +1,149 @@
+"""
+Jobs Blueprint routes - job search and job applications
+"""
+from datetime import datetime
+
+from flask import current_app, flash, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from app.jobs import jobs
+from app.jobs.client import CircuitOpen, UpstreamError
+from app.jobs.cache import search_jobs
+from app.jobs.prefetch import prefetch_next_page
+from app.jobs.providers import get_provider
+from app.notifications import Notification, notify
+from models import db, JobApplication
+
+
+@jobs.route('/job-search', methods=['GET', 'POST'])
+def job_search():
+    """Search for jobs through the configured job provider (CareerJet by default)"""
+    jobs = []
+    total_jobs = 0
+    error_message = None
+    search_performed = False
+    partial = False
+    keywords = request.args.get('keywords', '')
+    location = request.args.get('location', '')
+    page = request.args.get('page', 1, type=int)
+    
+    if request.method == 'POST' or (keywords and location):
+        search_performed = True
+        keywords = request.form.get('keywords', '') or keywords
+        location = request.form.get('location', '') or location
+        
+        if keywords and location:
+            provider = get_provider()
+            try:
+                result = search_jobs(keywords, location, page=page, provider=provider)
+                jobs = result.jobs
+                total_jobs = result.total
+                partial = result.partial
+                prefetch_next_page(provider, keywords, location, page, result)
+            except CircuitOpen:
+                error_message = "Job search is temporarily unavailable. Please try again in a minute."
+            except UpstreamError as e:
+                current_app.logger.error('Job provider %s failed: %s', provider.name, e)
+                error_message = "The job provider did not respond in time. Please try again."
+        else:
+            error_message = "Please enter both job keywords and location."
+    
+    return render_template('job_search.html', 
+                         jobs=jobs, 
+                         total_jobs=total_jobs,
+                         error_message=error_message,
+                         search_performed=search_performed,
+                         partial=partial,
+                         keywords=keywords,
+                         location=location,
+                         page=page)
+
+
+@jobs.route('/job-application/<job_id>', methods=['GET', 'POST'])
+@login_required
+def job_application(job_id):
+    """Submit job application - requires login"""
+    if request.method == 'POST':
+        try:
+            full_name = request.form.get('full_name')
+            email = request.form.get('email')
+            phone = request.form.get('phone')
+            message = request.form.get('message', '')
+            
+            # Get job details from request
+            job_title = request.form.get('job_title')
+            company = request.form.get('company')
+            location = request.form.get('location')
+            job_url = request.form.get('job_url')
+            
+            # Create job application
+            job_app = JobApplication(
+                user_id=current_user.id if current_user.is_authenticated else None,
+                job_id=job_id,
+                job_title=job_title,
+                company=company,
+                location=location,
+                job_url=job_url,
+                full_name=full_name,
+                email=email,
+                phone=phone,
+                message=message,
+                status='Applied'
+            )
+            
+            db.session.add(job_app)
+            db.session.commit()
+            
+            # Confirmation email goes out from the notification queue, not this request
+            notify(Notification(
+                email,
+                f"Application Submitted - {job_title}",
+                f"""Dear {full_name},
+
+Your application for {job_title} at {company} has been submitted successfully!
+
+We have forwarded your details to the employer. Please check the job posting for further instructions.
+
+Job: {job_title}
+Company: {company}
+Location: {location}
+Applied on: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+
+Best regards,
+Nexora Global - Career Services
+
+For more opportunities, visit: https://nexora.com/job-search
+""",
+            ))
+            
+            flash(f'✅ Application submitted successfully for {job_title}!', 'success')
+            return redirect(url_for('jobs.job_search'))
+            
+        except Exception as e:
+            flash(f'❌ Error submitting application: {str(e)}', 'danger')
+            return redirect(url_for('jobs.job_search'))
+    
+    # GET request - show application form
+    job_title = request.args.get('job_title', '')
+    company = request.args.get('company', '')
+    location = request.args.get('location', '')
+    job_url = request.args.get('job_url', '')
+    
+    return render_template('job_application_form.html',
+                         job_id=job_id,
+                         job_title=job_title,
+                         company=company,
+                         location=location,
+                         job_url=job_url)
+
+
+@jobs.route('/my-job-applications')
+@login_required
+def my_job_applications():
+    """View all job applications for current user"""
+    page = request.args.get('page', 1, type=int)
+    job_apps = JobApplication.query.filter_by(user_id=current_user.id).order_by(
+        JobApplication.created_at.desc()
+    ).paginate(page=page, per_page=10)
+    
+    return render_template('my_job_applications.html', job_apps=job_apps)
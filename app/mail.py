@@ -0,0 +1,47 @@
+"""Outgoing email.
+
+Flask-Mail is set up the first time a message is sent rather than at app
+creation, so workers that never send mail never import it.
+"""
+from flask import current_app
+
+
+def get_mail():
+    state = current_app.extensions.get('mail')
+    if state is None:
+        from flask_mail import Mail
+        Mail(current_app._get_current_object())
+        state = current_app.extensions['mail']
+    return state
+
+
+def reset_mail(app):
+    """Drop the Flask-Mail state so each worker opens its own SMTP connections."""
+    app.extensions.pop('mail', None)
+
+
+def init_app(app):
+    from app import prefork
+    prefork.on_after_fork(app, reset_mail)
+
+
+def build_message(recipient, subject, body=None, html_content=None, sender=None):
+    from flask_mail import Message
+    get_mail()  # Message() reads the default sender from the mail state
+    msg = Message(subject, sender=sender or current_app.config.get('MAIL_USERNAME'), recipients=[recipient])
+    if body:
+        msg.body = body
+    if html_content:
+        msg.html = html_content
+    return msg
+
+
+def send_email(recipient, subject, body=None, html_content=None, sender=None):
+    get_mail().send(build_message(recipient, subject, body, html_content, sender))
+
+
+def send_batch(messages):
+    """Send several messages over one SMTP connection."""
+    with get_mail().connect() as conn:
+        for msg in messages:
+            conn.send(msg)
@@ -0,0 +1,117 @@
+"""Outgoing notification queue.
+
+Views queue emails here instead of sending them inline. A per-process
+background thread drains the queue. It takes up to
+``NOTIFICATIONS_BATCH_SIZE`` messages at a time and sends each batch over
+one SMTP connection, so a bulk API call that touches hundreds of
+applications costs one connection per batch rather than one SMTP
+round trip per applicant inside the request.
+
+With ``NOTIFICATIONS_SYNC`` set (handy in tests) messages are sent inline.
+The queue is bounded by ``NOTIFICATIONS_MAX_PENDING``; when it is full,
+new messages are dropped and logged rather than blocking the request.
+"""
+import queue
+import threading
+from typing import Iterable, NamedTuple, Optional
+
+from flask import current_app
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_PENDING = 10000
+
+
+class Notification(NamedTuple):
+    recipient: str
+    subject: str
+    body: str
+    html: Optional[str] = None
+
+
+class NotificationQueue:
+    def __init__(self, app, batch_size: int = DEFAULT_BATCH_SIZE, max_pending: int = DEFAULT_MAX_PENDING,
+                 sync: bool = False):
+        self.app = app
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.sync = sync
+        self.stats = {'queued': 0, 'sent': 0, 'failed': 0, 'dropped': 0}
+        self.reset()
+
+    def reset(self):
+        """Fresh queue and no worker thread (after fork the parent's thread does not exist)."""
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def enqueue(self, notifications: Iterable[Notification]) -> int:
+        notifications = list(notifications)
+        if self.sync:
+            self._deliver(notifications)
+            return len(notifications)
+        queued = 0
+        for notification in notifications:
+            try:
+                self._queue.put_nowait(notification)
+                queued += 1
+            except queue.Full:
+                self.stats['dropped'] += 1
+                self.app.logger.error('Notification queue full, dropped mail to %s', notification.recipient)
+        self.stats['queued'] += queued
+        if queued:
+            self._ensure_worker()
+        return queued
+
+    def join(self):
+        """Block until everything queued so far has been handled."""
+        self._queue.join()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='notifications', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver(self, batch):
+        from app.mail import build_message, send_batch
+        with self.app.app_context():
+            sender = self.app.config.get('MAIL_DEFAULT_SENDER')
+            try:
+                send_batch(build_message(n.recipient, n.subject, n.body, n.html, sender) for n in batch)
+                self.stats['sent'] += len(batch)
+            except Exception as e:
+                self.stats['failed'] += len(batch)
+                self.app.logger.error('Could not send %d notification(s): %s', len(batch), e)
+
+
+def get_queue() -> NotificationQueue:
+    return current_app.extensions['notifications']
+
+
+def notify(*notifications: Notification) -> int:
+    return get_queue().enqueue(notifications)
+
+
+def init_app(app):
+    from app import prefork
+    notifications = app.extensions['notifications'] = NotificationQueue(
+        app,
+        batch_size=app.config.get('NOTIFICATIONS_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+        max_pending=app.config.get('NOTIFICATIONS_MAX_PENDING', DEFAULT_MAX_PENDING),
+        sync=app.config.get('NOTIFICATIONS_SYNC', False),
+    )
+    prefork.on_after_fork(app, lambda app: notifications.reset())
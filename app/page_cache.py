@@ -0,0 +1,407 @@
+"""Full-page response cache for anonymous visitors.
+
+Marketing and policy pages (index, about, terms, privacy, ...) render the
+same HTML for every anonymous visitor, so the whole response is cached and
+replayed without running the view or Jinja. Logged-in users always get a
+fresh render because the layout shows their name and account menu. So
+does a response that writes the session (it would carry this visitor's
+cookie). Cached responses carry ``Vary: Cookie`` for shared caches in front
+of the app.
+
+Cache keys include a version made from the deploy id and a fingerprint of
+the template files, so a deploy or a template edit invalidates everything.
+They use the path only: a query string never reaches the key unless the view
+lists the parameters it reads (``cached_page(query=('page',))``), so varying
+it cannot fill the cache.
+
+Backends are pluggable via PAGE_CACHE_BACKEND:
+    'lru'         in-process LRU (default)
+    'filesystem'  pickled entries under PAGE_CACHE_DIR, shared by workers;
+                  at most PAGE_CACHE_MAX_ENTRIES, and a new version deletes
+                  the entries of the old ones
+    'redis'       PAGE_CACHE_REDIS_URL; 'memory://' uses LocalRedis, an
+                  in-process stand-in exposing the same client calls
+    'null'        disabled
+"""
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Optional, Sequence
+
+from flask import current_app, request, session, make_response
+
+DEFAULT_TIMEOUT = 300
+DEFAULT_MAX_ENTRIES = 512
+
+# Headers that must never be replayed to another visitor
+_UNSAFE_HEADERS = {'set-cookie', 'content-length'}
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class NullBackend:
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, timeout: int):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUBackend:
+    """Bounded in-process cache; entries expire after their timeout."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires and expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        expires = time.monotonic() + timeout if timeout else 0
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FileSystemBackend:
+    """Entries pickled to one file per key; safe to share between worker processes.
+
+    Each ``set`` prunes the least recently used files beyond ``max_entries``.
+    """
+
+    def __init__(self, directory: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.root = self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def use_version(self, version: str):
+        """Keep entries in a directory per version and delete every other version's."""
+        name = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+        self.directory = os.path.join(self.root, name)
+        os.makedirs(self.directory, exist_ok=True)
+        for other in os.listdir(self.root):
+            path = os.path.join(self.root, other)
+            if other == name:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                self._remove(path)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                expires, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires and expires < time.time():
+            self.delete(key)
+            return None
+        self._touch(self._path(key))  # recently used: pruned last
+        return value
+
+    @staticmethod
+    def _touch(path):
+        # An explicit stamp: the filesystem's own clock may be too coarse to order entries
+        now = time.time_ns()
+        try:
+            os.utime(path, ns=(now, now))
+        except OSError:
+            pass
+
+    def set(self, key, value, timeout):
+        expires = time.time() + timeout if timeout else 0
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump((expires, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._touch(path)
+        except FileNotFoundError:
+            # A newer version swept this directory away (another release sharing it)
+            return
+        self._prune()
+
+    def _prune(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.tmp'):  # another writer's entry, not yet in place
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.stat(path).st_mtime_ns, path))
+            except OSError:
+                pass
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def delete(self, key):
+        self._remove(self._path(key))
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            self._remove(os.path.join(self.directory, name))
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of the redis-py client used here."""
+
+    def __init__(self):
+        self._store = LRUBackend(max_entries=10_000)
+
+    def get(self, name):
+        return self._store.get(name)
+
+    def set(self, name, value, ex=None):
+        self._store.set(name, value, ex or 0)
+        return True
+
+    def setex(self, name, time, value):
+        return self.set(name, value, ex=time)
+
+    def delete(self, *names):
+        for name in names:
+            self._store.delete(name)
+        return len(names)
+
+    def flushdb(self):
+        self._store.clear()
+        return True
+
+
+class RedisBackend:
+    """Stores pickled entries in Redis (or any client with get/setex/delete)."""
+
+    def __init__(self, client, prefix: str = 'nexora:page:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str):
+        if url.startswith('memory://'):
+            return cls(LocalRedis())
+        import redis  # optional dependency, only needed for a real server
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, timeout):
+        self.client.setex(self.prefix + key, timeout or DEFAULT_TIMEOUT, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        # Entries are versioned, so a version bump is enough to invalidate them
+        if isinstance(self.client, LocalRedis):
+            self.client.flushdb()
+
+    def reset(self):
+        """Drop pooled connections (called in each worker after fork)."""
+        pool = getattr(self.client, 'connection_pool', None)
+        if pool is not None:
+            pool.reset()
+
+
+def create_backend(config, prefix: str = 'PAGE_CACHE', kind: Optional[str] = None) -> Any:
+    """Backend from the ``<prefix>_BACKEND``, ``_DIR``, ``_REDIS_URL`` and ``_MAX_ENTRIES`` settings."""
+    kind = (kind or config.get(f'{prefix}_BACKEND') or 'lru').lower()
+    max_entries = config.get(f'{prefix}_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+    if kind == 'null':
+        return NullBackend()
+    if kind == 'filesystem':
+        directory = (config.get(f'{prefix}_DIR')
+                     or os.path.join(config.get('UPLOAD_FOLDER', '.'), f'.{prefix.lower()}'))
+        return FileSystemBackend(directory, max_entries)
+    if kind == 'redis':
+        return RedisBackend.from_url(config.get(f'{prefix}_REDIS_URL') or 'memory://')
+    return LRUBackend(max_entries)
+
+
+# ---------------------------------------------------------------------------
+# Versioning
+# ---------------------------------------------------------------------------
+
+def deploy_id(config) -> str:
+    """Identify the running release; any change here invalidates cached pages."""
+    return (config.get('PAGE_CACHE_VERSION')
+            or os.environ.get('RELEASE_VERSION')
+            or os.environ.get('RENDER_GIT_COMMIT')
+            or os.environ.get('GIT_SHA')
+            or '')
+
+
+def template_fingerprint(app) -> str:
+    """Hash of (path, mtime, size) for every template the app can load."""
+    h = hashlib.sha1()
+    folders = [app.template_folder and os.path.join(app.root_path, app.template_folder)]
+    folders += [bp.jinja_loader.searchpath[0] for bp in app.blueprints.values() if bp.jinja_loader]
+    for folder in sorted(f for f in folders if f and os.path.isdir(f)):
+        for root, _, files in os.walk(folder):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                h.update(f'{path}:{st.st_mtime_ns}:{st.st_size}'.encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+class _CacheState:
+    def __init__(self, app):
+        self.app = app
+        self.backend = create_backend(app.config)
+        self.timeout = app.config.get('PAGE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+        self.enabled = not isinstance(self.backend, NullBackend)
+        # With auto-reload on (development) re-check templates every few seconds
+        self.check_interval = 2.0 if app.config.get('TEMPLATES_AUTO_RELOAD') else None
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self) -> str:
+        now = time.monotonic()
+        if self._version is None or (self.check_interval and now - self._checked_at > self.check_interval):
+            version = f'{deploy_id(self.app.config)}-{template_fingerprint(self.app)}'
+            if version != self._version and hasattr(self.backend, 'use_version'):
+                self.backend.use_version(version)
+            self._version = version
+            self._checked_at = now
+        return self._version
+
+
+# ---------------------------------------------------------------------------
+# Extension
+# ---------------------------------------------------------------------------
+
+class PageCache:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app import prefork
+        state = app.extensions['page_cache'] = _CacheState(app)
+        # Fingerprint templates once in the master instead of in every worker
+        prefork.on_warmup(app, lambda app: state.version)
+        prefork.on_after_fork(app, lambda app: getattr(state.backend, 'reset', lambda: None)())
+
+    @staticmethod
+    def _state() -> Optional[_CacheState]:
+        return current_app.extensions.get('page_cache')
+
+    @staticmethod
+    def _is_anonymous() -> bool:
+        try:
+            from flask_login import current_user
+            return not current_user.is_authenticated
+        except Exception:
+            return True
+
+    def make_key(self, state: _CacheState, auth_state: str, query: Sequence[str] = ()) -> str:
+        params = '&'.join(f'{name}={value}' for name in sorted(query)
+                          for value in request.args.getlist(name))
+        return f'{state.version}:{auth_state}:{request.path}?{params}'
+
+    def cached(self, timeout: Optional[int] = None, query: Sequence[str] = ()):
+        """Cache the full response of a GET view for anonymous visitors.
+
+        ``query`` names the query parameters the view reads; all others are
+        left out of the key.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                state = self._state()
+                if (state is None or not state.enabled
+                        or request.method not in ('GET', 'HEAD')
+                        or not self._is_anonymous()
+                        or session.get('_flashes')):
+                    return view(*args, **kwargs)
+
+                key = self.make_key(state, 'anon', query)
+                entry = state.backend.get(key)
+                if entry is not None:
+                    state.hits += 1
+                    body, status, headers = entry
+                    response = current_app.response_class(body, status=status, headers=headers)
+                    response.headers['X-Page-Cache'] = 'HIT'
+                    return response
+
+                state.misses += 1
+                response = make_response(view(*args, **kwargs))
+                # The session cookie is only added after this wrapper returns, so ask the
+                # session interface whether it will be; such a page belongs to this visitor
+                if (response.status_code == 200 and not response.direct_passthrough
+                        and 'Set-Cookie' not in response.headers
+                        and not current_app.session_interface.should_set_cookie(current_app, session)):
+                    response.vary.add('Cookie')
+                    headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _UNSAFE_HEADERS]
+                    state.backend.set(key, (response.get_data(), response.status_code, headers),
+                                      timeout or state.timeout)
+                response.headers['X-Page-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def clear(self):
+        state = self._state()
+        if state is not None:
+            state.backend.clear()
+            state._version = None
+
+
+page_cache = PageCache()
+cached_page = page_cache.cached
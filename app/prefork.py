@@ -0,0 +1,123 @@
+"""Preload support: build shared data in the master, reset per-process state after fork.
+
+With ``preload_app`` (see gunicorn.conf.py) the app is created once in the
+gunicorn master and forked into each worker. Two kinds of hooks make that
+safe and worthwhile:
+
+* warm-up hooks run in the master: they build immutable catalogs, indexes
+  and compiled templates so every worker shares them copy-on-write;
+* after-fork hooks run in each worker: anything holding sockets, threads or
+  locks (DB engines, SMTP/HTTP clients, thread pools) is reset there so no
+  two processes share a connection.
+
+Extensions register their hooks from ``init_app``::
+
+    prefork.on_warmup(app, build_index)
+    prefork.on_after_fork(app, lambda app: client.close())
+"""
+import gc
+from typing import Callable, Dict, List
+
+Hook = Callable[..., None]
+
+
+class _PreforkState:
+    def __init__(self):
+        self.warmups: List[Hook] = []
+        self.after_fork: List[Hook] = []
+        self.warmed = False
+
+
+def _state(app) -> _PreforkState:
+    state = app.extensions.get('prefork')
+    if state is None:
+        state = app.extensions['prefork'] = _PreforkState()
+    return state
+
+
+def on_warmup(app, fn: Hook) -> Hook:
+    """Register fn(app) to run once in the master before workers fork."""
+    _state(app).warmups.append(fn)
+    return fn
+
+
+def on_after_fork(app, fn: Hook) -> Hook:
+    """Register fn(app) to run in every worker right after fork."""
+    _state(app).after_fork.append(fn)
+    return fn
+
+
+def warm_up(app) -> int:
+    """Run the warm-up hooks (once) inside an app context; returns how many ran."""
+    state = _state(app)
+    if state.warmed:
+        return 0
+    with app.app_context():
+        for fn in state.warmups:
+            try:
+                fn(app)
+            except Exception as e:
+                app.logger.error('Warm-up hook %s failed: %s', getattr(fn, '__name__', fn), e)
+    state.warmed = True
+    return len(state.warmups)
+
+
+def run_after_fork(app) -> int:
+    """Run the after-fork hooks inside an app context; returns how many ran."""
+    hooks = _state(app).after_fork
+    with app.app_context():
+        for fn in hooks:
+            try:
+                fn(app)
+            except Exception as e:
+                app.logger.error('After-fork hook %s failed: %s', getattr(fn, '__name__', fn), e)
+    return len(hooks)
+
+
+def freeze():
+    """Move everything allocated so far into gc's permanent generation.
+
+    Collections then never touch (and so never write to) the objects built in
+    the master, which keeps their pages shared between workers.
+    """
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def dispose_engines(app):
+    """Drop pooled DB connections inherited from the master (they are not fork-safe)."""
+    from models import db
+    for engine in db.engines.values():
+        engine.dispose(close=False)
+
+
+def memory_report(pid='self') -> Dict[str, float]:
+    """RSS/PSS/shared/private memory of a process in MB (Linux; empty elsewhere)."""
+    fields = {'Rss': 'rss_mb', 'Pss': 'pss_mb', 'Shared_Clean': 'shared_clean_mb',
+              'Shared_Dirty': 'shared_dirty_mb', 'Private_Clean': 'private_clean_mb',
+              'Private_Dirty': 'private_dirty_mb'}
+    report = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in fields:
+                    report[fields[key]] = int(rest.split()[0]) / 1024
+    except OSError:
+        return report
+    report['shared_mb'] = report.get('shared_clean_mb', 0) + report.get('shared_dirty_mb', 0)
+    report['private_mb'] = report.get('private_clean_mb', 0) + report.get('private_dirty_mb', 0)
+    return report
+
+
+def format_memory(report: Dict[str, float]) -> str:
+    if not report:
+        return 'memory report unavailable'
+    return (f"rss {report['rss_mb']:.1f} MB, pss {report['pss_mb']:.1f} MB, "
+            f"shared {report['shared_mb']:.1f} MB, private {report['private_mb']:.1f} MB")
+
+
+def init_app(app):
+    _state(app)
+    on_after_fork(app, dispose_engines)
@@ -0,0 +1,445 @@
+"""Sampling request profiler: which routes are slow in production, and why?
+
+When ``PROFILER_SAMPLE_RATE`` is above 0, the WSGI app is wrapped in
+``ProfilerMiddleware``. The middleware profiles that fraction of requests,
+picked at random. For each sampled request it records:
+
+* total latency and response status, under the Flask endpoint name;
+* SQL statement count and time, from SQLAlchemy cursor events;
+* template render time, from Flask's template signals;
+* a profile as folded stacks (``a;b;c <µs>``), ready for flamegraph.pl or
+  speedscope. ``PROFILER_MODE`` picks how the profile is taken:
+
+  - ``'sampling'`` (default): a helper OS thread snapshots the request's
+    stack every ``PROFILER_INTERVAL`` seconds. Overhead is low and the stacks
+    are real, but requests shorter than one interval have no stacks.
+  - ``'cprofile'``: deterministic cProfile. Stacks are rebuilt from caller
+    edges, so time is shared out in proportion when a function has several
+    callers. Only one cProfile can run per process, so a request sampled
+    while another one is being profiled uses the stack sampler instead.
+
+Under the gevent server profile (monkey-patched threading), every request is
+a greenlet on one OS thread. The sampler then runs on a real OS thread, made
+with gevent's unpatched originals, and follows the request's greenlet. When
+the greenlet is switched out (waiting on I/O), its own suspended stack is
+recorded, not whatever runs in its place. cProfile cannot tell greenlets
+apart: in ``'cprofile'`` mode, other requests that run while a sampled one
+waits are counted in its profile, so keep ``'sampling'`` under gevent.
+
+Samples go to a SQLite file at ``PROFILER_STORE_PATH``, which the workers
+share. Only the newest ``PROFILER_MAX_SAMPLES`` are kept. ``/admin/profiles``
+lists the slowest endpoints, and ``/admin/profiles/flame`` returns their
+merged folded stacks.
+
+When the rate is 0 nothing is installed: no wrapper, no event listeners,
+no signal handlers.
+"""
+import _thread
+import cProfile
+import functools
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from flask import current_app, request
+from flask.signals import before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MODES = ('sampling', 'cprofile')
+DEFAULT_INTERVAL = 0.005
+DEFAULT_MAX_SAMPLES = 2000
+MAX_DEPTH = 128
+UNMATCHED = '<unmatched>'
+# cProfile stacks: skip branches worth less than this share of the request
+_MIN_SHARE = 0.001
+
+logger = logging.getLogger(__name__)
+_current: ContextVar[Optional['Sample']] = ContextVar('profiler_sample', default=None)
+_cprofile_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    endpoint TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status INTEGER,
+    latency_ms REAL NOT NULL,
+    sql_count INTEGER NOT NULL,
+    sql_ms REAL NOT NULL,
+    template_ms REAL NOT NULL,
+    mode TEXT NOT NULL,
+    folded TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_samples_endpoint ON samples (endpoint);
+"""
+
+
+@dataclass
+class Sample:
+    method: str
+    path: str
+    endpoint: str = UNMATCHED
+    status: Optional[int] = None
+    latency_ms: float = 0.0
+    sql_count: int = 0
+    sql_ms: float = 0.0
+    template_ms: float = 0.0
+    mode: str = 'sampling'
+    folded: Dict[str, int] = field(default_factory=dict)
+    _sql_started: float = 0.0
+    _template_started: float = 0.0
+    _template_depth: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Stack collection
+# ---------------------------------------------------------------------------
+
+def _frame_label(code) -> str:
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _function_label(func) -> str:
+    filename, lineno, name = func
+    if filename == '~':  # built-in
+        return name
+    return f'{name} ({os.path.basename(filename)}:{lineno})'
+
+
+def fold_frame(frame) -> str:
+    """Stack of `frame`, outermost call first, as a folded-stack key."""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+def fold_profile(stats: Dict) -> Dict[str, int]:
+    """Folded stacks (µs) rebuilt from cProfile's ``stats`` caller edges.
+
+    cProfile keeps only caller -> callee totals, so each callee's subtree is
+    scaled by the share of its time spent under that caller.
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+    total = sum(ct for func, (_, _, _, ct, callers) in stats.items() if not callers) or 1.0
+    folded = Counter()
+
+    def walk(func, path, stack, share):
+        _, _, tt, ct, _ = stats[func]
+        path = path + (_function_label(func),)
+        if tt * share > 0:
+            folded[';'.join(path)] += tt * share
+        if len(path) >= MAX_DEPTH:
+            folded[';'.join(path)] += (ct - tt) * share
+            return
+        for child, edge_ct in callees.get(func, {}).items():
+            child_ct = stats[child][3]
+            if child in stack or child_ct <= 0 or edge_ct * share < total * _MIN_SHARE:
+                continue
+            walk(child, path, stack | {child}, share * edge_ct / child_ct)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, (), frozenset((func,)), 1.0)
+    return {stack: int(seconds * 1e6) for stack, seconds in folded.items() if seconds * 1e6 >= 1}
+
+
+@functools.lru_cache(maxsize=None)
+def _os_threads():
+    """(get_ident, start_new_thread, allocate_lock) for real OS threads, even under gevent."""
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            return tuple(monkey.get_original('_thread', name)
+                         for name in ('get_ident', 'start_new_thread', 'allocate_lock'))
+    return _thread.get_ident, _thread.start_new_thread, _thread.allocate_lock
+
+
+def _current_greenlet():
+    if 'greenlet' not in sys.modules:
+        return None
+    import greenlet
+    current = greenlet.getcurrent()
+    # The main greenlet is just the thread itself
+    return current if current.parent is not None else None
+
+
+class StackSampler:
+    """Snapshots one thread's (or greenlet's) stack every `interval` seconds from a helper OS thread."""
+    mode = 'sampling'
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_INTERVAL, greenlet=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.greenlet = greenlet
+        self.counts = Counter()
+        _, start_new_thread, allocate_lock = _os_threads()
+        # Held until stop(): the sampler waits on it between snapshots, so stopping is immediate
+        self._running = allocate_lock()
+        self._running.acquire()
+        self._done = allocate_lock()
+        self._done.acquire()
+        start_new_thread(self._run, ())
+
+    def _frame(self):
+        # A switched-out greenlet keeps its stack in gr_frame; a running one is the thread's stack
+        frame = self.greenlet.gr_frame if self.greenlet is not None else None
+        return frame if frame is not None else sys._current_frames().get(self.thread_id)
+
+    def _run(self):
+        try:
+            while not self._running.acquire(timeout=self.interval):
+                frame = self._frame()
+                if frame is not None:
+                    self.counts[fold_frame(frame)] += 1
+        finally:
+            self._done.release()
+
+    def stop(self) -> Dict[str, int]:
+        self._running.release()
+        self._done.acquire()
+        return {stack: int(n * self.interval * 1e6) for stack, n in self.counts.items()}
+
+
+class CProfileCollector:
+    mode = 'cprofile'
+
+    def __init__(self):
+        # Caller holds _cprofile_lock
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self) -> Dict[str, int]:
+        try:
+            self.profile.disable()
+            self.profile.create_stats()
+            return fold_profile(self.profile.stats)
+        finally:
+            _cprofile_lock.release()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def _percentile(values: List[float], pct: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+class ProfileStore:
+    """Sampled requests in a SQLite file shared by the workers."""
+
+    def __init__(self, path: str, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.path = path
+        self.max_samples = max_samples
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self._local = threading.local()
+
+    def add(self, sample: Sample, now: Optional[float] = None) -> int:
+        conn = self.connection()
+        with conn:
+            sample_id = conn.execute(
+                'INSERT INTO samples (created_at, endpoint, method, path, status, latency_ms, sql_count, sql_ms,'
+                ' template_ms, mode, folded) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (time.time() if now is None else now, sample.endpoint, sample.method, sample.path, sample.status,
+                 sample.latency_ms, sample.sql_count, sample.sql_ms, sample.template_ms, sample.mode,
+                 json.dumps(sample.folded))).lastrowid
+            conn.execute('DELETE FROM samples WHERE id <= ?', (sample_id - self.max_samples,))
+        return sample_id
+
+    def get(self, sample_id: int) -> Optional[Dict]:
+        row = self.connection().execute('SELECT * FROM samples WHERE id = ?', (sample_id,)).fetchone()
+        if row is None:
+            return None
+        sample = dict(row)
+        sample['folded'] = json.loads(sample['folded'])
+        return sample
+
+    def slowest_endpoints(self, limit: int = 20) -> List[Dict]:
+        """Per-endpoint latency and SQL/template time, slowest p95 first."""
+        groups = defaultdict(list)
+        for row in self.connection().execute(
+                'SELECT id, endpoint, latency_ms, sql_count, sql_ms, template_ms FROM samples'):
+            groups[row['endpoint']].append(row)
+        endpoints = []
+        for endpoint, rows in groups.items():
+            latencies = sorted(r['latency_ms'] for r in rows)
+            slowest = max(rows, key=lambda r: r['latency_ms'])
+            endpoints.append({
+                'endpoint': endpoint,
+                'samples': len(rows),
+                'ms_p50': round(_percentile(latencies, 0.5), 3),
+                'ms_p95': round(_percentile(latencies, 0.95), 3),
+                'ms_max': round(latencies[-1], 3),
+                'sql_count_mean': round(sum(r['sql_count'] for r in rows) / len(rows), 1),
+                'sql_ms_mean': round(sum(r['sql_ms'] for r in rows) / len(rows), 3),
+                'template_ms_mean': round(sum(r['template_ms'] for r in rows) / len(rows), 3),
+                'slowest_sample': slowest['id'],
+            })
+        endpoints.sort(key=lambda e: -e['ms_p95'])
+        return endpoints[:limit]
+
+    def flame(self, endpoint: str) -> Dict[str, int]:
+        """Folded stacks of every sample of `endpoint`, summed."""
+        merged = Counter()
+        for (folded,) in self.connection().execute('SELECT folded FROM samples WHERE endpoint = ?', (endpoint,)):
+            merged.update(json.loads(folded))
+        return dict(merged)
+
+    def clear(self):
+        conn = self.connection()
+        with conn:
+            conn.execute('DELETE FROM samples')
+
+
+def format_folded(folded: Dict[str, int]) -> str:
+    return ''.join(f'{stack} {value}\n' for stack, value in sorted(folded.items()))
+
+
+# ---------------------------------------------------------------------------
+# Middleware and hooks
+# ---------------------------------------------------------------------------
+
+class ProfilerMiddleware:
+    """Profiles a random `rate` fraction of requests into `store`."""
+
+    def __init__(self, wsgi_app, store: ProfileStore, rate: float, mode: str = 'sampling',
+                 interval: float = DEFAULT_INTERVAL, chance=random.random):
+        if mode not in MODES:
+            raise ValueError(f"PROFILER_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+        self.wsgi_app = wsgi_app
+        self.store = store
+        self.rate = rate
+        self.mode = mode
+        self.interval = interval
+        self.chance = chance
+
+    def __call__(self, environ, start_response):
+        if self.chance() >= self.rate:
+            return self.wsgi_app(environ, start_response)
+        return self._profiled(environ, start_response)
+
+    def _collector(self):
+        if self.mode == 'cprofile' and _cprofile_lock.acquire(blocking=False):
+            try:
+                return CProfileCollector()
+            except Exception:
+                _cprofile_lock.release()
+        return StackSampler(_os_threads()[0](), self.interval, _current_greenlet())
+
+    def _profiled(self, environ, start_response):
+        sample = Sample(environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO', ''))
+
+        def capture_status(status, headers, exc_info=None):
+            sample.status = int(status.split(' ', 1)[0])
+            return start_response(status, headers, exc_info)
+
+        token = _current.set(sample)
+        collector = self._collector()
+        started = time.perf_counter()
+        try:
+            # The profile covers the view; a streamed body is sent after it ends
+            return self.wsgi_app(environ, capture_status)
+        finally:
+            sample.latency_ms = (time.perf_counter() - started) * 1000
+            sample.folded = collector.stop()
+            sample.mode = collector.mode
+            _current.reset(token)
+            try:
+                self.store.add(sample)
+            except Exception as e:
+                logger.error('Could not store request profile: %s', e)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sample = _current.get()
+    if sample is not None:
+        sample._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sample = _current.get()
+    if sample is not None:
+        sample.sql_count += 1
+        sample.sql_ms += (time.perf_counter() - sample._sql_started) * 1000
+
+
+def _before_render(sender, template, context, **extra):
+    sample = _current.get()
+    if sample is not None:
+        if sample._template_depth == 0:
+            sample._template_started = time.perf_counter()
+        sample._template_depth += 1
+
+
+def _after_render(sender, template, context, **extra):
+    sample = _current.get()
+    if sample is not None and sample._template_depth:
+        sample._template_depth -= 1
+        if sample._template_depth == 0:
+            sample.template_ms += (time.perf_counter() - sample._template_started) * 1000
+
+
+def get_profiler() -> Optional[ProfilerMiddleware]:
+    return current_app.extensions.get('profiler')
+
+
+def init_app(app):
+    rate = app.config.get('PROFILER_SAMPLE_RATE', 0)
+    if rate <= 0:
+        return
+    from app import prefork
+    store = ProfileStore(app.config.get('PROFILER_STORE_PATH') or os.path.join(app.instance_path, 'profiles.db'),
+                         app.config.get('PROFILER_MAX_SAMPLES', DEFAULT_MAX_SAMPLES))
+    profiler = ProfilerMiddleware(app.wsgi_app, store, min(rate, 1.0), app.config.get('PROFILER_MODE', 'sampling'),
+                                  app.config.get('PROFILER_INTERVAL', DEFAULT_INTERVAL))
+    app.wsgi_app = app.extensions['profiler'] = profiler
+    # SQLite connections must not cross a fork
+    prefork.on_after_fork(app, lambda app: store.close())
+
+    # Engine-wide listeners, registered once per process; they do nothing outside a sample
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def name_sample():
+        sample = _current.get()
+        if sample is not None and request.endpoint:
+            sample.endpoint = request.endpoint
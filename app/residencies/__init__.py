@@ -11,4 +11,17 @@ residencies = Blueprint(
     static_folder='static'
 )
 
+
+
+def init_app(app):
+    from app.residencies import catalog, decision, eligibility_cache, rates, similarity, thresholds, usd_amounts
+    rates.init_app(app)
+    usd_amounts.init_app(app)
+    catalog.init_app(app)
+    similarity.init_app(app)
+    thresholds.init_app(app)
+    decision.init_app(app)
+    eligibility_cache.init_app(app)
+
+
 from . import routes
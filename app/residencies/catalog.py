@@ -0,0 +1,230 @@
+"""
+In-memory catalog of residency programs.
+
+The program table is small and read on almost every residency request, so
+each worker keeps a snapshot of it. A Catalog holds:
+
+* ``programs`` – every program as its ``to_dict()``, ordered by id
+* ``raw`` – one row of FEATURES per program (None where the data is missing)
+* ``scores`` – the same features normalised to 0..1 across the catalog,
+  with 1 the best value in the catalog (cheapest, fastest, fewest documents...)
+
+``scores`` is a numpy array when numpy is installed, a list of rows
+otherwise. Row ``i`` belongs to ``programs[i]``; ``position[id]`` finds it.
+``indexes`` holds structures derived from the snapshot (similar programs,
+...), added by ``on_build`` listeners before the snapshot is served.
+
+The snapshot is rebuilt when it goes out of date:
+
+* a commit that inserted, updated or deleted a program (this worker);
+* a new exchange-rate version (USD amounts change with it);
+* every RESIDENCY_CATALOG_TTL seconds, a ``count(*)/max(updated_at)``
+  check picks up writes made by other workers or processes.
+
+``version`` is a hash of the snapshot's contents, so caches keyed on it
+survive a rebuild that changed nothing.
+"""
+import hashlib
+import json
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import object_session
+
+from app.residencies.models import ResidencyProgram
+from app.residencies.rates import current_rates
+from models import db
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional (requirements-light.txt)
+    np = None
+
+FEATURES = ('investment_usd', 'processing_months', 'family_limit', 'interview', 'documents')
+# +1: higher is better, -1: lower is better
+DIRECTIONS = {
+    'investment_usd': -1,
+    'processing_months': -1,
+    'family_limit': 1,
+    'interview': -1,
+    'documents': -1,
+}
+DEFAULT_TTL = 60
+
+
+def features(program: Dict) -> tuple:
+    """The FEATURES of one program dict. A family limit of None means no limit."""
+    return (
+        program.get('investment_min_usd'),
+        program.get('processing_time_months'),
+        program.get('family_size_limit'),
+        1 if program.get('interview_required') else 0,
+        len(program.get('documents_required') or ()),
+    )
+
+
+def _column_scores(values: List[Optional[float]], direction: int, unlimited_is_best: bool) -> List[Optional[float]]:
+    """Min-max normalise one column so the best value scores 1; missing values stay None."""
+    finite = [v for v in values if v is not None]
+    if not finite:
+        return [1.0 if unlimited_is_best else None for _ in values]
+    low, high = min(finite), max(finite)
+    if unlimited_is_best and len(finite) < len(values):
+        high += 1  # "no limit" ranks above the largest limit
+    span = high - low
+    scores = []
+    for v in values:
+        if v is None:
+            scores.append(1.0 if unlimited_is_best else None)
+        elif not span:
+            scores.append(1.0)
+        else:
+            scaled = (v - low) / span
+            scores.append(scaled if direction > 0 else 1.0 - scaled)
+    return scores
+
+
+class Catalog:
+    """One immutable snapshot of the program table with its feature vectors."""
+
+    def __init__(self, programs: Sequence[Dict], rates_version: str = '', fingerprint=None):
+        self.programs = tuple(programs)
+        self.position = {p['id']: i for i, p in enumerate(self.programs)}
+        self.rates_version = rates_version
+        self.fingerprint = fingerprint
+        self.built_at = time.time()
+        self.indexes: Dict[str, object] = {}
+        self.version = hashlib.sha1(
+            json.dumps([rates_version, self.programs], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:12]
+
+        self.raw = [features(p) for p in self.programs]
+        columns = [_column_scores([row[j] for row in self.raw], DIRECTIONS[name], name == 'family_limit')
+                   for j, name in enumerate(FEATURES)]
+        rows = [list(row) for row in zip(*columns)] if self.programs else []
+        if np is not None:
+            self.scores = np.array([[math.nan if s is None else s for s in row] for row in rows],
+                                   dtype=np.float64).reshape(len(rows), len(FEATURES))
+        else:
+            self.scores = rows
+
+    def __len__(self):
+        return len(self.programs)
+
+    def get(self, program_id: int) -> Optional[Dict]:
+        i = self.position.get(program_id)
+        return None if i is None else self.programs[i]
+
+    def score_row(self, i: int) -> List[Optional[float]]:
+        """Scores of programs[i] as plain floats, None where missing."""
+        return [None if s is None or s != s else float(s) for s in self.scores[i]]
+
+
+def _fingerprint():
+    count, updated = db.session.query(func.count(ResidencyProgram.id), func.max(ResidencyProgram.updated_at)).one()
+    return count, str(updated)
+
+
+def build_catalog() -> Catalog:
+    fingerprint = _fingerprint()
+    programs = ResidencyProgram.query.order_by(ResidencyProgram.id).all()
+    return Catalog([p.to_dict() for p in programs], rates_version=current_rates().version, fingerprint=fingerprint)
+
+
+class CatalogService:
+    def __init__(self, ttl: float = DEFAULT_TTL, builder=build_catalog):
+        self.ttl = ttl
+        self.builder = builder
+        self._catalog: Optional[Catalog] = None
+        self._checked_at = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def on_build(self, fn):
+        """Call fn(catalog) for each new snapshot, before it is served."""
+        self._listeners.append(fn)
+
+    def invalidate(self):
+        self._dirty = True
+
+    def current(self) -> Catalog:
+        catalog = self._catalog
+        if catalog is not None and not self._dirty and catalog.rates_version == current_rates().version:
+            if not self.ttl or time.time() - self._checked_at <= self.ttl:
+                return catalog
+            self._checked_at = time.time()
+            if _fingerprint() == catalog.fingerprint:
+                return catalog
+        return self.rebuild()
+
+    def rebuild(self, force: bool = False) -> Catalog:
+        """Build a snapshot now; an unchanged one keeps the current snapshot unless `force`."""
+        with self._lock:
+            self._dirty = False
+            self._checked_at = time.time()
+            catalog = self.builder()
+            previous = self._catalog
+            if not force and previous is not None and previous.version == catalog.version:
+                previous.fingerprint = catalog.fingerprint
+                return previous
+            for fn in self._listeners:
+                fn(catalog)
+            self._catalog = catalog
+            return catalog
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    service = current_app.extensions.get('residency_catalog')
+    if service is None:
+        return build_catalog()
+    return service.current()
+
+
+# A flush only marks the session; the catalog is invalidated once the
+# transaction commits, so it never snapshots rows that are later rolled back.
+
+@event.listens_for(ResidencyProgram, 'after_insert')
+@event.listens_for(ResidencyProgram, 'after_update')
+@event.listens_for(ResidencyProgram, 'after_delete')
+def _program_changed(mapper, connection, program):
+    session = object_session(program)
+    if session is not None:
+        session.info['residency_catalog_dirty'] = True
+
+
+@event.listens_for(db.session, 'after_commit')
+def _after_commit(session):
+    if session.info.pop('residency_catalog_dirty', False) and has_app_context():
+        service = current_app.extensions.get('residency_catalog')
+        if service is not None:
+            service.invalidate()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('residency_catalog_dirty', None)
+
+
+def init_app(app):
+    from app import prefork
+    service = app.extensions['residency_catalog'] = CatalogService(
+        ttl=app.config.get('RESIDENCY_CATALOG_TTL', DEFAULT_TTL))
+    # Registered after usd_amounts, so the USD columns are already rewritten when this runs
+    app.extensions['residency_rates'].on_change(lambda table: service.invalidate())
+
+    def warm_up(app):
+        # Built in the preloading master, the snapshot and its similarity,
+        # thresholds and decision indexes are shared copy-on-write by the workers
+        if inspect(db.engine).has_table(ResidencyProgram.__tablename__):
+            service.current()
+
+    prefork.on_warmup(app, warm_up)
+    prefork.on_after_fork(app, lambda app: service.reset_after_fork())
@@ -0,0 +1,53 @@
+"""
+Side-by-side comparison of residency programs.
+
+Comparison works on the catalog's precomputed feature vectors
+(app/residencies/catalog.py), so comparing 50 programs is a row lookup per
+program. It does not run a query or parse any data. The result is aligned
+by position:
+``values[k]`` and ``scores[k]`` belong to ``programs[k]``, and their
+columns follow ``features``.
+
+``best`` maps each feature to the ids holding the best value among the
+compared programs. Ties are all marked. A feature where every compared
+program is equal, or where none has data, marks nobody.
+"""
+from typing import Dict, Iterable, List
+
+from app.residencies.catalog import FEATURES, Catalog
+
+DEFAULT_MAX_PROGRAMS = 50
+SUMMARY_FIELDS = ('id', 'program_name', 'country', 'country_flag_code', 'program_type',
+                  'investment_currency', 'investment_min_amount', 'processing_time')
+
+
+def compare(catalog: Catalog, program_ids: Iterable[int]) -> Dict:
+    ids, missing, seen = [], [], set()
+    for program_id in program_ids:
+        if program_id in seen:
+            continue
+        seen.add(program_id)
+        (ids if program_id in catalog.position else missing).append(program_id)
+
+    rows = [catalog.position[program_id] for program_id in ids]
+    scores = [catalog.score_row(i) for i in rows]
+
+    best: Dict[str, List[int]] = {}
+    for j, name in enumerate(FEATURES):
+        column = [row[j] for row in scores]
+        present = [s for s in column if s is not None]
+        if not present or min(present) == max(present):
+            best[name] = []
+            continue
+        top = max(present)
+        best[name] = [program_id for program_id, s in zip(ids, column) if s == top]
+
+    return {
+        'catalog_version': catalog.version,
+        'features': list(FEATURES),
+        'programs': [{f: catalog.programs[i].get(f) for f in SUMMARY_FIELDS} for i in rows],
+        'values': [list(catalog.raw[i]) for i in rows],
+        'scores': scores,
+        'best': best,
+        'missing': missing,
+    }
@@ -5,7 +5,6 @@ Also provides CLI commands for database seeding
 import json
 import os
 from typing import Dict, Any, List
-from app import create_app
 from models import db
 from app.residencies.models import ResidencyProgram, ResidencyApplication
 from investment_data import investment_programs
@@ -152,6 +151,7 @@ class ResidencyDataLoader:
         Load all programs from investment_data.py into database
         """
         if app is None:
+            from app import create_app
             app = create_app()
         
         with app.app_context():
@@ -231,6 +231,7 @@ class ResidencyDataLoader:
         }
         """
         if app is None:
+            from app import create_app
             app = create_app()
         
         with app.app_context():
@@ -299,6 +300,7 @@ class ResidencyDataLoader:
     def export_to_json(cls, output_path: str, app=None):
         """Export all programs to JSON file"""
         if app is None:
+            from app import create_app
             app = create_app()
         
         with app.app_context():
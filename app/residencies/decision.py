@@ -0,0 +1,158 @@
+"""
+Precomputed eligibility decisions.
+
+A program's match score only depends on whether the profile clears four
+thresholds: minimum investment (40 points), family limit (30), net worth
+(20) and program type (10). For a fixed net-worth bucket, family size,
+program type and country (a *slice*), the ranked answer is a step function
+of the budget. It can only change at a program's investment minimum.
+
+Sweeping a slice's programs in order of their minimum builds that step function
+once: ``breaks`` (sorted budgets) and ``answers`` (top results from each
+break on). Raising the budget only adds 40 points to the programs it
+unlocks, so each step only has to merge the newly unlocked programs into
+the previous top results. After that, any budget is one bisect, O(log n).
+
+Slices are built when first asked for and kept in an LRU per catalog
+snapshot. The per-program arrays and the per-country sweep orders are built
+with the catalog. The ranking matches EligibilityChecker: score descending,
+then catalog (id) order, and programs scoring 0 are left out. Budgets within
+GUARD_USD of an investment minimum get None, and the caller runs the full
+check.
+"""
+import threading
+from bisect import bisect_right, insort
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.residencies.catalog import Catalog
+from app.residencies.thresholds import thresholds_for
+
+INVESTMENT, FAMILY, NET_WORTH, PROGRAM_TYPE = 40, 30, 20, 10
+MAX_RESULTS = 10  # EligibilityCheckResponse allows at most 10 programs
+DEFAULT_SLICES = 256
+
+
+class DecisionSlice:
+    __slots__ = ('breaks', 'answers')
+
+    def __init__(self, breaks: List[float], answers: List[Tuple[Tuple[int, int], ...]]):
+        self.breaks = breaks
+        self.answers = answers
+
+    def answer(self, budget: float) -> Tuple[Tuple[int, int], ...]:
+        """((catalog position, score), ...) for `budget`, best first."""
+        return self.answers[bisect_right(self.breaks, budget)]
+
+
+class DecisionIndex:
+    def __init__(self, catalog: Catalog, max_slices: int = DEFAULT_SLICES):
+        self.catalog = catalog
+        self.version = catalog.version
+        self.thresholds = thresholds_for(catalog)
+        self.max_slices = max_slices
+        programs = catalog.programs
+        # 0 / None stand for "no requirement", as in the eligibility checks
+        self.investment = [p.get('investment_min_usd') if p.get('investment_min_amount') else None for p in programs]
+        self.net_worth = [p.get('net_worth_required') or 0 for p in programs]
+        self.family = [p.get('family_size_limit') or 0 for p in programs]
+        self.program_type = [p.get('program_type') for p in programs]
+
+        members = defaultdict(list)
+        for pos, p in enumerate(programs):
+            members[None].append(pos)
+            members[p.get('country')].append(pos)
+        self.scopes = {}
+        for country, positions in members.items():
+            constrained = sorted((self.investment[pos], pos) for pos in positions if self.investment[pos] is not None)
+            self.scopes[country] = (positions, [v for v, _ in constrained], [pos for _, pos in constrained])
+
+        self.stats = {'slices_built': 0, 'slice_hits': 0, 'fallbacks': 0}
+        self._slices: 'OrderedDict[tuple, DecisionSlice]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def top(self, budget: float, net_worth: float, family_size: int, program_type: Optional[str] = None,
+            country: Optional[str] = None, rates_version: Optional[str] = None,
+            n: int = 5) -> Optional[List[Tuple[Dict, int]]]:
+        """The top `n` (program dict, score) pairs, or None when only the full check is exact."""
+        thresholds = self.thresholds
+        if (rates_version is not None and rates_version != thresholds.rates_version) \
+                or thresholds.investment_bucket(budget) is None:
+            self.stats['fallbacks'] += 1
+            return None
+        scope = self.scopes.get(country)
+        if scope is None:
+            return []
+        key = (country, thresholds.net_worth_bucket(net_worth), family_size, program_type)
+        with self._lock:
+            decision = self._slices.get(key)
+            if decision is not None:
+                self._slices.move_to_end(key)
+                self.stats['slice_hits'] += 1
+        if decision is None:
+            decision = self._build(scope, net_worth, family_size, program_type)
+            with self._lock:
+                self._slices[key] = decision
+                self.stats['slices_built'] += 1
+                while len(self._slices) > self.max_slices:
+                    self._slices.popitem(last=False)
+        programs = self.catalog.programs
+        return [(programs[pos], score) for pos, score in decision.answer(budget)[:n]]
+
+    def _build(self, scope, net_worth: float, family_size: int, program_type: Optional[str]) -> DecisionSlice:
+        members, values, order = scope
+        base = {}
+        ranked = []
+        for pos in members:
+            score = ((FAMILY if not self.family[pos] or family_size <= self.family[pos] else 0)
+                     + (NET_WORTH if net_worth >= self.net_worth[pos] else 0)
+                     + (PROGRAM_TYPE if program_type and self.program_type[pos] == program_type else 0))
+            if self.investment[pos] is None:
+                score += INVESTMENT
+            else:
+                base[pos] = score
+            if score:
+                ranked.append((-score, pos))
+        ranked.sort()
+        current = ranked[:MAX_RESULTS]
+        in_current = {pos for _, pos in current}
+
+        def snapshot():
+            return tuple((pos, -key) for key, pos in current)
+
+        breaks, answers = [], [snapshot()]
+        i = 0
+        while i < len(values):
+            value, changed = values[i], False
+            # Every program with this minimum unlocks at once
+            while i < len(values) and values[i] == value:
+                pos = order[i]
+                i += 1
+                entry = (-(base[pos] + INVESTMENT), pos)
+                if pos in in_current:
+                    current[:] = sorted(entry if p == pos else (k, p) for k, p in current)
+                    changed = True
+                elif len(current) < MAX_RESULTS or entry < current[-1]:
+                    insort(current, entry)
+                    in_current.add(pos)
+                    if len(current) > MAX_RESULTS:
+                        in_current.discard(current.pop()[1])
+                    changed = True
+            if changed:
+                breaks.append(value)
+                answers.append(snapshot())
+        return DecisionSlice(breaks, answers)
+
+
+def decision_index_for(catalog: Catalog, max_slices: int = DEFAULT_SLICES) -> DecisionIndex:
+    index = catalog.indexes.get('decision')
+    if index is None:
+        index = catalog.indexes['decision'] = DecisionIndex(catalog, max_slices)
+    return index
+
+
+def init_app(app):
+    max_slices = app.config.get('RESIDENCY_DECISION_SLICES', DEFAULT_SLICES)
+    if not max_slices:
+        return
+    app.extensions['residency_catalog'].on_build(lambda catalog: decision_index_for(catalog, max_slices))
@@ -2,10 +2,13 @@
 Eligibility checker service for residency programs
 Validates applicant criteria against program requirements
 """
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime
 import uuid
 from app.residencies.models import ResidencyProgram
+from app.residencies.rates import RateTable, current_rates
+from app.residencies.eligibility_cache import get_eligibility_cache
+from app.residencies.catalog import get_catalog
 from app.residencies.schemas import (
     EligibilityCheckRequest, 
     EligibilityCheckResponse, 
@@ -21,17 +24,10 @@ class EligibilityChecker:
     Matches criteria: investment_budget, net_worth, family_size
     """
     
-    def __init__(self):
-        self.currency_rates = {
-            'USD': 1.0,
-            'EUR': 0.92,
-            'GBP': 0.79,
-            'CAD': 1.36,
-            'AUD': 1.52,
-            'SGD': 1.34,
-            'AED': 3.67,
-            'CHF': 0.88,
-        }
+    @property
+    def currency_rates(self) -> Dict[str, float]:
+        """Units of each currency per USD, from the current rate table"""
+        return current_rates().per_base
     
     def check_eligibility(self, request: EligibilityCheckRequest) -> EligibilityCheckResponse:
         """
@@ -39,7 +35,65 @@ class EligibilityChecker:
         Returns top 5 matching programs
         """
         request_id = f"req_{uuid.uuid4().hex[:8]}"
+        # One rate snapshot for the whole check, reported back as rate_version
+        rates = current_rates()
         
+        # Near-identical profiles (same threshold buckets) share one scored result
+        cache = get_eligibility_cache()
+        key = cache.key(request, rates) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+        if cached is None:
+            cached = self._top_matches(request, rates)
+            if key is not None:
+                cache.put(key, cached)
+        matching_programs, overall_score = cached
+        
+        # Build message
+        if not matching_programs:
+            message = "No matching programs found based on your criteria. Consider adjusting your budget or preferences."
+        elif len(matching_programs) == 1:
+            message = f"Found 1 matching program based on your investment budget of ${request.investment_budget:,.0f}"
+        else:
+            message = f"Found {len(matching_programs)} matching programs based on your criteria"
+        
+        return EligibilityCheckResponse(
+            request_id=request_id,
+            status="success",
+            timestamp=datetime.utcnow().isoformat() + "Z",
+            matching_programs=matching_programs,
+            eligibility_score=round(overall_score, 2),
+            message=message,
+            rate_version=rates.version
+        )
+    
+    def _top_matches(
+        self,
+        request: EligibilityCheckRequest,
+        rates: RateTable
+    ) -> Tuple[List[ResidencyProgramSchema], float]:
+        """The top 5 programs and their mean score, from the decision index when it is exact"""
+        index = get_catalog().indexes.get('decision')
+        if index is not None:
+            top = index.top(
+                request.investment_budget,
+                request.net_worth,
+                request.family_size,
+                program_type=request.program_type_preference.value if request.program_type_preference else None,
+                country=request.country_preference,
+                rates_version=rates.version
+            )
+            if top is not None:
+                matching_programs = [ResidencyProgramSchema(**program) for program, _ in top]
+                overall_score = sum(score for _, score in top) / len(top) if top else 0
+                return matching_programs, overall_score
+        return self._scan_matches(request, rates)
+    
+    def _scan_matches(
+        self,
+        request: EligibilityCheckRequest,
+        rates: RateTable
+    ) -> Tuple[List[ResidencyProgramSchema], float]:
+        """Score every candidate program; returns the top 5 and their mean score"""
         # Get all programs or filter by country preference
         query = ResidencyProgram.query
         if request.country_preference:
@@ -51,7 +105,7 @@ class EligibilityChecker:
         matches: List[Tuple[ResidencyProgram, float, EligibilityMatchDetail]] = []
         
         for program in programs:
-            score, detail = self._calculate_match_score(program, request)
+            score, detail = self._calculate_match_score(program, request, rates)
             if score > 0:  # Only include programs with at least some match
                 matches.append((program, score, detail))
         
@@ -68,27 +122,13 @@ class EligibilityChecker:
         # Calculate overall eligibility score
         overall_score = sum(score for _, score, _ in top_matches) / len(top_matches) if top_matches else 0
         
-        # Build message
-        if not top_matches:
-            message = "No matching programs found based on your criteria. Consider adjusting your budget or preferences."
-        elif len(top_matches) == 1:
-            message = f"Found 1 matching program based on your investment budget of ${request.investment_budget:,.0f}"
-        else:
-            message = f"Found {len(top_matches)} matching programs based on your criteria"
-        
-        return EligibilityCheckResponse(
-            request_id=request_id,
-            status="success",
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            matching_programs=matching_programs,
-            eligibility_score=round(overall_score, 2),
-            message=message
-        )
+        return matching_programs, overall_score
     
     def _calculate_match_score(
         self, 
         program: ResidencyProgram, 
-        request: EligibilityCheckRequest
+        request: EligibilityCheckRequest,
+        rates: Optional[RateTable] = None
     ) -> Tuple[float, EligibilityMatchDetail]:
         """
         Calculate match score for a program
@@ -99,7 +139,7 @@ class EligibilityChecker:
         potential_issues = []
         
         # 1. Investment Amount Check (40% of score)
-        investment_fit = self._check_investment_fit(program, request, matching_factors, potential_issues)
+        investment_fit = self._check_investment_fit(program, request, matching_factors, potential_issues, rates)
         if investment_fit:
             score += 40
         
@@ -138,7 +178,8 @@ class EligibilityChecker:
         program: ResidencyProgram, 
         request: EligibilityCheckRequest,
         matching_factors: List[str],
-        potential_issues: List[str]
+        potential_issues: List[str],
+        rates: Optional[RateTable] = None
     ) -> bool:
         """Check if investment budget meets program requirements"""
         if not program.investment_min_amount:
@@ -148,7 +189,8 @@ class EligibilityChecker:
         converted_budget = self._convert_currency(
             request.investment_budget,
             'USD',
-            program.investment_currency
+            program.investment_currency,
+            rates
         )
         
         if converted_budget >= program.investment_min_amount:
@@ -210,29 +252,18 @@ class EligibilityChecker:
             )
             return False
     
-    def _convert_currency(self, amount: float, from_currency: str, to_currency: str) -> float:
+    def _convert_currency(self, amount: float, from_currency: str, to_currency: str,
+                          rates: Optional[RateTable] = None) -> float:
         """Convert amount between currencies"""
         if from_currency == to_currency:
             return amount
-        
-        from_rate = self.currency_rates.get(from_currency, 1.0)
-        to_rate = self.currency_rates.get(to_currency, 1.0)
-        
-        # Convert to USD first, then to target currency
-        in_usd = amount / from_rate
-        converted = in_usd * to_rate
-        
-        return round(converted, 2)
+        return round((rates or current_rates()).convert(amount, from_currency, to_currency), 2)
     
     def get_currency_rate(self, from_currency: str, to_currency: str) -> float:
         """Get exchange rate between two currencies"""
         if from_currency == to_currency:
             return 1.0
-        
-        from_rate = self.currency_rates.get(from_currency, 1.0)
-        to_rate = self.currency_rates.get(to_currency, 1.0)
-        
-        return round(to_rate / from_rate, 4)
+        return round(current_rates().rate(from_currency, to_currency), 4)
 
 
 # Singleton instance
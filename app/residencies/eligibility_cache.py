@@ -0,0 +1,101 @@
+"""
+Memoised eligibility results.
+
+The eligibility calculator sends a check every time a slider moves, and
+most of those checks differ only by a few dollars. The result depends only on:
+
+* which investment and net-worth thresholds the profile clears. This is
+  its bucket in the catalog's sorted thresholds (app/residencies/thresholds.py);
+* family size and the country / program type preferences;
+* the catalog and exchange-rate versions.
+
+That tuple is the cache key, so every profile in a bucket gets exactly the
+answer a full check would give. Only the top matches and the overall score
+are cached. The request id, timestamp and message are made per request.
+Profiles that cannot be bucketed exactly (a budget right on a threshold, a
+catalog built with other rates) skip the cache and are counted as bypassed.
+
+Program edits made in this worker take effect at their commit. Edits made
+by other workers take effect when the catalog next notices them (within
+RESIDENCY_CATALOG_TTL).
+
+One LRU per worker, sized by RESIDENCY_ELIGIBILITY_CACHE_SIZE (0 disables it).
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from flask import current_app
+
+from app.residencies.catalog import get_catalog
+from app.residencies.rates import RateTable
+from app.residencies.schemas import EligibilityCheckRequest
+from app.residencies.thresholds import thresholds_for
+
+DEFAULT_SIZE = 2048
+
+
+class EligibilityCache:
+    def __init__(self, max_entries: int = DEFAULT_SIZE):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'bypassed': 0, 'evictions': 0}
+        self._entries: 'OrderedDict[Hashable, object]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, request: EligibilityCheckRequest, rates: RateTable) -> Optional[tuple]:
+        catalog = get_catalog()
+        thresholds = thresholds_for(catalog)
+        budget = thresholds.investment_bucket(request.investment_budget)
+        if budget is None or thresholds.rates_version != rates.version:
+            with self._lock:
+                self.stats['bypassed'] += 1
+            return None
+        program_type = request.program_type_preference.value if request.program_type_preference else None
+        return (catalog.version, rates.version, budget, thresholds.net_worth_bucket(request.net_worth),
+                request.family_size, request.country_preference, program_type)
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._entries.clear()
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats, size=len(self._entries), max_entries=self.max_entries)
+        lookups = stats['hits'] + stats['misses'] + stats['bypassed']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def get_eligibility_cache() -> Optional[EligibilityCache]:
+    return current_app.extensions.get('residency_eligibility_cache')
+
+
+def init_app(app):
+    from app import prefork
+    size = app.config.get('RESIDENCY_ELIGIBILITY_CACHE_SIZE', DEFAULT_SIZE)
+    if not size:
+        return
+    cache = app.extensions['residency_eligibility_cache'] = EligibilityCache(size)
+    prefork.on_after_fork(app, lambda app: cache.reset_after_fork())
@@ -23,6 +23,11 @@ class ResidencyProgram(db.Model):
     investment_currency = db.Column(db.String(10), default='USD', nullable=False)
     investment_min_amount = db.Column(db.Float, nullable=True)  # Min in base currency
     investment_max_amount = db.Column(db.Float, nullable=True)  # Max in base currency
+    # USD equivalents of the two amounts above, kept up to date by app/residencies/usd_amounts.py
+    # so range filters and sorting compare like with like and can use the indexes
+    investment_min_usd = db.Column(db.Float, nullable=True, index=True)
+    investment_max_usd = db.Column(db.Float, nullable=True, index=True)
+    usd_rate_version = db.Column(db.String(12), nullable=True)  # Rate table the USD columns came from
     
     # Processing Info
     processing_time = db.Column(db.String(100), nullable=True)
@@ -60,6 +65,9 @@ class ResidencyProgram(db.Model):
             'investment_currency': self.investment_currency,
             'investment_min_amount': self.investment_min_amount,
             'investment_max_amount': self.investment_max_amount,
+            'investment_min_usd': self.investment_min_usd,
+            'investment_max_usd': self.investment_max_usd,
+            'usd_rate_version': self.usd_rate_version,
             'processing_time': self.processing_time,
             'processing_time_months': self.processing_time_months,
             'documents_required': self.documents_required,
@@ -0,0 +1,287 @@
+"""
+Exchange rates for residency calculations.
+
+Rates come from a pluggable source, chosen with RESIDENCY_RATES_SOURCE:
+
+* ``static`` – the built-in table below (no I/O)
+* ``file``   – a JSON file at RESIDENCY_RATES_FILE
+* ``http``   – a JSON endpoint at RESIDENCY_RATES_URL
+
+File and HTTP sources use the same shape. ``rates`` holds units of each
+currency per 1 unit of ``base``::
+
+    {"base": "USD", "rates": {"EUR": 0.92, "GBP": 0.79, ...}}
+
+Every load is turned into an immutable RateTable. The table holds the full
+cross-rate matrix (``matrix[i][j]`` converts currency i into currency j) and
+a version, which is a hash of the rates themselves. A conversion is then a single
+matrix lookup. Eligibility responses report the version they were computed
+with.
+
+The table is reloaded every RESIDENCY_RATES_REFRESH seconds. The reload
+runs on a background thread the first time a stale table is asked for,
+and requests keep using the current table meanwhile. If a reload fails,
+the last good table stays in service. If a change listener fails (say the
+USD re-normalisation hits a locked database), it is retried against the
+current table on a later ``current()``, at most every
+LISTENER_RETRY_SECONDS, until it succeeds.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app, has_app_context
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional (requirements-light.txt)
+    np = None
+
+BASE_CURRENCY = 'USD'
+DEFAULT_RATES = {
+    'USD': 1.0,
+    'EUR': 0.92,
+    'GBP': 0.79,
+    'CAD': 1.36,
+    'AUD': 1.52,
+    'SGD': 1.34,
+    'AED': 3.67,
+    'CHF': 0.88,
+}
+DEFAULT_REFRESH = 3600
+LISTENER_RETRY_SECONDS = 5
+
+
+class RateTable:
+    """One immutable snapshot of exchange rates with its cross-rate matrix."""
+
+    def __init__(self, per_base: Dict[str, float], source: str = 'static', loaded_at: Optional[float] = None):
+        rates = {code.upper(): float(rate) for code, rate in per_base.items() if rate and float(rate) > 0}
+        rates.setdefault(BASE_CURRENCY, 1.0)
+        self.currencies: Sequence[str] = tuple(sorted(rates))
+        self.index = {code: i for i, code in enumerate(self.currencies)}
+        self.per_base = rates
+        self.source = source
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+        # Same rates, same version: caches keyed on it survive a reload that changed nothing
+        self.version = hashlib.sha1(json.dumps(sorted(rates.items())).encode('utf-8')).hexdigest()[:12]
+
+        column = [rates[code] for code in self.currencies]
+        if np is not None:
+            vector = np.array(column, dtype=np.float64)
+            self.matrix = vector[np.newaxis, :] / vector[:, np.newaxis]
+        else:
+            self.matrix = [[to_rate / from_rate for to_rate in column] for from_rate in column]
+
+    def _position(self, code: str) -> int:
+        # Unknown currencies are treated as the base currency, as the original hard-coded table did
+        return self.index.get((code or BASE_CURRENCY).upper(), self.index[BASE_CURRENCY])
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        return float(self.matrix[self._position(from_currency)][self._position(to_currency)])
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        if from_currency == to_currency:
+            return amount
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, amounts: Sequence[float], from_currencies: Sequence[str],
+                     to_currencies: Sequence[str]) -> Tuple[List[float], List[float]]:
+        """Convert amounts[k] from from_currencies[k] to to_currencies[k]; returns (converted, rates).
+
+        With numpy this is one gather from the matrix and one multiply for the
+        whole batch; without it, the same lookups in a loop.
+        """
+        rows = [self._position(code) for code in from_currencies]
+        cols = [self._position(code) for code in to_currencies]
+        if np is not None:
+            rates = self.matrix[np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)]
+            converted = np.asarray(amounts, dtype=np.float64) * rates
+            return converted.tolist(), rates.tolist()
+        rates = [self.matrix[i][j] for i, j in zip(rows, cols)]
+        return [amount * rate for amount, rate in zip(amounts, rates)], rates
+
+    def row(self, base: str) -> Dict[str, float]:
+        """Rates from `base` to every other currency."""
+        i = self._position(base)
+        return {code: float(self.matrix[i][j]) for j, code in enumerate(self.currencies) if code != base}
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def _per_base(data: Dict) -> Dict[str, float]:
+    """Normalise a {"base", "rates"} document to rates per BASE_CURRENCY."""
+    rates = {code.upper(): float(rate) for code, rate in (data.get('rates') or data).items()
+             if isinstance(rate, (int, float))}
+    base = (data.get('base') or BASE_CURRENCY).upper()
+    rates.setdefault(base, 1.0)
+    if base != BASE_CURRENCY:
+        if BASE_CURRENCY not in rates:
+            raise ValueError(f'rates based on {base} do not include {BASE_CURRENCY}')
+        usd = rates[BASE_CURRENCY]
+        rates = {code: rate / usd for code, rate in rates.items()}
+    return rates
+
+
+class StaticRateSource:
+    name = 'static'
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.rates = dict(rates or DEFAULT_RATES)
+
+    def fetch(self) -> Dict[str, float]:
+        return dict(self.rates)
+
+
+class FileRateSource:
+    name = 'file'
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> Dict[str, float]:
+        with open(self.path, encoding='utf-8') as f:
+            return _per_base(json.load(f))
+
+
+class HttpRateSource:
+    name = 'http'
+
+    def __init__(self, url: str, client=None):
+        from app.jobs.client import HttpClient
+        self.url = url
+        self.client = client or HttpClient(user_agent='Nexora/1.0 (+exchange-rates)')
+
+    def fetch(self) -> Dict[str, float]:
+        return _per_base(self.client.get_json(self.url))
+
+
+def create_source(config):
+    kind = (config.get('RESIDENCY_RATES_SOURCE') or 'static').lower()
+    if kind == 'file':
+        return FileRateSource(config['RESIDENCY_RATES_FILE'])
+    if kind == 'http':
+        return HttpRateSource(config['RESIDENCY_RATES_URL'])
+    if kind != 'static':
+        raise ValueError(f'Unknown RESIDENCY_RATES_SOURCE {kind!r}')
+    return StaticRateSource()
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+class RateService:
+    def __init__(self, source, refresh_seconds: float = DEFAULT_REFRESH, logger=None):
+        self.source = source
+        self.refresh_seconds = refresh_seconds
+        self.logger = logger
+        self._table: Optional[RateTable] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._listeners = []
+        self._pending = []  # listeners whose last call failed
+        self._pending_at = 0.0
+
+    def on_change(self, fn):
+        """Call fn(table) whenever a new rate version is loaded."""
+        self._listeners.append(fn)
+
+    def load(self) -> RateTable:
+        """Fetch from the source now; keeps the old table (and re-raises) if that fails."""
+        self._checked_at = time.time()
+        table = RateTable(self.source.fetch(), source=self.source.name)
+        with self._lock:
+            previous = self._table
+            if previous is not None and previous.version == table.version:
+                return previous
+            self._table = table
+        self._notify(table, self._listeners)
+        return table
+
+    def _notify(self, table: RateTable, listeners):
+        failed = []
+        for fn in listeners:
+            try:
+                fn(table)
+            except Exception as e:
+                self._log('Rate change listener %s failed, will retry: %s', getattr(fn, '__name__', fn), e)
+                failed.append(fn)
+        self._pending_at = time.time()
+        self._pending = failed
+
+    def _retry_pending(self, table: RateTable):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self._notify(table, pending)
+
+    def current(self) -> RateTable:
+        table = self._table
+        if table is None:
+            try:
+                return self.load()
+            except Exception as e:
+                self._log('Could not load exchange rates, using built-in table: %s', e)
+                with self._lock:
+                    self._table = self._table or RateTable(DEFAULT_RATES, source='fallback')
+                return self._table
+        if self.refresh_seconds and time.time() - self._checked_at > self.refresh_seconds:
+            self._refresh_in_background()
+        if self._pending and time.time() - self._pending_at > LISTENER_RETRY_SECONDS:
+            self._retry_pending(table)
+        return table
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name='rates-refresh', daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self.load()
+        except Exception as e:
+            # load() stamped the attempt, so the next try is a full interval away
+            self._log('Exchange rate refresh failed, keeping version %s: %s', self._table.version, e)
+        finally:
+            self._refreshing = False
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _log(self, message, *args):
+        if self.logger is not None:
+            self.logger.warning(message, *args)
+
+
+_default_table: Optional[RateTable] = None
+
+
+def current_rates() -> RateTable:
+    """The app's current rate table (the built-in one outside an app)."""
+    global _default_table
+    if has_app_context():
+        service = current_app.extensions.get('residency_rates')
+        if service is not None:
+            return service.current()
+    if _default_table is None:
+        _default_table = RateTable(DEFAULT_RATES)
+    return _default_table
+
+
+def init_app(app):
+    from app import prefork
+    service = app.extensions['residency_rates'] = RateService(
+        create_source(app.config),
+        refresh_seconds=app.config.get('RESIDENCY_RATES_REFRESH', DEFAULT_REFRESH),
+        logger=app.logger,
+    )
+    prefork.on_after_fork(app, lambda app: service.reset_after_fork())
@@ -7,8 +7,14 @@ from functools import wraps
 import json
 from app.residencies import residencies
 from app.residencies.models import ResidencyProgram, ResidencyApplication
-from app.residencies.schemas import EligibilityCheckRequest, CurrencyConversionRequest
+from app.residencies.schemas import (EligibilityCheckRequest, CurrencyConversionRequest, BulkCurrencyConversionRequest,
+                                     WhatIfRequest)
 from app.residencies.eligibility import eligibility_checker
+from app.residencies.rates import current_rates
+from app.residencies.catalog import get_catalog
+from app.residencies.comparison import compare, DEFAULT_MAX_PROGRAMS
+from app.residencies.similarity import similar_programs
+from app.residencies.sensitivity import what_if
 from models import db
 from flask_login import current_user, login_required
 
@@ -65,18 +71,68 @@ def check_eligibility():
         return api_error("Internal server error", 500)
 
 
+@residencies.route('/api/eligibility/what-if', methods=['POST'])
+def eligibility_what_if():
+    """
+    Show which budget, net worth or family size would unlock more programs
+    
+    POST /residencies/api/eligibility/what-if
+    Content-Type: application/json
+    {
+        "investment_budget": 300000,
+        "net_worth": 800000,
+        "family_size": 4,
+        "country_preference": "Portugal",
+        "max_budget": 2000000
+    }
+    
+    Returns the investment, net worth and family curves: each step is a
+    value, the programs it unlocks and how many programs then pass.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return api_error("No JSON data provided", 400)
+        
+        what_if_request = WhatIfRequest(**data)
+        
+        return api_success(what_if(get_catalog(), what_if_request,
+                                   max_steps=what_if_request.max_steps,
+                                   max_budget=what_if_request.max_budget,
+                                   max_net_worth=what_if_request.max_net_worth))
+    
+    except ValueError as e:
+        return api_error(f"Validation error: {str(e)}", 400)
+    except Exception as e:
+        current_app.logger.error(f"What-if error: {str(e)}")
+        return api_error("Internal server error", 500)
+
+
 @residencies.route('/api/programs', methods=['GET'])
 def list_programs():
     """
     List all available residency programs with filters
     
     GET /residencies/api/programs?country=USA&program_type=investor&min_investment=50000
+    
+    Investment bounds are in USD unless ``currency`` says otherwise, and are
+    compared with each program's USD-normalised amounts. ``sort=investment``
+    (or ``-investment``) orders by the USD minimum investment.
     """
     try:
         country = request.args.get('country')
         program_type = request.args.get('program_type')
         min_investment = request.args.get('min_investment', type=float)
         max_investment = request.args.get('max_investment', type=float)
+        currency = (request.args.get('currency') or 'USD').upper()
+        sort = request.args.get('sort')
+        
+        if currency != 'USD':
+            table = current_rates()
+            if min_investment:
+                min_investment = table.convert(min_investment, currency, 'USD')
+            if max_investment:
+                max_investment = table.convert(max_investment, currency, 'USD')
         
         query = ResidencyProgram.query
         
@@ -85,9 +141,12 @@ def list_programs():
         if program_type:
             query = query.filter_by(program_type=program_type)
         if min_investment:
-            query = query.filter(ResidencyProgram.investment_min_amount >= min_investment)
+            query = query.filter(ResidencyProgram.investment_min_usd >= min_investment)
         if max_investment:
-            query = query.filter(ResidencyProgram.investment_max_amount <= max_investment)
+            query = query.filter(ResidencyProgram.investment_max_usd <= max_investment)
+        if sort in ('investment', '-investment'):
+            column = ResidencyProgram.investment_min_usd
+            query = query.order_by(column.desc() if sort.startswith('-') else column.asc(), ResidencyProgram.id)
         
         programs = query.all()
         return jsonify({
@@ -119,6 +178,22 @@ def get_program(program_id):
         return api_error("Internal server error", 500)
 
 
+@residencies.route('/api/programs/<int:program_id>/similar', methods=['GET'])
+def get_similar_programs(program_id):
+    """Programs most similar to this one (features, benefits and documents)"""
+    try:
+        catalog = get_catalog()
+        if catalog.get(program_id) is None:
+            return api_error("Program not found", 404)
+        limit = min(max(request.args.get('limit', 3, type=int), 1), 20)
+        
+        return api_success(similar_programs(catalog, program_id, limit=limit))
+    
+    except Exception as e:
+        current_app.logger.error(f"Similar programs error: {str(e)}")
+        return api_error("Internal server error", 500)
+
+
 @residencies.route('/api/programs/by-country/<country>', methods=['GET'])
 def get_programs_by_country(country):
     """Get all programs for a specific country"""
@@ -137,6 +212,46 @@ def get_programs_by_country(country):
         return api_error("Internal server error", 500)
 
 
+def _compare_ids():
+    """Program ids from ?programs=1&programs=2 or ?programs=1,2"""
+    ids = []
+    for value in request.args.getlist('programs'):
+        for part in value.split(','):
+            part = part.strip()
+            if part:
+                ids.append(int(part))
+    return ids
+
+
+@residencies.route('/api/compare', methods=['GET'])
+def api_compare_programs():
+    """
+    Compare programs on precomputed feature vectors
+    
+    GET /residencies/api/compare?programs=1,2,3
+    
+    Returns aligned rows of feature values and 0..1 scores (1 = best in the
+    catalog) plus the best program(s) per feature. Unknown ids are listed
+    under ``missing``.
+    """
+    try:
+        try:
+            program_ids = _compare_ids()
+        except ValueError:
+            return api_error("programs must be integer ids", 400)
+        if not program_ids:
+            return api_error("No programs given", 400)
+        limit = current_app.config.get('RESIDENCY_COMPARE_MAX', DEFAULT_MAX_PROGRAMS)
+        if len(set(program_ids)) > limit:
+            return api_error(f"At most {limit} programs can be compared", 400)
+        
+        return api_success(compare(get_catalog(), program_ids))
+    
+    except Exception as e:
+        current_app.logger.error(f"Compare API error: {str(e)}")
+        return api_error("Internal server error", 500)
+
+
 @residencies.route('/api/currencies/convert', methods=['POST'])
 def convert_currency():
     """
@@ -186,21 +301,62 @@ def convert_currency():
         return api_error("Internal server error", 500)
 
 
+@residencies.route('/api/currencies/convert-bulk', methods=['POST'])
+def convert_currency_bulk():
+    """
+    Convert many amounts in one call
+    
+    POST /residencies/api/currencies/convert-bulk
+    {
+        "amounts": [500000, 250000, 2000000],
+        "from_currency": ["USD", "EUR", "AED"],
+        "to_currency": "GBP"
+    }
+    
+    Either currency field may be a single code (applied to every amount) or a
+    list with one code per amount. Results keep the order of ``amounts``.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return api_error("No JSON data provided", 400)
+        
+        bulk_request = BulkCurrencyConversionRequest(**data)
+        from_codes, to_codes = bulk_request.pairs()
+        table = current_rates()
+        converted, rates = table.convert_many(bulk_request.amounts, from_codes, to_codes)
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'converted_amounts': [round(amount, 2) for amount in converted],
+                'exchange_rates': [round(rate, 6) for rate in rates],
+                'from_currencies': from_codes,
+                'to_currencies': to_codes,
+                'rate_version': table.version,
+            }
+        }), 200
+    
+    except ValueError as e:
+        return api_error(f"Validation error: {str(e)}", 400)
+    except Exception as e:
+        current_app.logger.error(f"Bulk currency conversion error: {str(e)}")
+        return api_error("Internal server error", 500)
+
+
 @residencies.route('/api/currencies/rates', methods=['GET'])
 def get_currency_rates():
     """Get all available currency conversion rates"""
     try:
         base_currency = request.args.get('base', 'USD')
-        
-        rates = {}
-        for currency in eligibility_checker.currency_rates.keys():
-            if currency != base_currency:
-                rates[currency] = eligibility_checker.get_currency_rate(base_currency, currency)
+        table = current_rates()
+        rates = {code: round(rate, 4) for code, rate in table.row(base_currency).items()}
         
         return jsonify({
             'status': 'success',
             'base': base_currency,
             'rates': rates,
+            'version': table.version,
             'timestamp': __import__('datetime').datetime.utcnow().isoformat() + 'Z'
         }), 200
     
@@ -272,11 +428,8 @@ def program_detail(program_id):
         if not program:
             return render_template('error.html', message="Program not found"), 404
         
-        # Get similar programs from same country
-        similar = ResidencyProgram.query.filter(
-            ResidencyProgram.country == program.country,
-            ResidencyProgram.id != program.id
-        ).limit(3).all()
+        # Nearest neighbours, precomputed when the catalog was built
+        similar = similar_programs(get_catalog(), program.id, limit=3)
         
         return render_template('residencies/program_detail.html',
                              program=program,
@@ -300,13 +453,14 @@ def compare_programs():
         program_ids = request.args.getlist('programs', type=int)
         
         if not program_ids:
-            return render_template('residencies/compare.html', programs=[])
+            return render_template('residencies/compare.html', programs=[], best={})
         
         programs = ResidencyProgram.query.filter(
             ResidencyProgram.id.in_(program_ids)
         ).all()
+        comparison = compare(get_catalog(), [p.id for p in programs])
         
-        return render_template('residencies/compare.html', programs=programs)
+        return render_template('residencies/compare.html', programs=programs, best=comparison['best'])
     
     except Exception as e:
         current_app.logger.error(f"Compare programs error: {str(e)}")
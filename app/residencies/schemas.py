@@ -1,8 +1,8 @@
 """
 Pydantic schemas for residency programs and eligibility checking
 """
-from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Union
+from pydantic import BaseModel, Field, field_validator, model_validator, validator
 from enum import Enum
 
 
@@ -33,6 +33,13 @@ class EligibilityCheckRequest(BaseModel):
         return v
 
 
+class WhatIfRequest(EligibilityCheckRequest):
+    """Input for what-if analysis: a profile plus optional caps on the curves"""
+    max_budget: Optional[float] = Field(default=None, gt=0, description="Stop the budget curve here (USD)")
+    max_net_worth: Optional[float] = Field(default=None, gt=0, description="Stop the net worth curve here (USD)")
+    max_steps: int = Field(default=100, ge=1, le=1000, description="Steps returned per curve")
+
+
 class ResidencyProgramSchema(BaseModel):
     """Pydantic schema for ResidencyProgram model"""
     id: int
@@ -43,6 +50,8 @@ class ResidencyProgramSchema(BaseModel):
     investment_currency: str = "USD"
     investment_min_amount: Optional[float] = None
     investment_max_amount: Optional[float] = None
+    investment_min_usd: Optional[float] = None
+    investment_max_usd: Optional[float] = None
     processing_time: Optional[str] = None
     processing_time_months: Optional[int] = None
     documents_required: Optional[List[str]] = None
@@ -67,6 +76,7 @@ class EligibilityCheckResponse(BaseModel):
     matching_programs: List[ResidencyProgramSchema] = Field(..., max_items=10)
     eligibility_score: float = Field(..., ge=0, le=100, description="Overall match score 0-100")
     message: str
+    rate_version: Optional[str] = Field(default=None, description="Exchange rate table used for the check")
     
     class Config:
         json_schema_extra = {
@@ -76,7 +86,8 @@ class EligibilityCheckResponse(BaseModel):
                 "timestamp": "2024-02-03T10:30:00Z",
                 "matching_programs": [],
                 "eligibility_score": 85.5,
-                "message": "Found 5 matching programs based on your criteria"
+                "message": "Found 5 matching programs based on your criteria",
+                "rate_version": "3f9a1c0b2d4e"
             }
         }
 
@@ -109,3 +120,37 @@ class CurrencyConversionResponse(BaseModel):
     converted_amount: float
     exchange_rate: float
     timestamp: str
+
+
+class BulkCurrencyConversionRequest(BaseModel):
+    """Input for converting many amounts at once
+    
+    ``from_currency`` / ``to_currency`` may be one code for every amount or a
+    list with one code per amount.
+    """
+    amounts: List[float] = Field(..., min_length=1, max_length=10000)
+    from_currency: Union[str, List[str]] = Field(default="USD")
+    to_currency: Union[str, List[str]] = Field(default="USD")
+    
+    @field_validator('amounts')
+    @classmethod
+    def validate_amounts(cls, v):
+        if any(amount < 0 for amount in v):
+            raise ValueError('Amounts must not be negative')
+        return v
+    
+    @model_validator(mode='after')
+    def validate_lengths(self):
+        for name in ('from_currency', 'to_currency'):
+            codes = getattr(self, name)
+            if isinstance(codes, list) and len(codes) != len(self.amounts):
+                raise ValueError(f'{name} must have one code per amount ({len(self.amounts)})')
+        return self
+    
+    def pairs(self):
+        """(from_codes, to_codes), one per amount"""
+        def expand(codes):
+            if isinstance(codes, list):
+                return [code.upper() for code in codes]
+            return [codes.upper()] * len(self.amounts)
+        return expand(self.from_currency), expand(self.to_currency)
@@ -0,0 +1,70 @@
+"""
+What-if analysis for one eligibility profile.
+
+An eligibility check asks three threshold questions of each program: is the
+budget at least its minimum investment, is the net worth at least its
+requirement, and is the family no larger than its limit. For one profile
+this module answers "what would change the answer?" for all three at once:
+
+* ``investment_curve`` – each higher budget (USD) that unlocks more
+  programs' investment check, with the programs it unlocks;
+* ``net_worth_curve`` – the same for net worth;
+* ``family_curve`` – each smaller family size that brings more programs
+  within their limit.
+
+Each step also gives the running count of programs passing that check. The
+curves are read from the catalog's sorted thresholds
+(app/residencies/thresholds.py): one bisect, then a walk over the steps
+returned. No program is rescored. Investment thresholds are the programs'
+USD amounts, so the budget at a step can be off from the exact check by
+cents of currency rounding.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.residencies.catalog import Catalog
+from app.residencies.schemas import EligibilityCheckRequest
+from app.residencies.thresholds import thresholds_for
+
+DEFAULT_MAX_STEPS = 100
+
+
+def _curve(catalog: Catalog, steps: Iterator[Tuple[float, List[int]]], key: str, count, cap: Optional[float],
+           max_steps: int) -> Tuple[List[Dict], bool]:
+    curve = []
+    for value, ids in steps:
+        if cap is not None and value > cap:
+            break
+        if len(curve) >= max_steps:
+            return curve, True
+        curve.append({
+            key: value,
+            'unlocks': [{f: catalog.get(i).get(f) for f in ('id', 'program_name', 'country')} for i in ids],
+            'fit_count': count(value),
+        })
+    return curve, False
+
+
+def what_if(catalog: Catalog, request: EligibilityCheckRequest, max_steps: int = DEFAULT_MAX_STEPS,
+            max_budget: Optional[float] = None, max_net_worth: Optional[float] = None) -> Dict:
+    steps = thresholds_for(catalog).steps_for(request.country_preference)
+    result = {'catalog_version': catalog.version, 'programs_in_scope': 0, 'current': {},
+              'investment_curve': [], 'net_worth_curve': [], 'family_curve': [], 'truncated': False}
+    if steps is None:
+        return result
+
+    investment, net_worth, family = steps['investment'], steps['net_worth'], steps['family']
+    result['programs_in_scope'] = len(net_worth)
+    result['current'] = {
+        'investment_fit_count': investment.at_most(request.investment_budget),
+        'net_worth_fit_count': net_worth.at_most(request.net_worth),
+        'family_fit_count': family.at_least(request.family_size),
+    }
+    curves = (
+        ('investment_curve', investment.above(request.investment_budget), 'budget_usd', investment.at_most, max_budget),
+        ('net_worth_curve', net_worth.above(request.net_worth), 'net_worth', net_worth.at_most, max_net_worth),
+        ('family_curve', family.below(request.family_size), 'family_size', family.at_least, None),
+    )
+    for name, walk, key, count, cap in curves:
+        result[name], truncated = _curve(catalog, walk, key, count, cap, max_steps)
+        result['truncated'] = result['truncated'] or truncated
+    return result
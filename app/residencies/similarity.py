@@ -0,0 +1,149 @@
+"""
+"Similar programs" recommendations.
+
+Built once per catalog snapshot (app/residencies/catalog.py) and stored on
+it. A program detail page then reads its neighbours from a dict and runs no
+query. Two programs are similar by a weighted sum of:
+
+* feature similarity – 1 minus the mean absolute difference of their
+  normalised feature scores (investment, processing time, family limit,
+  interview, documents), over the features both have;
+* text similarity – cosine of TF-IDF vectors of their benefits and
+  required documents;
+* a small bonus for the same country.
+
+The top RESIDENCY_SIMILAR_TOP_K neighbours of every program are kept. With
+numpy, the pairwise scores are computed a block of rows at a time, so memory
+stays bounded. Time still grows with the square of the catalog. Above
+RESIDENCY_SIMILAR_MAX_PROGRAMS programs no index is built, and a program's
+neighbours are the other programs of its country in catalog order (as
+before the index existed, without the query).
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+from app.residencies.catalog import Catalog
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional (requirements-light.txt)
+    np = None
+
+DEFAULT_TOP_K = 6
+DEFAULT_MAX_PROGRAMS = 5000
+FEATURE_WEIGHT = 0.5
+TEXT_WEIGHT = 0.4
+COUNTRY_WEIGHT = 0.1
+STOPWORDS = frozenset('and are for from has have into its not the this that with your you all any can may '
+                      'will who per than other their after years year'.split())
+_BLOCK_CELLS = 1 << 21  # pairwise cells computed per numpy block
+
+
+def terms(program: Dict) -> List[str]:
+    text = ' '.join([program.get('benefits') or '', ' '.join(map(str, program.get('documents_required') or ()))])
+    return [w for w in re.findall(r'[a-z0-9]+', text.lower()) if len(w) > 2 and w not in STOPWORDS]
+
+
+def tfidf(documents: Sequence[List[str]]) -> List[Dict[str, float]]:
+    """Unit-length TF-IDF vectors (sublinear tf, smoothed idf)."""
+    n = len(documents)
+    df = Counter(t for doc in documents for t in set(doc))
+    vectors = []
+    for doc in documents:
+        vec = {t: (1 + math.log(c)) * (math.log((1 + n) / (1 + df[t])) + 1) for t, c in Counter(doc).items()}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        vectors.append({t: w / norm for t, w in vec.items()} if norm else {})
+    return vectors
+
+
+def _feature_similarity(a: Sequence, b: Sequence) -> float:
+    diffs = [abs(x - y) for x, y in zip(a, b) if x is not None and y is not None]
+    return 1.0 - sum(diffs) / len(diffs) if diffs else 0.0
+
+
+class SimilarityIndex:
+    """Top-k neighbour ids per program id, for one catalog version."""
+
+    def __init__(self, catalog: Catalog, k: int = DEFAULT_TOP_K, max_programs: int = DEFAULT_MAX_PROGRAMS):
+        self.version = catalog.version
+        self.k = k
+        self.neighbours: Dict[int, Tuple[int, ...]] = {}
+        self.complete = len(catalog) <= max_programs
+        if len(catalog) < 2 or k <= 0 or not self.complete:
+            return
+        vectors = tfidf([terms(p) for p in catalog.programs])
+        if np is not None:
+            self._build_numpy(catalog, vectors)
+        else:
+            self._build_python(catalog, vectors)
+
+    def _build_numpy(self, catalog: Catalog, vectors: List[Dict[str, float]]):
+        n = len(catalog)
+        vocabulary = {t: i for i, t in enumerate(sorted({t for vec in vectors for t in vec}))}
+        text = np.zeros((n, max(len(vocabulary), 1)), dtype=np.float32)
+        for i, vec in enumerate(vectors):
+            for t, w in vec.items():
+                text[i, vocabulary[t]] = w
+        scores = catalog.scores
+        countries = np.array([p.get('country') or '' for p in catalog.programs], dtype=object)
+        ids = np.array([p['id'] for p in catalog.programs])
+        k = min(self.k, n - 1)
+
+        block = max(1, _BLOCK_CELLS // (n * scores.shape[1]))
+        for start in range(0, n, block):
+            rows = slice(start, min(start + block, n))
+            diff = np.abs(scores[rows, np.newaxis, :] - scores[np.newaxis, :, :])
+            shared = (~np.isnan(diff)).sum(axis=2)
+            feature = np.where(shared > 0, 1.0 - np.nansum(diff, axis=2) / np.maximum(shared, 1), 0.0)
+            combined = (FEATURE_WEIGHT * feature
+                        + TEXT_WEIGHT * (text[rows] @ text.T)
+                        + COUNTRY_WEIGHT * (countries[rows, np.newaxis] == countries[np.newaxis, :]))
+            for offset, i in enumerate(range(rows.start, rows.stop)):
+                row = combined[offset]
+                row[i] = -np.inf
+                top = np.argpartition(-row, k - 1)[:k]
+                top = top[np.lexsort((ids[top], -row[top]))]
+                self.neighbours[int(ids[i])] = tuple(int(j) for j in ids[top])
+
+    def _build_python(self, catalog: Catalog, vectors: List[Dict[str, float]]):
+        programs = catalog.programs
+        rows = [catalog.score_row(i) for i in range(len(programs))]
+        for i, program in enumerate(programs):
+            ranked = []
+            for j, other in enumerate(programs):
+                if i == j:
+                    continue
+                text = sum(w * vectors[j].get(t, 0.0) for t, w in vectors[i].items())
+                score = (FEATURE_WEIGHT * _feature_similarity(rows[i], rows[j]) + TEXT_WEIGHT * text
+                         + COUNTRY_WEIGHT * (program.get('country') == other.get('country')))
+                ranked.append((-score, other['id']))
+            ranked.sort()
+            self.neighbours[program['id']] = tuple(program_id for _, program_id in ranked[:self.k])
+
+    def similar(self, program_id: int, limit: int = None) -> Tuple[int, ...]:
+        ids = self.neighbours.get(program_id, ())
+        return ids if limit is None else ids[:limit]
+
+
+def similar_programs(catalog: Catalog, program_id: int, limit: int = 3) -> List[Dict]:
+    """Program dicts of `program_id`'s nearest neighbours, best first."""
+    index = catalog.indexes.get('similar')
+    if index is None:
+        index = catalog.indexes['similar'] = SimilarityIndex(catalog, max(limit, DEFAULT_TOP_K))
+    if not index.complete:
+        country = (catalog.get(program_id) or {}).get('country')
+        same = (p for p in catalog.programs if p['country'] == country and p['id'] != program_id)
+        return [p for _, p in zip(range(limit), same)]
+    return [catalog.get(i) for i in index.similar(program_id, limit)]
+
+
+def init_app(app):
+    k = app.config.get('RESIDENCY_SIMILAR_TOP_K', DEFAULT_TOP_K)
+    max_programs = app.config.get('RESIDENCY_SIMILAR_MAX_PROGRAMS', DEFAULT_MAX_PROGRAMS)
+
+    def build(catalog):
+        catalog.indexes['similar'] = SimilarityIndex(catalog, k, max_programs)
+
+    app.extensions['residency_catalog'].on_build(build)
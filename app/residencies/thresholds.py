@@ -0,0 +1,131 @@
+"""
+Sorted eligibility thresholds of the catalog.
+
+An eligibility check compares the budget with each program's minimum
+investment and the net worth with each program's net-worth requirement.
+Between two consecutive thresholds every one of those comparisons comes out
+the same. The position of a value in the sorted thresholds (a bisect) is
+therefore an exact bucket for it.
+
+Investment minimums are held in USD. The check itself converts the budget
+into the program's currency and rounds it to cents. A budget within
+GUARD_USD of a threshold could fall on either side, so it gets no bucket,
+and callers fall back to the full check. The same applies to every budget
+while some row's USD amount was converted with other rates than the
+catalog's (a re-normalisation that has not gone through yet).
+
+The same thresholds are also kept as Steps: program ids in threshold
+order, overall and per country. The what-if API uses them to list what
+unlocks beyond a given value. This costs one bisect plus the size of the
+answer, and rescores nothing.
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.residencies.catalog import Catalog
+
+GUARD_USD = 1.0
+
+
+class Steps:
+    """Program ids sorted by one threshold, plus how many programs have none."""
+
+    def __init__(self, pairs: List[Tuple[float, int]], unconstrained: int = 0):
+        pairs.sort()
+        self.values = [value for value, _ in pairs]
+        self.ids = [program_id for _, program_id in pairs]
+        self.unconstrained = unconstrained
+
+    def __len__(self):
+        return len(self.values) + self.unconstrained
+
+    def at_most(self, x: float) -> int:
+        """Programs whose threshold is <= x (or that have none)."""
+        return bisect_right(self.values, x) + self.unconstrained
+
+    def at_least(self, x: float) -> int:
+        """Programs whose threshold is >= x (or that have none)."""
+        return len(self.values) - bisect_left(self.values, x) + self.unconstrained
+
+    def above(self, x: float) -> Iterator[Tuple[float, List[int]]]:
+        """(threshold, program ids) for each distinct threshold > x, ascending."""
+        i = bisect_right(self.values, x)
+        while i < len(self.values):
+            j = bisect_right(self.values, self.values[i], lo=i)
+            yield self.values[i], self.ids[i:j]
+            i = j
+
+    def below(self, x: float) -> Iterator[Tuple[float, List[int]]]:
+        """(threshold, program ids) for each distinct threshold < x, descending."""
+        j = bisect_left(self.values, x)
+        while j > 0:
+            i = bisect_left(self.values, self.values[j - 1], hi=j)
+            yield self.values[i], self.ids[i:j]
+            j = i
+
+
+def _steps(programs) -> Dict[str, Steps]:
+    investment, net_worth, family = [], [], []
+    for p in programs:
+        if p.get('investment_min_amount') and p.get('investment_min_usd') is not None:
+            investment.append((p['investment_min_usd'], p['id']))
+        if p.get('net_worth_required'):
+            net_worth.append((p['net_worth_required'], p['id']))
+        if p.get('family_size_limit'):
+            family.append((p['family_size_limit'], p['id']))
+    return {
+        'investment': Steps(investment, sum(1 for p in programs if not p.get('investment_min_amount'))),
+        'net_worth': Steps(net_worth, len(programs) - len(net_worth)),
+        'family': Steps(family, len(programs) - len(family)),
+    }
+
+
+class Thresholds:
+    def __init__(self, catalog: Catalog):
+        self.version = catalog.version
+        self.rates_version = catalog.rates_version
+        required = [p for p in catalog.programs if p.get('investment_min_amount')]
+        # A row without its USD amount, or with one from other rates, cannot be placed;
+        # bucket nothing rather than guess
+        self.exact = all(p.get('investment_min_usd') is not None
+                         and p.get('usd_rate_version', self.rates_version) == self.rates_version
+                         for p in required)
+        self.investment = sorted({p['investment_min_usd'] for p in required if p.get('investment_min_usd') is not None})
+        self.net_worth = sorted({p['net_worth_required'] for p in catalog.programs if p.get('net_worth_required')})
+
+        self.steps = _steps(catalog.programs)
+        by_country = defaultdict(list)
+        for p in catalog.programs:
+            by_country[p.get('country')].append(p)
+        self.country_steps = {country: _steps(programs) for country, programs in by_country.items()}
+
+    def steps_for(self, country: Optional[str] = None) -> Optional[Dict[str, Steps]]:
+        """Steps over the whole catalog, or one country's programs (None if it has none)."""
+        if country is None:
+            return self.steps
+        return self.country_steps.get(country)
+
+    def investment_bucket(self, budget: float) -> Optional[int]:
+        if not self.exact:
+            return None
+        i = bisect_right(self.investment, budget)
+        for j in (i - 1, i):
+            if 0 <= j < len(self.investment) and abs(budget - self.investment[j]) <= GUARD_USD:
+                return None
+        return i
+
+    def net_worth_bucket(self, net_worth: float) -> int:
+        # The check is net_worth >= required, so ties sort into the passing bucket
+        return bisect_right(self.net_worth, net_worth)
+
+
+def thresholds_for(catalog: Catalog) -> Thresholds:
+    index = catalog.indexes.get('thresholds')
+    if index is None:
+        index = catalog.indexes['thresholds'] = Thresholds(catalog)
+    return index
+
+
+def init_app(app):
+    app.extensions['residency_catalog'].on_build(thresholds_for)
@@ -0,0 +1,79 @@
+"""
+USD-normalised investment amounts for residency programs.
+
+Programs store their investment in their own currency (EUR, GBP, AED...),
+which cannot be compared across programs. ``investment_min_usd`` and
+``investment_max_usd`` hold the same amounts in USD. They are indexed, so
+range filters and sorting in list_programs are a single index range scan.
+
+The USD columns are kept current two ways:
+
+* on insert and update, each row is converted with the current rate table
+  (covers both data loaders and any manual edit);
+* when the rate table changes, one set-based UPDATE rewrites every row
+  whose ``usd_rate_version`` is not the new version. A rate reload that
+  changed nothing therefore writes nothing. If that UPDATE fails, the rate
+  service retries it (app/residencies/rates.py). Until then the stale rows
+  keep their old ``usd_rate_version``, and the eligibility shortcuts fall
+  back to the full check (app/residencies/thresholds.py).
+"""
+from sqlalchemy import case, event, inspect, or_, update
+
+from app.residencies.models import ResidencyProgram
+from app.residencies.rates import RateTable, current_rates
+from models import db
+
+
+def apply_usd_amounts(program: ResidencyProgram, table: RateTable = None):
+    table = table or current_rates()
+    currency = program.investment_currency or 'USD'
+    program.investment_min_usd = (None if program.investment_min_amount is None
+                                  else round(table.convert(program.investment_min_amount, currency, 'USD'), 2))
+    program.investment_max_usd = (None if program.investment_max_amount is None
+                                  else round(table.convert(program.investment_max_amount, currency, 'USD'), 2))
+    program.usd_rate_version = table.version
+
+
+@event.listens_for(ResidencyProgram, 'before_insert')
+@event.listens_for(ResidencyProgram, 'before_update')
+def _set_usd_amounts(mapper, connection, program):
+    apply_usd_amounts(program)
+
+
+def usd_update_statement(table: RateTable):
+    """One UPDATE that converts every out-of-date row with `table`."""
+    to_usd = case(
+        {code: table.rate(code, 'USD') for code in table.currencies},
+        value=ResidencyProgram.investment_currency,
+        else_=1.0,
+    )
+    columns = ResidencyProgram.__table__.c
+    return (update(ResidencyProgram.__table__)
+            .where(or_(columns.usd_rate_version.is_(None), columns.usd_rate_version != table.version))
+            .values(investment_min_usd=db.func.round(columns.investment_min_amount * to_usd, 2),
+                    investment_max_usd=db.func.round(columns.investment_max_amount * to_usd, 2),
+                    usd_rate_version=table.version))
+
+
+def recompute_usd_amounts(table: RateTable) -> int:
+    """Bring the USD columns in line with `table`; returns the number of rows rewritten."""
+    # Own transaction, so it never commits or rolls back work in the caller's session
+    with db.engine.begin() as conn:
+        return conn.execute(usd_update_statement(table)).rowcount
+
+
+def init_app(app):
+    def on_rates_changed(table):
+        with app.app_context():
+            if not inspect(db.engine).has_table(ResidencyProgram.__tablename__):
+                # Fresh database: rows get their USD amounts when inserted
+                return
+            changed = recompute_usd_amounts(table)
+        if changed:
+            app.logger.info('Re-normalised %d residency programs to USD with rates %s', changed, table.version)
+            # On a retry the catalog was already rebuilt from the stale rows
+            catalog = app.extensions.get('residency_catalog')
+            if catalog is not None:
+                catalog.invalidate()
+
+    app.extensions['residency_rates'].on_change(on_rates_changed)
@@ -1,17 +1,847 @@
 import os
-from flask import Blueprint, render_template
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, send_file, send_from_directory, url_for
+from flask_login import current_user, login_required, login_user, logout_user
+from flask_wtf import FlaskForm
+from flask_wtf.file import FileAllowed
+from werkzeug.utils import secure_filename
+from wtforms import StringField, EmailField, FileField, SubmitField
+from wtforms.validators import DataRequired, Email
+
+from app import thumbnails
+from app.images import schedule_derivatives
+from app.mail import send_email
+from app.page_cache import cached_page
+from app.utils import (
+    RESUME_ALLOWED, allowed_file, is_image_filename, parse_resume, photos_folder,
+    validate_image_upload, validate_photo,
+)
+from app.visa_requirements import list_countries, get_requirements
+from investment_data import get_investment_info, company_info
+from models import db, User, Document, UserAgreement
 
 main = Blueprint('main', __name__)
-TEMPLATE_DIR = os.path.abspath("templates")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfileForm(FlaskForm):
+    name = StringField('Name', validators=[DataRequired()])
+    email = EmailField('Email', validators=[DataRequired(), Email()])
+    phone = StringField('Phone')
+    address = StringField('Address')
+    profile_picture = FileField('Update Profile Picture', validators=[FileAllowed(['jpg', 'png', 'jpeg'], 'Images only!')])
+    submit = SubmitField('Update Profile')
+
+
+def update_agreement(status):
+    current_user.agreed_to_terms = status
+    db.session.commit()
+    flash(f"You have {'agreed to' if status else 'disagreed with'} the terms.")
+    return redirect(url_for('main.dashboard'))
+
+
+@main.route('/upload_resume', methods=['GET','POST'])
+@login_required
+def upload_resume():
+    if request.method == 'POST':
+        # Photo is required for both manual entry and file uploads
+        photo = request.files.get('photo')
+        valid_photo, photo_err = validate_photo(photo)
+        if not valid_photo:
+            flash(photo_err)
+            return redirect(request.url)
+
+        # Save photo
+        photo_filename = secure_filename(photo.filename)
+        photo_save_path = os.path.join(photos_folder(), photo_filename)
+        photo.save(photo_save_path)
+        schedule_derivatives(photo_save_path)
+
+        file = request.files.get('file')
+        if file and file.filename != '':
+            # Resume upload path (PDF only)
+            filename = secure_filename(file.filename)
+            ext = filename.rsplit('.',1)[1].lower() if '.' in filename else ''
+            if ext not in RESUME_ALLOWED or file.mimetype != 'application/pdf':
+                flash('Resume must be a PDF file (<=2MB).')
+                return redirect(request.url)
+
+            save_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+            file.save(save_path)
+            parsed = parse_resume(save_path)
+            # Pre-fill name/email if parsed, otherwise empty
+            return render_template('upload_resume.html', parsed=parsed, filename=filename, photo=photo_filename)
+        else:
+            # Manual entry path: accept name/email from form
+            name = request.form.get('name','').strip()
+            email = request.form.get('email','').strip()
+            if not name or not email:
+                flash('If you did not upload a resume, provide Name and Email in the form.')
+                return redirect(request.url)
+            parsed = {'text': '', 'name': name, 'email': email}
+            return render_template('upload_resume.html', parsed=parsed, filename=None, photo=photo_filename)
+
+    return render_template('upload_resume.html', parsed=None)
+
+
+@main.route('/generate_europass', methods=['POST'])
+@login_required
+def generate_europass():
+    name = request.form.get('name','').strip()
+    email = request.form.get('email','').strip()
+    photo_filename = request.form.get('photo_filename') or request.files.get('photo_filename')
+
+    if not name or not email:
+        flash('Name and email are required to generate Europass CV.')
+        return redirect(url_for('main.upload_resume'))
+
+    # If photo_filename isn't provided as text, try to get from form file
+    photo_path = None
+    photo_file = request.files.get('photo')
+    if photo_file and photo_file.filename:
+        ok, err = validate_photo(photo_file)
+        if not ok:
+            flash(err)
+            return redirect(url_for('main.upload_resume'))
+        photo_filename = secure_filename(photo_file.filename)
+        photo_path = os.path.join(photos_folder(), photo_filename)
+        photo_file.save(photo_path)
+        schedule_derivatives(photo_path)
+    elif photo_filename:
+        photo_path = os.path.join(photos_folder(), secure_filename(photo_filename))
+        if not os.path.exists(photo_path):
+            photo_path = None
+
+    if not photo_path:
+        flash('Passport photo is required to generate the Europass CV.')
+        return redirect(url_for('main.upload_resume'))
+
+    user_data = {'name': name, 'email': email}
+    try:
+        from app.europass import create_europass_cv
+        output_path = create_europass_cv(user_data, photo_path=photo_path)
+        return send_file(output_path, as_attachment=True)
+    except Exception as e:
+        print('Error generating Europass:', e)
+        flash('Error generating Europass CV.')
+        return redirect(url_for('main.upload_resume'))
+
+
+@main.route('/verify-document', methods=['GET', 'POST'])
+@login_required
+def verify_document_route():
+    if request.method == 'POST':
+        if 'file' not in request.files:
+            flash('No file part')
+            return redirect(request.url)
+
+        file = request.files['file']
+
+        if file.filename == '':
+            flash('No selected file')
+            return redirect(request.url)
+
+        if file and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+            if is_image_filename(filename):
+                ok, err = validate_image_upload(file)
+                if not ok:
+                    flash(err)
+                    return redirect(request.url)
+
+            # Simulating document verification process
+            verification_passed = True  # Replace with actual verification logic
+
+            if verification_passed:
+                file.save(file_path)
+                if is_image_filename(filename):
+                    schedule_derivatives(file_path)
+
+                # Save document details to the database
+                new_document = Document(
+                    filename=filename,
+                    filepath=file_path,
+                    user_id=current_user.id
+                )
+                db.session.add(new_document)
+                db.session.commit()
+
+                flash('Document verified and uploaded successfully!')
+                return redirect(url_for('main.dashboard'))  # Redirect to dashboard or any relevant page
+            else:
+                flash('Document verification failed.')
+                return redirect(request.url)
+
+    return render_template('verify.html')  # Template for the document verification page
+
+@main.route('/agree')
+def agree():
+    return update_agreement(True)
+
+@main.route('/disagree')
+def disagree():
+    return update_agreement(False)
 
 @main.route('/')
-def home():
+@cached_page()
+def index():
     return render_template('index.html')
 
 @main.route('/about')
+@cached_page()
 def about():
-    return render_template('about_us.html')
+    return render_template('about_us.html')  # Ensure you have the corresponding template
+
+@main.route('/terms')
+@cached_page()
+def terms():
+    return render_template('terms.html')  # Ensure you have a corresponding template for this route
+
+@main.route('/privacy')
+@cached_page()
+def privacy():
+    return render_template('privacy.html')
 
 @main.route('/faq')
+@cached_page()
 def faq():
     return render_template('faq.html')
+
+@main.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        email = request.form['email']
+        password = request.form['password']
+
+        user = User.query.filter_by(email=email).first()
+
+        if user and user.check_password(password):  # Assuming you have password hashing
+            login_user(user)  # Log the user in
+            next_page = request.args.get('next')  # Redirect to the page the user was trying to access before login
+            return redirect(next_page or url_for('main.dashboard'))  # Redirect to the dashboard or the next page
+
+        flash('Invalid credentials', 'danger')
+
+    return render_template('login.html')
+
+@main.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('main.login'))
+
+@main.route('/dashboard')
+@login_required
+def dashboard():
+    user = current_user  # Use current_user directly
+    if user:
+        # Fetch all documents associated with the logged-in user
+        files = user.documents  # Assuming you have a relationship between User and Document
+        return render_template('dashboard.html', files=files, user_details=user)  # Pass user_details explicitly
+    else:
+        flash("No user found", "danger")
+        return redirect(url_for('main.login'))
+    
+
+@main.route('/create_cover_letter', methods=['GET','POST'])
+@login_required
+def create_cover_letter():
+    if request.method == 'POST':
+        name = request.form.get('name','').strip()
+        email = request.form.get('email','').strip()
+        recipient = request.form.get('recipient','').strip()
+        company = request.form.get('company','').strip()
+        position = request.form.get('position','').strip()
+        opening = request.form.get('opening','').strip()
+        body = request.form.get('body','').strip()
+        closing = request.form.get('closing','').strip()
+
+        if not all([name, email, recipient, company, position]):
+            flash('Please fill in required fields: Name, Email, Recipient, Company, Position')
+            return redirect(request.url)
+
+        applicant = {'name': name, 'email': email}
+        try:
+            from app.europass import create_cover_letter as _create_cover
+            output_path = _create_cover(applicant, recipient, company, position, opening, body, closing)
+            return send_file(output_path, as_attachment=True)
+        except Exception as e:
+            print('Error generating cover letter:', e)
+            flash('Error generating cover letter.')
+            return redirect(request.url)
+
+    return render_template('create_cover_letter.html')
+
+
+@main.route('/investment-requirements')
+def investment_requirements():
+    country = request.args.get('country')
+    program_type = request.args.get('program_type')
+
+    countries = list_countries()
+
+    data = get_requirements(country=country, visa_type=program_type) if (country or program_type) else get_requirements()
+
+    # We'll pass countries list, selected country, selected program and requirements data
+    return render_template('investment_requirements.html', countries=countries, selected_country=country, selected_program_type=program_type, data=data)
+
+
+@main.route('/api/investment-requirements')
+def api_investment_requirements():
+    country = request.args.get('country')
+    program_type = request.args.get('program_type')
+    data = get_requirements(country=country, visa_type=program_type)
+    return jsonify(data)
+
+
+
+@main.route('/user_agreement', methods=['GET', 'POST'])
+def user_agreement():
+    agreement_text = """
+    By uploading your documents, you agree to allow Aidni Global LLP to use your documents
+    solely for the purpose of processing visa applications. Your data will be handled
+    securely and in compliance with applicable laws.
+    """
+
+    if request.method == 'POST':
+        # Check if agreement already exists
+        existing_agreement = UserAgreement.query.filter_by(user_id=current_user.id).first()
+        if not existing_agreement:
+            new_agreement = UserAgreement(
+                user_id=current_user.id,
+                agreement_text=agreement_text,
+                agreed_at=datetime.now(timezone.utc),
+                status=True
+            )
+            db.session.add(new_agreement)
+        else:
+            existing_agreement.agreed_at = datetime.now(timezone.utc)
+            existing_agreement.status = True
+
+        db.session.commit()
+
+        # Generate PDF agreement
+        user_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], secure_filename(current_user.name))
+        os.makedirs(user_folder, exist_ok=True)
+        pdf_path = os.path.join(user_folder, f"user_agreement_{current_user.id}.pdf")
+        # Prefer WeasyPrint if available/enabled, otherwise fall back to a simple FPDF-based PDF
+        try:
+            if current_app.config.get('ENABLE_WEASYPRINT', False):
+                from weasyprint import HTML
+                HTML(string=agreement_text).write_pdf(pdf_path)
+            else:
+                # Fallback: simple PDF using fpdf
+                try:
+                    from fpdf import FPDF
+                    pdf = FPDF()
+                    pdf.add_page()
+                    pdf.set_font('Arial', size=11)
+                    for line in agreement_text.splitlines():
+                        pdf.multi_cell(0, 6, txt=line)
+                    pdf.output(pdf_path)
+                except Exception as e:
+                    # As a last resort, write plain text to .pdf so the file exists
+                    with open(pdf_path, 'wb') as f:
+                        f.write(agreement_text.encode('utf-8', errors='replace'))
+        except Exception as e:
+            print('Could not generate agreement PDF:', e)
+
+        flash("Thank you for agreeing to the terms. A copy has been saved.", "success")
+        return redirect(url_for('main.dashboard'))
+
+    return render_template('user_agreement.html', agreement_text=agreement_text)
+
+
+@main.route('/inquiry', methods=['GET','POST'])
+def inquiry():
+    from models import Inquiry
+    if request.method == 'POST':
+        name = request.form.get('name','').strip()
+        email = request.form.get('email','').strip()
+        message = request.form.get('message','').strip()
+        if not (name and email and message):
+            flash('Please provide name, email, and a message.')
+            return redirect(request.url)
+        user_id = current_user.id if getattr(current_user, 'is_authenticated', False) else None
+        inq = Inquiry(user_id=user_id, name=name, email=email, message=message)
+        db.session.add(inq)
+        db.session.commit()
+        # Try to notify via email in non-testing environments; non-fatal
+        if not current_app.config.get('TESTING', False):
+            try:
+                send_email(current_app.config.get('MAIL_DEFAULT_SENDER'), f'New inquiry from {name}', body=message)
+            except Exception as e:
+                print('Could not send inquiry notification:', e)
+        flash('Your inquiry has been received; our team will contact you shortly.', 'success')
+        return redirect(url_for('main.index'))
+
+    # Prefill if logged in
+    if getattr(current_user, 'is_authenticated', False):
+        return render_template('inquiry.html', name=current_user.name, email=current_user.email)
+    return render_template('inquiry.html')
+
+@main.route('/upload_document', methods=['GET', 'POST'])
+@login_required
+def upload_document():
+    if request.method == 'POST':
+        file = request.files['file']
+
+        if file and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            if is_image_filename(filename):
+                ok, err = validate_image_upload(file)
+                if not ok:
+                    flash(err, "danger")
+                    return redirect(request.url)
+
+            user_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], str(current_user.id))
+            os.makedirs(user_folder, exist_ok=True)
+            filepath = os.path.join(user_folder, filename)
+            file.save(filepath)
+            if is_image_filename(filename):
+                schedule_derivatives(filepath)
+            elif thumbnails.thumbnail_kind(filepath):
+                thumbnails.schedule_thumbnails(filepath)
+
+            # Save document to the database
+            document = Document(filename=filename, filepath=filepath, user_id=current_user.id)
+            db.session.add(document)
+            db.session.commit()
+
+            flash("Your document was uploaded successfully and is now available in your dashboard.", "success")
+            return redirect(url_for('main.dashboard'))
+
+        flash("Invalid file type. Allowed types: png, jpg, jpeg, pdf", "danger")
+    return render_template('upload_document.html')  # Ensure template has progress bar logic
+
+
+# User Profile Management Route
+@main.route('/profile', methods=['GET', 'POST'])
+@login_required
+def profile():
+    user = current_user
+    form = ProfileForm(obj=user)  # Pre-populate form with user data
+    if form.validate_on_submit():
+        user.name = form.name.data
+        user.email = form.email.data
+        user.phone = form.phone.data
+        user.address = form.address.data
+
+        # Handle profile picture upload
+        if form.profile_picture.data:
+            picture = form.profile_picture.data
+            ok, err = validate_image_upload(picture)
+            if not ok:
+                flash(err, 'danger')
+                return redirect(url_for('main.profile'))
+            filename = secure_filename(picture.filename)
+            picture_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+            picture.save(picture_path)
+            schedule_derivatives(picture_path)
+
+            # Update user's profile picture path
+            user.profile_picture = filename
+
+        db.session.commit()  # Save changes to database
+        flash('Your profile has been updated!', 'success')
+        return redirect(url_for('main.profile'))
+
+    return render_template('profile.html', form=form, user=user)
+
+
+
+@main.route('/download/<int:doc_id>')
+@login_required
+def download(doc_id):
+    from flask import abort
+    document = db.session.get(Document, doc_id)
+    if not document:
+        abort(404)
+    if document.user_id != current_user.id:
+        flash('You are not authorized to access this file.')
+        return redirect(url_for('main.dashboard'))
+    return send_from_directory(current_app.config['UPLOAD_FOLDER'], document.filename)
+
+@main.route('/thumbnail/document/<int:doc_id>/<int:size>')
+@login_required
+def document_thumbnail(doc_id, size):
+    """Serve a cached thumbnail of one of the current user's documents"""
+    from flask import abort
+    document = db.session.get(Document, doc_id)
+    if not document or document.user_id != current_user.id or size not in thumbnails.THUMBNAIL_SIZES:
+        abort(404)
+    response = thumbnails.serve_thumbnail(document.filepath, size)
+    if response is None:
+        abort(404)
+    return response
+
+
+@main.route('/thumbnail/profile/<int:user_id>/<int:size>')
+@login_required
+def profile_thumbnail(user_id, size):
+    """Serve a cached thumbnail of a user's profile picture"""
+    from flask import abort
+    if user_id != current_user.id and not getattr(current_user, 'is_admin', False):
+        abort(404)
+    user = db.session.get(User, user_id)
+    path = thumbnails.profile_picture_path(user) if user else None
+    if path is None or size not in thumbnails.THUMBNAIL_SIZES:
+        abort(404)
+    response = thumbnails.serve_thumbnail(path, size)
+    if response is None:
+        abort(404)
+    return response
+
+
+@main.route('/delete/<int:doc_id>')
+@login_required
+def delete_document(doc_id):
+    from flask import abort
+    document = db.session.get(Document, doc_id)
+
+    if not document:
+        abort(404)
+
+    # Check if the current user owns the document
+    if document.user_id != current_user.id:
+        flash('You are not authorized to delete this file.', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    # Check if the file exists before trying to delete
+    if os.path.exists(document.filepath):
+        try:
+            os.remove(document.filepath)  # Attempt to delete the file
+        except Exception as e:
+            flash(f"An error occurred while deleting the file: {str(e)}", 'danger')
+            return redirect(url_for('main.dashboard'))
+    else:
+        flash('File not found on the server. It might have already been deleted.', 'warning')
+
+    # Delete the document record from the database
+    db.session.delete(document)
+    db.session.commit()
+    flash('File deleted successfully!', 'success')
+    return redirect(url_for('main.dashboard'))
+
+@main.route('/submit_application', methods=['GET', 'POST'])
+def submit_application():
+    if request.method == 'POST':
+        # Extract form data
+        name = request.form['name']
+        company_name = request.form.get('company_name', '')
+        investment_amount = request.form.get('investment_amount', '')
+        business_type = request.form.get('business_type', '')
+        target_country = request.form['target_country']
+        program_type = request.form['program_type']
+        timeline = request.form.get('timeline', '')
+        email = request.form['email']
+        contact_number = request.form['contact_number']
+
+        # Handle file uploads
+        uploaded_files = {
+            "business_plan": request.files.get('business_plan'),
+            "financial_docs": request.files.get('financial_docs'),
+            "identification": request.files.get('identification'),
+            "proof_of_funds": request.files.get('proof_of_funds'),
+            "corporate_docs": request.files.get('corporate_docs'),
+        }
+
+        # Create a unique folder for each submission (using timestamp or name)
+        timestamp = int(time.time())  # Use timestamp to create a unique folder
+        submission_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], f"submission_{timestamp}")
+        
+        if not os.path.exists(submission_folder):
+            os.makedirs(submission_folder)
+
+        # Save uploaded files into the submission folder
+        for file_key, file_obj in uploaded_files.items():
+            if file_obj:
+                filename = secure_filename(file_obj.filename)
+                file_obj.save(os.path.join(submission_folder, filename))
+
+        # Prepare data for PDF rendering
+        pdf_data = {
+            'name': name,
+            'company_name': company_name,
+            'investment_amount': investment_amount,
+            'business_type': business_type,
+            'target_country': target_country,
+            'program_type': program_type,
+            'timeline': timeline,
+            'email': email,
+            'contact_number': contact_number
+        }
+
+        # Render the HTML template for PDF
+        html = render_template('investment_application_form.html', **pdf_data)
+
+        # Generate PDF and save it in the submission folder
+        pdf_filename = f"{name.replace(' ', '_')}_investment_application.pdf"
+        pdf_path = os.path.join(submission_folder, pdf_filename)
+        try:
+            from weasyprint import HTML as WeasyHTML
+            WeasyHTML(string=html).write_pdf(pdf_path)
+        except:
+            pass
+
+        flash(f'Investment application submitted successfully! Your submission has been saved.', 'success')
+        return redirect(url_for('main.index'))  # Redirect to the home page or confirmation page
+
+    return render_template('investment_application_form.html')
+
+@main.route('/get_investment_info', methods=['POST'])
+def get_investment_info_route():
+    country = request.form.get('country')
+    program_type = request.form.get('program_type')
+    info = get_investment_info(country, program_type)
+    return render_template('index.html', info=info, country=country, program_type=program_type, company_info=company_info)
+
+@main.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        name = request.form.get('name')
+        email = request.form.get('email')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+
+        # Check for missing fields
+        if not name:
+            flash('Name is required')
+            return redirect(url_for('main.register'))
+
+        if password != confirm_password:
+            flash('Passwords do not match')
+            return redirect(url_for('main.register'))
+
+        existing_user = User.query.filter_by(email=email).first()
+        if existing_user:
+            flash('Email is already registered')
+            return redirect(url_for('main.register'))
+
+        # Create new user and set password
+        new_user = User(name=name, email=email)
+        new_user.set_password(password)
+
+        db.session.add(new_user)
+        db.session.commit()
+
+        # Check if the user has accepted the terms and conditions
+        accepted_terms = request.form.get('accepted_terms')  # Assuming this checkbox exists in the form
+        if accepted_terms:
+            agreement = UserAgreement(user_id=new_user.id, agreement_text="User Agreement Text Here", accepted=True)
+            db.session.add(agreement)
+            db.session.commit()
+
+        flash('Registration successful! Please log in.')
+        return redirect(url_for('main.login'))
+
+    return render_template('register.html')
+
+
+# ==================== INVESTMENT APPLICATION & MANAGEMENT ====================
+# Removed large residency-specific routes in favor of lean investment platform
+
+
+@main.route('/investment-opportunities')
+def investment_opportunities():
+    """Browse global investment opportunities"""
+    from investment_data import get_all_countries
+    countries = get_all_countries()
+    return render_template('investment_opportunities.html', countries=countries)
+
+
+ABOUT_COPY_PATH = os.path.join(PROJECT_ROOT, 'about_app_copy.md')
+ABOUT_COPY_FALLBACK = "Nexora — Global Investment & Business Migration Platform\nVisit: http://localhost:5000"
+
+
+@lru_cache(maxsize=4)
+def _read_about_copy(path, mtime_ns):
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def load_about_text():
+    """Return the shareable About copy; the file is only re-read when it changes."""
+    try:
+        return _read_about_copy(ABOUT_COPY_PATH, os.stat(ABOUT_COPY_PATH).st_mtime_ns)
+    except Exception:
+        return ABOUT_COPY_FALLBACK
+
+
+@main.route('/about-app')
+@cached_page()
+def about_app():
+    """Render a copyable About text for sharing and embedding"""
+    about_text = load_about_text()
+    return render_template('about_app_copy.html', about_text=about_text)
+
+
+@main.route('/about-us')
+@cached_page()
+def about_us():
+    """Render About Us page with copy/share functionality"""
+    about_text = load_about_text()
+    return render_template('about_us_share.html', about_text=about_text)
+
+
+@main.route('/copyright')
+@cached_page()
+def copyright():
+    return render_template('copyright.html')
+
+
+@main.route('/create-resume', methods=['GET', 'POST'])
+@login_required
+def create_resume():
+    """Create and manage resume for logged-in user"""
+    if request.method == 'POST':
+        try:
+            # Get form data
+            full_name = request.form.get('full_name', '')
+            email = request.form.get('email', '')
+            phone = request.form.get('phone', '')
+            location = request.form.get('location', '')
+            headline = request.form.get('headline', '')
+            summary = request.form.get('summary', '')
+            skills = request.form.get('skills', '')
+            experience = request.form.get('experience', '')
+            education = request.form.get('education', '')
+            
+            if not all([full_name, email, phone]):
+                flash('Name, email, and phone are required.', 'danger')
+                return render_template('create_resume.html')
+            
+            # Save resume data to user profile or session
+            current_user.full_name = full_name
+            current_user.phone = phone
+            
+            # Store additional resume data in a simple format (could use additional model)
+            resume_data = {
+                'full_name': full_name,
+                'email': email,
+                'phone': phone,
+                'location': location,
+                'headline': headline,
+                'summary': summary,
+                'skills': skills,
+                'experience': experience,
+                'education': education,
+                'created_at': datetime.now(timezone.utc)
+            }
+            
+            db.session.commit()
+            
+            flash('✅ Resume data saved successfully! You can now download your resume.', 'success')
+            return redirect(url_for('main.view_resume'))
+            
+        except Exception as e:
+            flash(f'❌ Error saving resume: {str(e)}', 'danger')
+            return render_template('create_resume.html')
+    
+    return render_template('create_resume.html', user=current_user)
+
+
+@main.route('/view-resume')
+@login_required
+def view_resume():
+    """View user's resume"""
+    user = current_user
+    if not hasattr(user, 'phone') or not user.phone:
+        flash('Please create your resume first.', 'warning')
+        return redirect(url_for('main.create_resume'))
+    
+    return render_template('view_resume.html', user=user)
+
+
+@main.route('/download-resume/<format>')
+@login_required
+def download_resume(format):
+    """Download resume in PDF or Word format"""
+    try:
+        user = current_user
+        
+        if format == 'europass':
+            # Generate Europass CV
+            user_data = {
+                'name': user.full_name or user.username,
+                'email': user.email
+            }
+            
+            # Get photo if exists
+            photo_path = None
+            profile_pic = os.path.join(photos_folder(), f'{user.id}_profile.jpg')
+            if os.path.exists(profile_pic):
+                photo_path = profile_pic
+            
+            from app.europass import create_europass_cv
+            output_path = create_europass_cv(user_data, photo_path=photo_path)
+            return send_file(output_path, as_attachment=True, 
+                           download_name=f'{user.full_name or user.username}_Europass.pdf')
+        
+        elif format == 'pdf':
+            # Generate PDF resume
+            try:
+                from weasyprint import HTML, CSS
+                html_content = f"""
+                <html>
+                <head>
+                    <style>
+                        body {{ font-family: Arial, sans-serif; margin: 40px; }}
+                        .header {{ text-align: center; margin-bottom: 30px; border-bottom: 2px solid #007bff; padding-bottom: 20px; }}
+                        .name {{ font-size: 24px; font-weight: bold; }}
+                        .contact {{ color: #666; margin-top: 10px; }}
+                        .section {{ margin-top: 20px; }}
+                        .section-title {{ font-size: 16px; font-weight: bold; color: #007bff; border-bottom: 1px solid #ddd; padding-bottom: 5px; }}
+                        .content {{ margin-top: 10px; line-height: 1.6; white-space: pre-wrap; }}
+                    </style>
+                </head>
+                <body>
+                    <div class="header">
+                        <div class="name">{user.full_name or user.username}</div>
+                        <div class="contact">
+                            📧 {user.email} | 📱 {user.phone or 'N/A'} | 📍 {getattr(user, 'location', 'N/A')}
+                        </div>
+                        <div class="contact">{getattr(user, 'headline', 'Professional')}</div>
+                    </div>
+                    
+                    <div class="section">
+                        <div class="section-title">PROFESSIONAL SUMMARY</div>
+                        <div class="content">{getattr(user, 'summary', 'Not provided')}</div>
+                    </div>
+                    
+                    <div class="section">
+                        <div class="section-title">SKILLS</div>
+                        <div class="content">{getattr(user, 'skills', 'Not provided')}</div>
+                    </div>
+                    
+                    <div class="section">
+                        <div class="section-title">EXPERIENCE</div>
+                        <div class="content">{getattr(user, 'experience', 'Not provided')}</div>
+                    </div>
+                    
+                    <div class="section">
+                        <div class="section-title">EDUCATION</div>
+                        <div class="content">{getattr(user, 'education', 'Not provided')}</div>
+                    </div>
+                </body>
+                </html>
+                """
+                HTML(string=html_content).write_pdf(f'/tmp/{user.username}_resume.pdf')
+                return send_file(f'/tmp/{user.username}_resume.pdf', as_attachment=True,
+                               download_name=f'{user.full_name or user.username}_Resume.pdf')
+            except ImportError:
+                flash('PDF generation not available. Please use Europass format.', 'warning')
+                return redirect(url_for('main.view_resume'))
+        
+        else:
+            flash('Invalid format requested.', 'danger')
+            return redirect(url_for('main.view_resume'))
+            
+    except Exception as e:
+        flash(f'Error downloading resume: {str(e)}', 'danger')
+        return redirect(url_for('main.view_resume'))
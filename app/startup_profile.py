@@ -0,0 +1,199 @@
+"""Startup profiler: where does a worker spend its boot time?
+
+``flask profile-startup`` boots the app in a fresh interpreter under
+``python -X importtime`` and records:
+
+* per-module import cost (self and cumulative, like ``-X importtime``),
+  also rolled up per top-level package;
+* time spent importing the ``app`` package and inside ``create_app()``;
+* resident memory before and after each phase.
+
+The report is JSON so it can be kept per commit and compared::
+
+    flask --app run:app profile-startup --output base.json
+    ... change something ...
+    flask --app run:app profile-startup --compare base.json --fail-on-regression
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import click
+
+REPORT_VERSION = 1
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_REPORT_PATH = os.path.join('instance', 'startup_profile.json')
+
+# Runs in the child interpreter; the JSON line goes to stdout, importtime to stderr
+PROBE = r'''
+import json, os, sys, time
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+rss_start = rss_mb()
+t0 = time.perf_counter()
+import app as package
+t1 = time.perf_counter()
+rss_imported = rss_mb()
+package.create_app()
+t2 = time.perf_counter()
+print(json.dumps({
+    'import_seconds': t1 - t0,
+    'create_app_seconds': t2 - t1,
+    'rss_start_mb': rss_start,
+    'rss_after_import_mb': rss_imported,
+    'rss_after_create_app_mb': rss_mb(),
+    'modules': len(sys.modules),
+}))
+'''
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def parse_importtime(text: str) -> List[Dict]:
+    """Parse ``-X importtime`` output into {module, self_us, cumulative_us, depth} rows."""
+    rows = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({
+                'module': module,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': (len(indent) - 1) // 2,
+            })
+    return rows
+
+
+def package_totals(rows: List[Dict]) -> Dict[str, int]:
+    """Self import time (µs) rolled up per top-level package."""
+    totals = defaultdict(int)
+    for row in rows:
+        totals[row['module'].split('.', 1)[0]] += row['self_us']
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def profile_startup(python: str = sys.executable, top: int = 40) -> Dict:
+    """Boot the app in a child interpreter and return the report dict."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    proc = subprocess.run([python, '-X', 'importtime', '-c', PROBE], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f'startup probe failed:\n{proc.stderr[-2000:]}')
+    phases = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    phases['rss_delta_mb'] = phases['rss_after_create_app_mb'] - phases['rss_start_mb']
+    phases['import_total_us'] = sum(row['self_us'] for row in rows)
+    return {
+        'version': REPORT_VERSION,
+        'commit': _git_commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': sys.version.split()[0],
+        'phases': phases,
+        'packages': package_totals(rows),
+        'slowest_modules': sorted(rows, key=lambda row: -row['self_us'])[:top],
+    }
+
+
+def compare_reports(base: Dict, current: Dict, threshold_ms: float = 5.0, threshold_pct: float = 10.0) -> Dict:
+    """Diff two reports; a change counts as a regression only if it beats both thresholds."""
+    def regressed(before, after, scale):
+        delta = after - before
+        return delta * scale > threshold_ms and (before == 0 or delta / before * 100 > threshold_pct)
+
+    # Older or partial reports may lack a section; compare what both have
+    base_phases, current_phases = base.get('phases', {}), current.get('phases', {})
+    base_packages, current_packages = base.get('packages', {}), current.get('packages', {})
+
+    phases = {}
+    for key in ('import_seconds', 'create_app_seconds'):
+        before, after = base_phases.get(key, 0), current_phases.get(key, 0)
+        phases[key] = {'base': before, 'current': after, 'regressed': regressed(before, after, 1000)}
+    before, after = base_phases.get('rss_delta_mb', 0), current_phases.get('rss_delta_mb', 0)
+    phases['rss_delta_mb'] = {'base': before, 'current': after,
+                              'regressed': after - before > 1 and (before == 0 or (after - before) / before * 100 > threshold_pct)}
+
+    packages = []
+    for name in set(base_packages) | set(current_packages):
+        before, after = base_packages.get(name, 0), current_packages.get(name, 0)
+        if before != after:
+            packages.append({'package': name, 'base_us': before, 'current_us': after,
+                             'delta_us': after - before, 'regressed': regressed(before, after, 1 / 1000)})
+    packages.sort(key=lambda row: -row['delta_us'])
+    return {
+        'base_commit': base.get('commit'),
+        'current_commit': current.get('commit'),
+        'phases': phases,
+        'packages': packages,
+        'regressed': any(p['regressed'] for p in phases.values()) or any(p['regressed'] for p in packages),
+    }
+
+
+def save_report(report: Dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def init_app(app):
+    @app.cli.command('profile-startup')
+    @click.option('--output', '-o', default=None, help=f'Report path (default {DEFAULT_REPORT_PATH})')
+    @click.option('--compare', 'compare_path', default=None, help='Earlier report to compare against')
+    @click.option('--top', default=15, show_default=True, help='Slowest modules to print')
+    @click.option('--threshold-ms', default=5.0, show_default=True, help='Ignore changes smaller than this')
+    @click.option('--fail-on-regression', is_flag=True, help='Exit with status 1 if a regression is found')
+    def profile_startup_command(output, compare_path, top, threshold_ms, fail_on_regression):
+        """Profile worker boot: import times, create_app() time and memory."""
+        report = profile_startup()
+        path = output or os.path.join(PROJECT_ROOT, DEFAULT_REPORT_PATH)
+        save_report(report, path)
+
+        phases = report['phases']
+        click.echo(f"import app      {phases['import_seconds'] * 1000:8.1f} ms")
+        click.echo(f"create_app()    {phases['create_app_seconds'] * 1000:8.1f} ms")
+        click.echo(f"RSS             {phases['rss_start_mb']:.1f} → {phases['rss_after_create_app_mb']:.1f} MB"
+                   f" (+{phases['rss_delta_mb']:.1f} MB, {phases['modules']} modules)")
+        click.echo('slowest modules (self time):')
+        for row in report['slowest_modules'][:top]:
+            click.echo(f"  {row['self_us'] / 1000:8.1f} ms  {row['module']}")
+
+        regressed = False
+        if compare_path:
+            diff = compare_reports(load_report(compare_path), report, threshold_ms=threshold_ms)
+            regressed = diff['regressed']
+            click.echo(f"compared with {diff['base_commit'] or compare_path}:")
+            for key, row in diff['phases'].items():
+                mark = '✗' if row['regressed'] else ' '
+                click.echo(f"  {mark} {key:20} {row['base']:.3f} → {row['current']:.3f}")
+            for row in [r for r in diff['packages'] if r['regressed']][:top]:
+                click.echo(f"  ✗ {row['package']:20} +{row['delta_us'] / 1000:.1f} ms")
+        click.echo(f'✓ Report written to {path}')
+        if regressed and fail_on_regression:
+            raise SystemExit(1)
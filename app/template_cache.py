@@ -0,0 +1,60 @@
+"""Production template mode: shared Jinja bytecode cache and no auto-reload.
+
+Compiled templates are written to TEMPLATE_BYTECODE_CACHE_DIR so a fresh
+worker loads bytecode instead of parsing and compiling every template again.
+The cache is filled at build time with::
+
+    flask --app run:app compile-templates
+
+With TEMPLATES_AUTO_RELOAD off Jinja also stops stat()-ing template files on
+every render; the bytecode cache still checks the source checksum when a
+template is first loaded, so a stale cache is never used.
+"""
+import os
+from typing import List, Tuple
+
+import click
+from jinja2 import FileSystemBytecodeCache
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+def init_app(app):
+    directory = app.config.get('TEMPLATE_BYTECODE_CACHE_DIR')
+    if directory:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory, pattern='nexora-%s.cache')
+        except OSError as e:
+            print('Could not enable template bytecode cache:', e)
+    app.jinja_env.auto_reload = bool(app.config.get('TEMPLATES_AUTO_RELOAD'))
+    # Parse every template in the preloaded master so workers share them
+    from app import prefork
+    prefork.on_warmup(app, compile_templates)
+
+    @app.cli.command('compile-templates')
+    def compile_templates_command():
+        """Compile every template into the bytecode cache."""
+        compiled, errors = compile_templates(app)
+        for name, error in errors:
+            click.echo(f'✗ {name}: {error}', err=True)
+        target = directory or '(no TEMPLATE_BYTECODE_CACHE_DIR set, nothing persisted)'
+        click.echo(f'✓ Compiled {compiled} templates into {target}')
+        if errors:
+            raise SystemExit(1)
+
+
+def compile_templates(app) -> Tuple[int, List[Tuple[str, str]]]:
+    """Load every template once so its bytecode lands in the cache."""
+    env = app.jinja_env
+    compiled, errors = 0, []
+    with app.app_context():
+        for name in env.list_templates():
+            if not name.endswith(TEMPLATE_SUFFIXES):
+                continue
+            try:
+                env.get_template(name)
+                compiled += 1
+            except Exception as e:
+                errors.append((name, str(e)))
+    return compiled, errors
@@ -0,0 +1,195 @@
+"""Thumbnail cache for uploaded documents and profile pictures.
+
+Thumbnails are keyed by the SHA-256 of the source file plus the requested
+size, so a re-uploaded file gets a new URL and every URL can be served with
+a long-lived, immutable cache header. PDFs are thumbnailed from a raster of
+their first page (PyMuPDF, optional); images go through app.images.
+
+Thumbnails are WebP for clients that list ``image/webp`` in ``Accept`` and
+JPEG for the rest (and for everyone when Pillow was built without WebP);
+responses carry ``Vary: Accept``.
+"""
+import functools
+import hashlib
+import os
+from typing import Optional
+
+from flask import current_app, request, url_for
+
+from app.images import open_normalised, save_derivative, submit_background, ImageRejected
+
+# Only these sizes are rendered so the cache cannot be blown up by arbitrary requests
+THUMBNAIL_SIZES = (64, 128, 256, 512)
+DEFAULT_FORMAT = 'webp'
+CACHE_MAX_AGE = 365 * 24 * 3600
+
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+PDF_EXTENSIONS = {'pdf'}
+
+_MIMETYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+# Digests remembered per worker; a file is hashed again only once it changes or falls out
+DIGEST_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=None)
+def webp_supported() -> bool:
+    from PIL import features
+    return bool(features.check('webp'))
+
+
+def preferred_format() -> str:
+    return DEFAULT_FORMAT if webp_supported() else 'jpeg'
+
+
+def negotiate_format() -> str:
+    """WebP if this client accepts it (and Pillow can write it), else JPEG."""
+    if webp_supported() and any(mimetype == 'image/webp' and quality > 0
+                                for mimetype, quality in request.accept_mimetypes):
+        return 'webp'
+    return 'jpeg'
+
+
+def cache_dir() -> str:
+    configured = current_app.config.get('THUMBNAIL_CACHE_DIR')
+    if configured:
+        return configured
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], '.thumbnails')
+
+
+@functools.lru_cache(maxsize=DIGEST_CACHE_SIZE)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_digest(path: str) -> str:
+    st = os.stat(path)
+    # (path, mtime_ns, size) is the cache key, so an edited file is hashed again
+    return _file_digest(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def thumbnail_kind(path: str) -> Optional[str]:
+    ext = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in PDF_EXTENSIONS:
+        return 'pdf'
+    return None
+
+
+def cached_thumbnail_path(digest: str, size: int, fmt: Optional[str] = None) -> str:
+    fmt = fmt or preferred_format()
+    ext = 'jpg' if fmt == 'jpeg' else fmt
+    return os.path.join(cache_dir(), digest[:2], f'{digest}-{size}.{ext}')
+
+
+def _render_pdf_page(src_path: str, size: int):
+    try:
+        import fitz  # PyMuPDF, optional
+    except ImportError:
+        return None
+    from PIL import Image
+
+    with fitz.open(src_path) as doc:
+        if doc.page_count == 0:
+            return None
+        page = doc.load_page(0)
+        zoom = size / max(page.rect.width, page.rect.height)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+
+
+def render_thumbnail(src_path: str, size: int, fmt: Optional[str] = None) -> Optional[str]:
+    """Return the cached thumbnail for src_path, rendering it on a cache miss.
+
+    Returns None when the file type cannot be thumbnailed.
+    """
+    fmt = fmt or preferred_format()
+    if size not in THUMBNAIL_SIZES:
+        raise ValueError(f'Unsupported thumbnail size: {size}')
+    kind = thumbnail_kind(src_path)
+    if kind is None or not os.path.exists(src_path):
+        return None
+
+    dest = cached_thumbnail_path(source_digest(src_path), size, fmt)
+    if os.path.exists(dest):
+        return dest
+
+    if kind == 'pdf':
+        img = _render_pdf_page(src_path, size)
+    else:
+        try:
+            img = open_normalised(src_path, size)
+        except ImageRejected:
+            return None
+    if img is None:
+        return None
+    img.thumbnail((size, size))
+    save_derivative(img, dest, fmt)
+    return dest
+
+
+def warm_thumbnails(src_path: str, sizes=None):
+    """Pre-render the thumbnail sizes used by dashboard listings."""
+    sizes = sizes or current_app.config.get('THUMBNAIL_WARM_SIZES', (128,))
+    return [render_thumbnail(src_path, size) for size in sizes]
+
+
+def schedule_thumbnails(src_path: str, sizes=None):
+    return submit_background(warm_thumbnails, src_path, sizes)
+
+
+def serve_thumbnail(src_path: str, size: int, fmt: Optional[str] = None):
+    """Build a response for a thumbnail with long-lived cache headers, or None."""
+    from flask import send_file
+
+    fmt = fmt or negotiate_format()
+    path = render_thumbnail(src_path, size, fmt)
+    if path is None:
+        return None
+    response = send_file(path, mimetype=_MIMETYPES[fmt], max_age=CACHE_MAX_AGE, conditional=True,
+                         etag=f'{source_digest(src_path)}-{size}-{fmt}')
+    response.vary.add('Accept')
+    # Thumbnail URLs carry the source digest, so they never change in place
+    response.cache_control.immutable = True
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+
+# ---------------------------------------------------------------------------
+# Template helpers
+# ---------------------------------------------------------------------------
+
+def document_thumbnail_url(document, size: int = 128) -> Optional[str]:
+    path = getattr(document, 'filepath', None)
+    if not path or thumbnail_kind(path) is None or not os.path.exists(path):
+        return None
+    return url_for('main.document_thumbnail', doc_id=document.id, size=size, v=source_digest(path)[:12])
+
+
+def profile_picture_path(user) -> Optional[str]:
+    filename = getattr(user, 'profile_picture', None)
+    if not filename or filename == 'default.jpg':
+        return None
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    return path if os.path.exists(path) else None
+
+
+def profile_thumbnail_url(user, size: int = 128) -> str:
+    path = profile_picture_path(user)
+    if path is None:
+        return url_for('static', filename='profile_pics/default.jpg')
+    return url_for('main.profile_thumbnail', user_id=user.id, size=size, v=source_digest(path)[:12])
+
+
+def init_app(app):
+    """Expose the thumbnail URL helpers to templates."""
+    app.jinja_env.globals.update(
+        document_thumbnail_url=document_thumbnail_url,
+        profile_thumbnail_url=profile_thumbnail_url,
+    )
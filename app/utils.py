@@ -1,4 +1,152 @@
 import os
+import re
+
+from flask import current_app
+from werkzeug.utils import secure_filename
+
+from app.images import check_image, ImageRejected
+
+DEFAULT_ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'docx'}
+
+# Specific allowed types for resumes and photos
+RESUME_ALLOWED = {'pdf'}
+PHOTO_ALLOWED = {'png', 'jpg', 'jpeg'}
+
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'pdf', 'jpg', 'png'}
+    """Check if the file has an allowed extension."""
+    allowed = current_app.config.get('ALLOWED_EXTENSIONS', DEFAULT_ALLOWED_EXTENSIONS)
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed
+
+
+def photos_folder():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'photos')
+
+
+def verified_upload_folder():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'verified_documents')
+
+
+def verify_document(file_path):
+    """Run basic verification using OCR if enabled; returns True/False."""
+    if not current_app.config.get('ENABLE_OCR', False):
+        # OCR disabled for lightweight deployments
+        return False
+    try:
+        from PIL import Image
+        import pytesseract
+        img = Image.open(file_path)
+        extracted_text = pytesseract.image_to_string(img)
+
+        # Perform verification logic (e.g., check for specific keywords)
+        return "valid" in extracted_text.lower()
+    except Exception as e:
+        print(f"Error processing document: {e}")
+        return False  # Return False in case of an error
+
+
+def parse_resume(file_path):
+    """Parse text from PDF resumes. Only PDFs are supported for resume uploads."""
+    text = ""
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        if ext == '.pdf':
+            # PyMuPDF is optional and only imported when a resume is parsed
+            import fitz
+            doc = fitz.open(file_path)
+            for page in doc:
+                text += page.get_text()
+        else:
+            # No parser available for non-PDFs in this flow
+            text = ''
+    except Exception as e:
+        print('parse_resume error:', e)
+        text = ''
+
+    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    email = email_match.group(0) if email_match else ''
+    name = ''
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    for line in lines[:10]:
+        if line.lower().startswith('name'):
+            name = line.split(':',1)[1].strip() if ':' in line else ''
+            break
+    if not name:
+        for line in lines[:10]:
+            if '@' not in line and 'resume' not in line.lower() and len(line.split())<=6:
+                name = line
+                break
+    return {'text': text, 'name': name, 'email': email}
+
+
+def validate_photo(photo_file):
+    """Validate passport photo: extension, size (<=200KB), and approximate portrait aspect ratio."""
+    if not photo_file or photo_file.filename == '':
+        return False, 'No photo uploaded.'
+    filename = secure_filename(photo_file.filename)
+    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    if ext not in PHOTO_ALLOWED:
+        return False, 'Photo must be a PNG or JPG image.'
+
+    # Check size
+    photo_file.stream.seek(0, 2)
+    size = photo_file.stream.tell()
+    photo_file.stream.seek(0)
+    if size > 200 * 1024:
+        return False, 'Photo must be <= 200KB.'
+
+    # Validate dimensions and aspect ratio from the image header only
+    try:
+        info = check_image(photo_file.stream, allowed_formats={'png', 'jpeg'})
+    except ImageRejected as e:
+        return False, str(e)
+    except Exception as e:
+        print('Photo validation error:', e)
+        return False, 'Invalid image file.'
+    if not (0.6 <= info.aspect_ratio <= 0.9):
+        return False, 'Photo should be portrait (approximate passport dimensions).'
+
+    return True, None
+
+
+def validate_image_upload(file_storage):
+    """Header-check an uploaded image; returns (ok, error_message)."""
+    try:
+        check_image(file_storage.stream)
+    except ImageRejected as e:
+        return False, str(e)
+    return True, None
+
+
+def is_image_filename(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in PHOTO_ALLOWED
+
+
+def generate_pdf(content, filename):
+    """Generate a PDF from HTML content using WeasyPrint if available, otherwise fallback to a simple FPDF output."""
+    try:
+        if current_app.config.get('ENABLE_WEASYPRINT', False):
+            from weasyprint import HTML
+            html = HTML(string=content)
+            pdf = html.write_pdf()
+            with open(filename, 'wb') as f:
+                f.write(pdf)
+        else:
+            # Simple fallback: strip html tags and write text using FPDF
+            try:
+                from fpdf import FPDF
+                text = re.sub('<[^<]+?>', '', content)
+                pdf = FPDF()
+                pdf.add_page()
+                pdf.set_font('Arial', size=11)
+                for line in text.splitlines():
+                    pdf.multi_cell(0, 6, txt=line)
+                pdf.output(filename)
+            except Exception as e:
+                # Fallback to plain text file if all else fails
+                with open(filename, 'wb') as f:
+                    f.write(content.encode('utf-8', errors='replace'))
+    except Exception as e:
+        print('generate_pdf failed:', e)
+        with open(filename, 'wb') as f:
+            f.write(content.encode('utf-8', errors='replace'))
@@ -88,3 +88,14 @@ def get_requirements(country=None, visa_type=None):
         return {country: VISA_REQUIREMENTS.get(country, {})}
 
     return VISA_REQUIREMENTS
+
+
+def init_app(app):
+    """Load the seed and the investment programs table in the preloading master."""
+    from app import prefork
+
+    def load_static_data(app):
+        import investment_data  # noqa: F401
+        reload_seed()
+
+    prefork.on_warmup(app, load_static_data)
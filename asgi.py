@@ -0,0 +1,34 @@
+"""ASGI entry point: the Flask app behind asgiref's WSGI adapter.
+
+    NEXORA_SERVER_PROFILE=asgi gunicorn -c gunicorn.conf.py
+    uvicorn asgi:app --workers 4
+
+The stock adapter runs every request on one shared thread, which would
+serialise the I/O-bound views. Here each request runs in its own
+``ThreadSensitiveContext`` (public asgiref API since 3.3), which gives it
+its own thread, so slow SMTP or HTTP calls in one view do not hold up the
+others. At most ASGI_THREADS requests run at once; the rest wait their turn.
+"""
+import asyncio
+import os
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+from run import app as flask_app
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 32))
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    def __init__(self, wsgi_application, max_threads: int = ASGI_THREADS, **kwargs):
+        super().__init__(wsgi_application, **kwargs)
+        self._slots = asyncio.Semaphore(max_threads)
+
+    async def __call__(self, scope, receive, send):
+        async with self._slots:
+            async with ThreadSensitiveContext():
+                await super().__call__(scope, receive, send)
+
+
+app = ThreadedWsgiToAsgi(flask_app)
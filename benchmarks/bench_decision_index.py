@@ -0,0 +1,117 @@
+"""Eligibility decision index vs the full scoring loop, on synthetic catalogs.
+
+For each catalog size, a SQLite database is filled with synthetic programs
+(benchmarks/synthetic.py). The same calculator-like profiles are then
+ranked two ways:
+
+* loop  – EligibilityChecker._scan_matches: query every candidate, score each one
+* index – DecisionIndex.top: a bisect into a precomputed slice; "cold" includes
+  building the slice the first time a net-worth bucket / family size / preference
+  combination is seen
+
+Every loop answer is compared with the index answer for the same profile.
+
+    python benchmarks/bench_decision_index.py                          # 10k and 100k programs
+    python benchmarks/bench_decision_index.py --sizes 1000 --loop-queries 50
+    python benchmarks/bench_decision_index.py --min-speedup 50 --json out.json   # CI gate
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+import synthetic
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def run_benchmark(size: int, queries: int = 2000, loop_queries: int = 10, seed: int = 0):
+    from app.residencies.catalog import build_catalog
+    from app.residencies.decision import DecisionIndex
+    from app.residencies.eligibility import eligibility_checker
+    from app.residencies.rates import current_rates
+    from app.residencies.schemas import EligibilityCheckRequest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = synthetic.make_app(tmp, synthetic.programs(size, seed),
+                                 RESIDENCY_ELIGIBILITY_CACHE_SIZE=0, RESIDENCY_DECISION_SLICES=0)
+        requests = [EligibilityCheckRequest(**p) for p in synthetic.profiles(queries, seed + 1)]
+        with app.app_context():
+            rates = current_rates()
+            start = time.perf_counter()
+            catalog = build_catalog()
+            index = DecisionIndex(catalog, max_slices=len(requests))
+            build_seconds = time.perf_counter() - start
+
+            def ask(r):
+                return index.top(r.investment_budget, r.net_worth, r.family_size,
+                                 program_type=r.program_type_preference.value if r.program_type_preference else None,
+                                 country=r.country_preference, rates_version=rates.version)
+
+            cold, warm, answers = [], [], []
+            for r in requests:
+                built = index.stats['slices_built']
+                start = time.perf_counter()
+                answers.append(ask(r))
+                (cold if index.stats['slices_built'] > built else warm).append(time.perf_counter() - start)
+
+            loop, mismatches = [], 0
+            for r, answer in list(zip(requests, answers))[:loop_queries]:
+                start = time.perf_counter()
+                programs, _ = eligibility_checker._scan_matches(r, rates)
+                loop.append(time.perf_counter() - start)
+                if answer is not None and [p.id for p in programs] != [p['id'] for p, _ in answer]:
+                    mismatches += 1
+
+    warm_median = statistics.median(warm) if warm else 0.0
+    loop_median = statistics.median(loop)
+    return {
+        'programs': size,
+        'index_build_ms': _ms(build_seconds),
+        'index_cold_ms_median': _ms(statistics.median(cold)) if cold else None,
+        'index_warm_ms_median': _ms(warm_median),
+        'slices_built': index.stats['slices_built'],
+        'fallbacks': index.stats['fallbacks'],
+        'loop_ms_median': _ms(loop_median),
+        'speedup_warm': round(loop_median / warm_median, 1) if warm_median else None,
+        'checked': len(loop),
+        'mismatches': mismatches,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000', help='comma-separated catalog sizes')
+    parser.add_argument('--queries', type=int, default=2000, help='profiles ranked through the index')
+    parser.add_argument('--loop-queries', type=int, default=10, help='profiles also ranked by the full loop')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--min-speedup', type=float, help='fail if warm index lookups are not this much faster')
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(',')):
+        r = run_benchmark(size, args.queries, args.loop_queries)
+        results.append(r)
+        print(f"{r['programs']:>7} programs  build {r['index_build_ms']:.0f} ms  "
+              f"index warm {r['index_warm_ms_median']:.3f} ms / cold {r['index_cold_ms_median'] or 0:.1f} ms  "
+              f"loop {r['loop_ms_median']:.0f} ms  speedup x{r['speedup_warm']}  "
+              f"mismatches {r['mismatches']}/{r['checked']}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = [f"{r['programs']} programs: {r['mismatches']} answers differ from the loop" for r in results if r['mismatches']]
+    if args.min_speedup is not None:
+        failed += [f"{r['programs']} programs: speedup x{r['speedup_warm']} < x{args.min_speedup}"
+                   for r in results if (r['speedup_warm'] or 0) < args.min_speedup]
+    for message in failed:
+        print('✗', message, file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
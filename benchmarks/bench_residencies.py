@@ -0,0 +1,174 @@
+"""Latency and memory of the residency hot paths on synthetic catalogs.
+
+For each catalog size a fresh SQLite database is filled with synthetic
+programs (benchmarks/synthetic.py), and these cases are timed:
+
+* catalog_build      – first snapshot of the catalog with its indexes
+* check_eligibility  – EligibilityChecker.check_eligibility over a calculator-like profile mix
+* list_programs      – GET /residencies/api/programs with typical filters and sorts
+* convert_currency   – POST /residencies/api/currencies/convert
+* convert_bulk       – POST /residencies/api/currencies/convert-bulk with 1,000 amounts
+* data_loader        – ResidencyDataLoader.load_from_json_file of the whole catalog
+
+Each case reports p50/p95 latency, then its peak traced memory from a
+second, shorter pass under tracemalloc, which slows code too much to time
+it. With ``--baseline``, any metric that grew by more than ``--threshold``
+(and by more than the noise floor) fails the run.
+
+    python benchmarks/bench_residencies.py                                   # 1k and 10k programs
+    python benchmarks/bench_residencies.py --sizes 1000,10000,100000 --save baseline.json
+    python benchmarks/bench_residencies.py --baseline baseline.json --threshold 0.25      # CI gate
+    python benchmarks/bench_residencies.py --cases check_eligibility,list_programs -n 500
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic
+
+CASES = ('catalog_build', 'check_eligibility', 'list_programs', 'convert_currency', 'convert_bulk', 'data_loader')
+LIST_QUERIES = (
+    '/residencies/api/programs?country=Portugal&sort=investment',
+    '/residencies/api/programs?min_investment=500000&max_investment=750000',
+    '/residencies/api/programs?program_type=startup&country=Malta',
+    '/residencies/api/programs?min_investment=4000000&currency=EUR&sort=-investment',
+)
+MEMORY_SAMPLES = 20
+# Growth below these is noise, whatever the ratio
+NOISE_FLOOR = {'ms_p50': 0.05, 'ms_p95': 0.1, 'peak_kb': 64}
+
+
+def measure(fn, items, memory_samples: int = MEMORY_SAMPLES):
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for item in items[:memory_samples]:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return {
+        'calls': len(latencies),
+        'ms_p50': round(statistics.median(latencies) * 1000, 3),
+        'ms_p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(size: int, cases=CASES, requests: int = 200, seed: int = 0):
+    from app.residencies.catalog import get_catalog
+    from app.residencies.data_loader import ResidencyDataLoader
+    from app.residencies.eligibility import eligibility_checker
+    from app.residencies.schemas import EligibilityCheckRequest
+
+    rows = synthetic.programs(size, seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        app = synthetic.make_app(tmp, rows)
+        client = app.test_client()
+
+        if 'catalog_build' in cases:
+            def build(_):
+                with app.app_context():
+                    # forced: an unchanged catalog would otherwise keep its indexes and skip the listeners
+                    app.extensions['residency_catalog'].rebuild(force=True)
+            results['catalog_build'] = measure(build, [None] * 3, memory_samples=1)
+
+        with app.app_context():
+            get_catalog()  # warm, so the first profile is not charged for the snapshot
+
+            if 'check_eligibility' in cases:
+                profiles = [EligibilityCheckRequest(**p) for p in synthetic.profiles(requests, seed + 1)]
+                results['check_eligibility'] = measure(eligibility_checker.check_eligibility, profiles)
+
+        if 'list_programs' in cases:
+            urls = [LIST_QUERIES[i % len(LIST_QUERIES)] for i in range(max(len(LIST_QUERIES), requests // 10))]
+            results['list_programs'] = measure(client.get, urls, memory_samples=len(LIST_QUERIES))
+
+        if 'convert_currency' in cases:
+            payloads = [{'amount': 1000 + i, 'from_currency': synthetic.CURRENCIES[i % len(synthetic.CURRENCIES)],
+                         'to_currency': 'EUR'} for i in range(requests)]
+            results['convert_currency'] = measure(
+                lambda payload: client.post('/residencies/api/currencies/convert', json=payload), payloads)
+
+        if 'convert_bulk' in cases:
+            payload = {'amounts': [float(r['investment_min_amount'] or 0) for r in rows[:1000]],
+                       'from_currency': [r['investment_currency'] for r in rows[:1000]], 'to_currency': 'USD'}
+            results['convert_bulk'] = measure(
+                lambda payload: client.post('/residencies/api/currencies/convert-bulk', json=payload),
+                [payload] * max(5, requests // 20), memory_samples=3)
+
+        if 'data_loader' in cases:
+            path = os.path.join(tmp, 'programs.json')
+            with open(path, 'w') as f:
+                json.dump(synthetic.loader_document(rows), f)
+            results['data_loader'] = measure(lambda p: ResidencyDataLoader.load_from_json_file(p, app=app),
+                                             [path], memory_samples=1)
+    return results
+
+
+def regressions(results, baseline, threshold: float):
+    failed = []
+    for size, cases in results.items():
+        for case, metrics in cases.items():
+            before = baseline.get(size, {}).get(case, {})
+            for metric, floor in NOISE_FLOOR.items():
+                old, new = before.get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + threshold) and new - old > floor:
+                    failed.append(f'{size} programs {case} {metric}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)'
+                                  if old else f'{size} programs {case} {metric}: {old} -> {new}')
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000', help='comma-separated catalog sizes')
+    parser.add_argument('--cases', default=','.join(CASES), help='comma-separated cases to run')
+    parser.add_argument('-n', '--requests', type=int, default=200, help='calls per request-driven case')
+    parser.add_argument('--save', help='write the results to this file (use as a later --baseline)')
+    parser.add_argument('--baseline', help='results from an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed growth per metric (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    cases = tuple(c for c in args.cases.split(',') if c)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for size in (int(s) for s in args.sizes.split(',')):
+        results[str(size)] = run_benchmark(size, cases, args.requests)
+        for case, m in results[str(size)].items():
+            print(f"{size:>7} programs  {case:<18} p50 {m['ms_p50']:>10.3f} ms  p95 {m['ms_p95']:>10.3f} ms  "
+                  f"peak {m['peak_kb']:>10.1f} KB  ({m['calls']} calls)")
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            failed = regressions(results, json.load(f), args.threshold)
+    for message in failed:
+        print('✗', message, file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
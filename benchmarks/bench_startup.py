@@ -0,0 +1,83 @@
+"""Worker boot benchmark: time and memory to import ``run`` (i.e. build the app).
+
+Each sample runs in a fresh interpreter, the same way a gunicorn worker starts
+from scratch, and reports wall time, peak RSS and any heavy optional modules
+that got imported during startup (they should all load lazily).
+
+    python benchmarks/bench_startup.py                 # 5 samples, summary
+    python benchmarks/bench_startup.py -n 10 --json out.json
+    python benchmarks/bench_startup.py --max-seconds 2 --max-rss-mb 150   # CI gate
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Optional dependencies that must not be imported just to boot a worker
+HEAVY_MODULES = ('fitz', 'docx', 'openpyxl', 'weasyprint', 'pytesseract', 'fpdf', 'flask_mail', 'PIL', 'requests')
+
+PROBE = r'''
+import json, resource, sys, time
+start = time.perf_counter()
+import run
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss_kb //= 1024
+heavy = sorted(m for m in %r if m in sys.modules)
+print(json.dumps({'seconds': elapsed, 'rss_mb': rss_kb / 1024, 'modules': len(sys.modules), 'heavy': heavy}))
+''' % (HEAVY_MODULES,)
+
+
+def sample():
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(samples=5):
+    results = [sample() for _ in range(samples)]
+    return {
+        'samples': samples,
+        'seconds_median': statistics.median(r['seconds'] for r in results),
+        'seconds_max': max(r['seconds'] for r in results),
+        'rss_mb_median': statistics.median(r['rss_mb'] for r in results),
+        'modules': results[-1]['modules'],
+        'heavy_imported': sorted({m for r in results for m in r['heavy']}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--samples', type=int, default=5)
+    parser.add_argument('--json', help='write the summary to this file')
+    parser.add_argument('--max-seconds', type=float, help='fail if the median boot time exceeds this')
+    parser.add_argument('--max-rss-mb', type=float, help='fail if the median peak RSS exceeds this')
+    args = parser.parse_args(argv)
+
+    summary = run_benchmark(args.samples)
+    print(f"boot time  median {summary['seconds_median'] * 1000:.0f} ms  (max {summary['seconds_max'] * 1000:.0f} ms)")
+    print(f"peak RSS   median {summary['rss_mb_median']:.1f} MB")
+    print(f"modules    {summary['modules']}")
+    print(f"heavy      {', '.join(summary['heavy_imported']) or 'none'}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    failed = []
+    if args.max_seconds is not None and summary['seconds_median'] > args.max_seconds:
+        failed.append(f"boot time {summary['seconds_median']:.2f}s > {args.max_seconds}s")
+    if args.max_rss_mb is not None and summary['rss_mb_median'] > args.max_rss_mb:
+        failed.append(f"RSS {summary['rss_mb_median']:.1f} MB > {args.max_rss_mb} MB")
+    if summary['heavy_imported']:
+        failed.append(f"heavy modules imported at startup: {', '.join(summary['heavy_imported'])}")
+    for message in failed:
+        print('✗', message, file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Concurrent-request capacity of each gunicorn server profile on this machine.
+
+For each profile a real gunicorn (``-c gunicorn.conf.py``) is started on a
+free port with a throwaway SQLite database. Concurrent inquiry submissions
+are then fired at it. Each inquiry sends a notification email. SMTP points
+at a local stand-in that takes ``--smtp-delay`` seconds per message, so the
+route is I/O bound the same way it is in production. The stand-in also
+records how many messages were in flight at once. That number is the
+server's real concurrency.
+
+    python benchmarks/load_test.py                              # sync vs gthread vs gevent
+    python benchmarks/load_test.py --profiles sync,asgi -c 64 -n 256 --smtp-delay 0.5
+    python benchmarks/load_test.py --path / --method GET       # plain page, no SMTP involved
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class SlowSMTPServer(socketserver.ThreadingTCPServer):
+    """Just enough SMTP for smtplib; every message takes `delay` seconds to accept."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        self.reply('220 loadtest ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 loadtest')
+            elif command.startswith('DATA'):
+                self.reply('354 end with <CRLF>.<CRLF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with server.lock:
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                time.sleep(server.delay)
+                with server.lock:
+                    server.in_flight -= 1
+                    server.messages += 1
+                self.reply('250 queued')
+            elif command.startswith('QUIT'):
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+def start_server(profile: str, port: int, env: dict) -> subprocess.Popen:
+    env = dict(env, NEXORA_SERVER_PROFILE=profile, PORT=str(port))
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'{profile} server exited:\n{proc.stderr.read()[-2000:]}')
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/terms', timeout=1).read()
+            return proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f'{profile} server did not come up on port {port}')
+
+
+def fire(url: str, method: str, data, total: int, concurrency: int):
+    class NoRedirect(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+    opener = urllib.request.build_opener(NoRedirect)
+
+    def one(i):
+        body = urllib.parse.urlencode({k: v.format(i=i) for k, v in data.items()}).encode() if data else None
+        started = time.perf_counter()
+        try:
+            opener.open(urllib.request.Request(url, data=body, method=method), timeout=60).read()
+            ok = True
+        except urllib.error.HTTPError as e:
+            ok = e.code < 400
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for _, latency in results)
+    return {
+        'requests': total,
+        'errors': sum(1 for ok, _ in results if not ok),
+        'seconds': elapsed,
+        'rps': total / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def run(profiles, workers, concurrency, total, smtp_delay, path, method):
+    tmp = tempfile.mkdtemp(prefix='nexora-load-')
+    smtp = SlowSMTPServer(smtp_delay)
+    threading.Thread(target=smtp.serve_forever, daemon=True).start()
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'load.db')}",
+               UPLOAD_FOLDER=os.path.join(tmp, 'uploads'),
+               WEB_CONCURRENCY=str(workers),
+               MAIL_SERVER='127.0.0.1', MAIL_PORT=str(smtp.server_address[1]),
+               MAIL_USE_TLS='false', MAIL_DEFAULT_SENDER='loadtest@example.com',
+               PAGE_CACHE_BACKEND='null')
+    subprocess.run([sys.executable, '-c', 'from run import app; from models import db\n'
+                    'with app.app_context(): db.create_all()'], cwd=ROOT, env=env, check=True)
+
+    inquiry = {'name': 'Load {i}', 'email': 'load{i}@example.com', 'message': 'capacity test'}
+    data = inquiry if path == '/inquiry' and method == 'POST' else None
+    results = {}
+    for profile in profiles:
+        port = free_port()
+        proc = start_server(profile, port, env)
+        try:
+            smtp.peak_in_flight = 0
+            stats = fire(f'http://127.0.0.1:{port}{path}', method, data, total, concurrency)
+            stats['peak_in_flight'] = smtp.peak_in_flight if data else None
+            results[profile] = stats
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    smtp.shutdown()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', default='sync,gthread,gevent')
+    parser.add_argument('-w', '--workers', type=int, default=2)
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-n', '--requests', type=int, default=128)
+    parser.add_argument('--smtp-delay', type=float, default=0.2, help='seconds the SMTP stand-in takes per message')
+    parser.add_argument('--path', default='/inquiry')
+    parser.add_argument('--method', default='POST')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args(argv)
+
+    results = run(args.profiles.split(','), args.workers, args.concurrency, args.requests,
+                  args.smtp_delay, args.path, args.method.upper())
+    print(f"{args.method} {args.path}, {args.workers} workers, {args.concurrency} clients, {args.requests} requests")
+    print(f"{'profile':10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'in flight':>10} {'errors':>7}")
+    for profile, r in results.items():
+        in_flight = '-' if r['peak_in_flight'] is None else r['peak_in_flight']
+        print(f"{profile:10} {r['rps']:8.1f} {r['p50_ms']:8.0f} {r['p95_ms']:8.0f} {in_flight:>10} {r['errors']:7}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
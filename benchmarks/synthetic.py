@@ -0,0 +1,121 @@
+"""Synthetic residency programs and eligibility profiles for the benchmarks.
+
+The data follows the shape of the real catalog. Investment minimums and
+net-worth requirements are round amounts, so many programs share a
+threshold. Most programs are in the big investor markets, and a third have
+no family limit. Everything is drawn from a seeded RNG, so a given ``n`` and
+``seed`` always give the same catalog.
+
+    from synthetic import make_app, programs, profiles   # benchmarks/ is on sys.path
+    app = make_app(tmp_dir, programs(10_000))
+"""
+import os
+import random
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+COUNTRIES = ['Portugal', 'Spain', 'Greece', 'Malta', 'Cyprus', 'United States', 'Canada', 'United Kingdom',
+             'UAE', 'Singapore', 'Australia', 'New Zealand', 'Switzerland', 'Italy', 'Ireland', 'Latvia',
+             'Panama', 'Costa Rica', 'Mauritius', 'Thailand', 'Malaysia', 'Turkey', 'Antigua', 'Grenada']
+CURRENCIES = ['USD', 'USD', 'USD', 'EUR', 'EUR', 'GBP', 'CAD', 'AUD', 'SGD', 'AED', 'CHF']
+PROGRAM_TYPES = ['investor', 'employment', 'startup', 'student', 'retired', 'family', 'citizenship']
+BENEFIT_WORDS = ('visa-free travel schengen access citizenship pathway family inclusion healthcare education '
+                 'tax residence business licence remote work permanent residency dual nationality').split()
+SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£'}
+DOCUMENTS = ['Passport', 'Bank statements', 'Police clearance', 'Medical certificate', 'Proof of funds',
+             'Business plan', 'Birth certificate', 'Marriage certificate', 'Employment contract', 'Tax returns']
+
+
+def _money(amount, currency):
+    symbol = SYMBOLS.get(currency)
+    return f'{symbol}{amount:,}' if symbol else f'{currency} {amount:,}'
+
+
+def programs(n: int, seed: int = 0):
+    """`n` column dicts for ResidencyProgram."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        country = rng.choice(COUNTRIES[:8]) if rng.random() < 0.6 else rng.choice(COUNTRIES)
+        low = rng.choice([None] + [25000 * k for k in range(1, 201)]) if rng.random() < 0.9 else None
+        high = low * rng.choice([1, 2, 4]) if low else None
+        currency = rng.choice(CURRENCIES)
+        months = rng.randint(1, 36)
+        rows.append({
+            'country': country,
+            'program_name': f'{country} synthetic program {i}',
+            'investment_required': f'{_money(low, currency)} - {_money(high, currency)}' if low else None,
+            'investment_currency': currency,
+            'investment_min_amount': low,
+            'investment_max_amount': high,
+            'processing_time': f'{months} months',
+            'processing_time_months': months,
+            'documents_required': rng.sample(DOCUMENTS, rng.randint(2, 6)),
+            'family_size_limit': None if rng.random() < 0.35 else rng.randint(1, 10),
+            'net_worth_required': None if rng.random() < 0.4 else 100000 * rng.randint(1, 50),
+            'benefits': ' '.join(rng.sample(BENEFIT_WORDS, 6)),
+            'interview_required': rng.random() < 0.3,
+            'program_type': rng.choice(PROGRAM_TYPES),
+        })
+    return rows
+
+
+def loader_document(rows):
+    """`rows` in the {country: {program name: {...}}} shape read by ResidencyDataLoader.load_from_json_file."""
+    document = {}
+    for row in rows:
+        document.setdefault(row['country'], {})[row['program_name']] = {
+            'investment_required': row['investment_required'] or 'N/A',
+            'processing_time': row['processing_time'],
+            'family_size_limit': row['family_size_limit'],
+            'net_worth_required': row['net_worth_required'],
+            'program_type': row['program_type'],
+            'interview_required': row['interview_required'],
+            'documents_required': row['documents_required'],
+            'benefits': row['benefits'],
+        }
+    return document
+
+
+def profiles(n: int, seed: int = 1, country_share: float = 0.2, type_share: float = 0.5):
+    """`n` EligibilityCheckRequest payloads in a calculator-like mix."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        payload = {
+            'investment_budget': round(10 ** rng.uniform(4.5, 6.8), 2),
+            'net_worth': round(10 ** rng.uniform(5, 7.2), 2),
+            'family_size': rng.choice([1, 1, 2, 2, 3, 4, 4, 5, 6]),
+        }
+        if rng.random() < country_share:
+            payload['country_preference'] = rng.choice(COUNTRIES[:8])
+        if rng.random() < type_share:
+            payload['program_type_preference'] = rng.choice(PROGRAM_TYPES)
+        out.append(payload)
+    return out
+
+
+def make_app(directory: str, rows, **config):
+    """An app on a fresh SQLite file in `directory`, loaded with `rows` and their USD amounts."""
+    from sqlalchemy import insert
+
+    from app import create_app
+    from app.residencies.models import ResidencyProgram
+    from app.residencies.rates import current_rates
+    from app.residencies.usd_amounts import recompute_usd_amounts
+    from models import db
+
+    settings = {'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(directory, 'bench.db')}"}
+    settings.update(config)
+    app = create_app(settings)
+    with app.app_context():
+        db.create_all()
+        for start in range(0, len(rows), 5000):
+            db.session.execute(insert(ResidencyProgram), rows[start:start + 5000])
+        db.session.commit()
+        # Bulk inserts skip the ORM hooks, so fill the USD columns in one UPDATE
+        recompute_usd_amounts(current_rates())
+    return app
@@ -12,19 +12,119 @@ class Config:
     SQLALCHEMY_DATABASE_URI = _db_path
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    TEMPLATES_AUTO_RELOAD = True
+
+    # 'production' turns off template auto-reload (see app/template_cache.py)
+    ENVIRONMENT = os.environ.get('NEXORA_ENV', os.environ.get('FLASK_ENV', 'development'))
+    _auto_reload = os.environ.get('TEMPLATES_AUTO_RELOAD')
+    TEMPLATES_AUTO_RELOAD = (_auto_reload.lower() in ('1', 'true', 'yes')) if _auto_reload else ENVIRONMENT != 'production'
+    # Shared on-disk Jinja bytecode cache, filled at build time by `flask compile-templates`
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get(
+        'TEMPLATE_BYTECODE_CACHE_DIR',
+        os.path.abspath(os.path.join(os.path.dirname(__file__), 'instance', 'jinja_bytecode')))
 
     # Uploads & file storage
     # Ensure UPLOAD_FOLDER is an absolute path or a path relative to project root.
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', os.path.abspath(os.path.join(os.path.dirname(__file__), 'uploads')))
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 2 * 1024 * 1024))  # default 2MB
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'docx'}
+
+    # Image intake (see app/images.py): limits are checked from the image header before decoding
+    IMAGE_MAX_PIXELS = int(os.environ.get('IMAGE_MAX_PIXELS', 40_000_000))
+    IMAGE_MAX_DIMENSION = int(os.environ.get('IMAGE_MAX_DIMENSION', 10_000))
+    IMAGE_DISPLAY_SIZE = int(os.environ.get('IMAGE_DISPLAY_SIZE', 1600))  # longest side of display copies
+    IMAGE_THUMB_SIZE = int(os.environ.get('IMAGE_THUMB_SIZE', 256))  # longest side of thumbnails
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))  # background derivative threads
+    # Thumbnail cache (see app/thumbnails.py); defaults to <UPLOAD_FOLDER>/.thumbnails
+    THUMBNAIL_CACHE_DIR = os.environ.get('THUMBNAIL_CACHE_DIR')
+    THUMBNAIL_WARM_SIZES = (128,)  # rendered in the background right after upload
+
+    # Full-page cache for anonymous visitors (see app/page_cache.py)
+    # Backends: lru (in-process), filesystem, redis ('memory://' = local stand-in), null (disabled)
+    PAGE_CACHE_BACKEND = os.environ.get('PAGE_CACHE_BACKEND', 'lru')
+    PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 300))
+    PAGE_CACHE_DIR = os.environ.get('PAGE_CACHE_DIR')
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 512))  # 'lru' and 'filesystem'
+    PAGE_CACHE_REDIS_URL = os.environ.get('PAGE_CACHE_REDIS_URL', 'memory://')
+    # Bump on deploy to invalidate cached pages; defaults to RELEASE_VERSION / RENDER_GIT_COMMIT
+    PAGE_CACHE_VERSION = os.environ.get('PAGE_CACHE_VERSION')
+    # {% cache %} template fragments (navbar/footer) share the page cache backend
+    FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 3600))
+    DEFAULT_LOCALE = 'en'
+    SUPPORTED_LOCALES = ('en',)
+
+    # Job search (see app/jobs/): 'sample' (offline listings) or 'careerjet' (live API)
+    JOBS_PROVIDER = os.environ.get('JOBS_PROVIDER', 'sample')
+    CAREERJET_API_URL = os.environ.get('CAREERJET_API_URL', 'http://public.api.careerjet.net/search')
+    CAREERJET_AFFID = os.environ.get('CAREERJET_AFFID', '22926d61e8d645ae480bb1297fa3022f')
+    CAREERJET_LOCALE = os.environ.get('CAREERJET_LOCALE', 'en_GB')
+    # Outbound provider HTTP: pooled keep-alive session, strict timeouts, jittered retries, circuit breaker
+    JOBS_HTTP_CONNECT_TIMEOUT = float(os.environ.get('JOBS_HTTP_CONNECT_TIMEOUT', 3.05))
+    JOBS_HTTP_READ_TIMEOUT = float(os.environ.get('JOBS_HTTP_READ_TIMEOUT', 5))
+    JOBS_HTTP_RETRIES = int(os.environ.get('JOBS_HTTP_RETRIES', 2))
+    JOBS_HTTP_BACKOFF = float(os.environ.get('JOBS_HTTP_BACKOFF', 0.2))
+    JOBS_HTTP_POOL_SIZE = int(os.environ.get('JOBS_HTTP_POOL_SIZE', 10))
+    JOBS_BREAKER_THRESHOLD = int(os.environ.get('JOBS_BREAKER_THRESHOLD', 5))
+    JOBS_BREAKER_RESET = float(os.environ.get('JOBS_BREAKER_RESET', 30))
+    # 'local' provider: offline index filled by `flask ingest-jobs` (see app/jobs/index.py)
+    JOBS_INDEX_PATH = os.environ.get(
+        'JOBS_INDEX_PATH', os.path.abspath(os.path.join(os.path.dirname(__file__), 'instance', 'jobs_index.db')))
+    JOBS_INDEX_MAX_AGE_DAYS = float(os.environ.get('JOBS_INDEX_MAX_AGE_DAYS', 30))
+    # 'aggregate' provider: query these providers in parallel, wait at most DEADLINE seconds
+    JOBS_AGGREGATE_PROVIDERS = os.environ.get('JOBS_AGGREGATE_PROVIDERS', 'careerjet,sample')
+    JOBS_AGGREGATE_DEADLINE = float(os.environ.get('JOBS_AGGREGATE_DEADLINE', 2.5))
+    JOBS_AGGREGATE_WORKERS = int(os.environ.get('JOBS_AGGREGATE_WORKERS', 8))
+    # Bulk application API (app/jobs/api.py): comma-separated partner keys for the X-API-Key header
+    JOBS_PARTNER_API_KEYS = os.environ.get('JOBS_PARTNER_API_KEYS', '')
+    JOBS_BULK_MAX_ITEMS = int(os.environ.get('JOBS_BULK_MAX_ITEMS', 1000))
+    # Search result cache: fresh for TTL, then served stale (and refreshed in the background) for STALE_TTL
+    JOBS_CACHE_ENABLED = os.environ.get('JOBS_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    JOBS_CACHE_TTL = int(os.environ.get('JOBS_CACHE_TTL', 300))
+    JOBS_CACHE_STALE_TTL = int(os.environ.get('JOBS_CACHE_STALE_TTL', 1800))
+    JOBS_CACHE_NEGATIVE_TTL = int(os.environ.get('JOBS_CACHE_NEGATIVE_TTL', 60))
+    JOBS_CACHE_REFRESH_WORKERS = int(os.environ.get('JOBS_CACHE_REFRESH_WORKERS', 2))
+    # Own backend, so searches and cached pages never evict each other; kind defaults to PAGE_CACHE_BACKEND
+    JOBS_CACHE_BACKEND = os.environ.get('JOBS_CACHE_BACKEND')
+    JOBS_CACHE_MAX_ENTRIES = int(os.environ.get('JOBS_CACHE_MAX_ENTRIES', 2048))  # 'lru' and 'filesystem'
+    JOBS_CACHE_DIR = os.environ.get('JOBS_CACHE_DIR')  # 'filesystem'; defaults to <UPLOAD_FOLDER>/.jobs_cache
+    JOBS_CACHE_REDIS_URL = os.environ.get('JOBS_CACHE_REDIS_URL', os.environ.get('PAGE_CACHE_REDIS_URL', 'memory://'))
+    # Background fetch of the next results page into the cache, rate limited per user and per provider
+    JOBS_PREFETCH_ENABLED = os.environ.get('JOBS_PREFETCH_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    JOBS_PREFETCH_USER_RATE = float(os.environ.get('JOBS_PREFETCH_USER_RATE', 6))  # per minute
+    JOBS_PREFETCH_PROVIDER_RATE = float(os.environ.get('JOBS_PREFETCH_PROVIDER_RATE', 2))  # per second
+    JOBS_PREFETCH_PROVIDER_BURST = float(os.environ.get('JOBS_PREFETCH_PROVIDER_BURST', 5))
+
+    # Exchange rates for residency programs (see app/residencies/rates.py): 'static', 'file' or 'http'
+    RESIDENCY_RATES_SOURCE = os.environ.get('RESIDENCY_RATES_SOURCE', 'static')
+    RESIDENCY_RATES_FILE = os.environ.get('RESIDENCY_RATES_FILE')
+    RESIDENCY_RATES_URL = os.environ.get('RESIDENCY_RATES_URL')
+    RESIDENCY_RATES_REFRESH = int(os.environ.get('RESIDENCY_RATES_REFRESH', 3600))
+    # In-memory program catalog (app/residencies/catalog.py): seconds between checks for other workers' writes
+    RESIDENCY_CATALOG_TTL = int(os.environ.get('RESIDENCY_CATALOG_TTL', 60))
+    RESIDENCY_COMPARE_MAX = int(os.environ.get('RESIDENCY_COMPARE_MAX', 50))  # programs per comparison
+    RESIDENCY_SIMILAR_TOP_K = int(os.environ.get('RESIDENCY_SIMILAR_TOP_K', 6))  # neighbours kept per program
+    # Pairwise similarity is quadratic; larger catalogs fall back to same-country neighbours
+    RESIDENCY_SIMILAR_MAX_PROGRAMS = int(os.environ.get('RESIDENCY_SIMILAR_MAX_PROGRAMS', 5000))
+    # LRU of eligibility results keyed by threshold bucket (app/residencies/eligibility_cache.py); 0 disables
+    RESIDENCY_ELIGIBILITY_CACHE_SIZE = int(os.environ.get('RESIDENCY_ELIGIBILITY_CACHE_SIZE', 2048))
+    # Precomputed top-N per profile slice (app/residencies/decision.py): slices kept per worker; 0 disables
+    RESIDENCY_DECISION_SLICES = int(os.environ.get('RESIDENCY_DECISION_SLICES', 256))
+
+    # Sampling request profiler (see app/profiler.py): fraction of requests profiled; 0 installs nothing
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 0))
+    PROFILER_MODE = os.environ.get('PROFILER_MODE', 'sampling')  # 'sampling' (stack snapshots) or 'cprofile'
+    PROFILER_INTERVAL = float(os.environ.get('PROFILER_INTERVAL', 0.005))  # seconds between stack snapshots
+    PROFILER_STORE_PATH = os.environ.get(
+        'PROFILER_STORE_PATH', os.path.abspath(os.path.join(os.path.dirname(__file__), 'instance', 'profiles.db')))
+    PROFILER_MAX_SAMPLES = int(os.environ.get('PROFILER_MAX_SAMPLES', 2000))
 
     # Email (Flask-Mail) configuration - set these in production
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ('1', 'true', 'yes')
+    MAIL_USE_SSL = os.environ.get('MAIL_USE_SSL', 'false').lower() in ('1', 'true', 'yes')
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', MAIL_USERNAME)
 
     # Note: File-based sqlite DB concurrent writes can be problematic under heavy load; prefer PostgreSQL in production.
 
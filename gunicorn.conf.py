@@ -0,0 +1,81 @@
+"""Gunicorn settings: preload the app in the master and fork copy-on-write workers.
+
+    gunicorn -c gunicorn.conf.py
+
+The master imports run:app once, runs the warm-up hooks (templates, page
+cache fingerprint, the residency catalog with its indexes, the visa seed;
+see app/prefork.py) and freezes the gc so the shared objects stay in shared
+pages. Each worker then resets whatever holds
+connections, threads or locks before serving requests. Worker memory
+(RSS/PSS/shared/private) is logged at boot and on exit.
+
+NEXORA_SERVER_PROFILE picks the worker model (see SERVER_PROFILES). The
+I/O-bound routes (job search, email, inquiries, documents) mostly wait on
+sockets, so the threaded and cooperative profiles serve many requests per
+worker where ``sync`` serves one. ``gevent`` and ``asgi`` need the optional
+``gevent`` / ``uvicorn`` + ``asgiref`` packages.
+"""
+import os
+
+SERVER_PROFILES = {
+    # one request in flight per worker
+    'sync': {'worker_class': 'sync'},
+    # GUNICORN_THREADS requests per worker; blocking socket I/O releases the GIL
+    'gthread': {'worker_class': 'gthread'},
+    # cooperative greenlets; blocking clients (SMTP, HTTP, sockets) are monkey-patched below
+    'gevent': {'worker_class': 'gevent'},
+    # uvicorn workers serving asgi:app (the Flask app behind asgiref's WsgiToAsgi)
+    'asgi': {'worker_class': 'uvicorn.workers.UvicornWorker', 'wsgi_app': 'asgi:app'},
+}
+server_profile = os.environ.get('NEXORA_SERVER_PROFILE', 'gthread')
+if server_profile not in SERVER_PROFILES:
+    raise RuntimeError(f'Unknown NEXORA_SERVER_PROFILE {server_profile!r}; pick one of {", ".join(SERVER_PROFILES)}')
+
+if server_profile == 'gevent':
+    # Patch before the app is preloaded so every socket, lock and client it creates is cooperative
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+worker_class = SERVER_PROFILES[server_profile]['worker_class']
+wsgi_app = SERVER_PROFILES[server_profile].get('wsgi_app', 'run:app')
+threads = int(os.environ.get('GUNICORN_THREADS', 8)) if server_profile == 'gthread' else 1
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 200))
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+accesslog = '-'
+
+
+def _app():
+    from run import app
+    return app
+
+
+def when_ready(server):
+    from app import prefork
+    ran = prefork.warm_up(_app())
+    prefork.freeze()
+    server.log.info('Master warmed up (%d hooks, %s profile): %s', ran, server_profile,
+                    prefork.format_memory(prefork.memory_report()))
+
+
+def pre_fork(server, worker):
+    # Objects created since the last freeze (e.g. by a reload) are frozen too
+    from app import prefork
+    prefork.freeze()
+
+
+def post_fork(server, worker):
+    from app import prefork
+    prefork.run_after_fork(_app())
+
+
+def post_worker_init(worker):
+    from app import prefork
+    worker.log.info('Worker %s booted: %s', worker.pid, prefork.format_memory(prefork.memory_report()))
+
+
+def worker_exit(server, worker):
+    from app import prefork
+    server.log.info('Worker %s exiting: %s', worker.pid, prefork.format_memory(prefork.memory_report(worker.pid)))
@@ -0,0 +1,46 @@
+"""Add indexed USD investment columns to residency_program
+
+Revision ID: 7c1d2e9a4b10
+Revises: de4e58e1b7f7
+Create Date: 2026-10-19 10:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1d2e9a4b10'
+down_revision = 'de4e58e1b7f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # residency_program is created by db.create_all() on new installs, already with these columns
+    if 'residency_program' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    with op.batch_alter_table('residency_program', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('investment_min_usd', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('investment_max_usd', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('usd_rate_version', sa.String(length=12), nullable=True))
+        batch_op.create_index(batch_op.f('ix_residency_program_investment_min_usd'), ['investment_min_usd'], unique=False)
+        batch_op.create_index(batch_op.f('ix_residency_program_investment_max_usd'), ['investment_max_usd'], unique=False)
+
+    # Backfill with the current rate table; later rate changes are applied by the app
+    from app.residencies.rates import current_rates
+    from app.residencies.usd_amounts import usd_update_statement
+    op.get_bind().execute(usd_update_statement(current_rates()))
+
+
+def downgrade():
+    if 'residency_program' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    with op.batch_alter_table('residency_program', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_residency_program_investment_max_usd'))
+        batch_op.drop_index(batch_op.f('ix_residency_program_investment_min_usd'))
+        batch_op.drop_column('usd_rate_version')
+        batch_op.drop_column('investment_max_usd')
+        batch_op.drop_column('investment_min_usd')
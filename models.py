@@ -2,16 +2,6 @@ from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from datetime import datetime, timezone
-from flask_wtf import FlaskForm
-from wtforms import StringField, EmailField, SelectField, SubmitField, DateField, FileField
-from wtforms.validators import DataRequired, Email
-from PIL import Image
-
-# Conditional import for OCR (optional heavy dependency)
-try:
-    import pytesseract
-except ImportError:
-    pytesseract = None
 
 db = SQLAlchemy()
 
@@ -46,4 +46,77 @@ def login_admin(client):
         assert admin is not None
     with client.session_transaction() as sess:
         sess['_user_id'] = str(admin.id)
-    return client
\ No newline at end of file
+    return client
+
+class FakeJobsAPI:
+    """Local stand-in for a job provider's JSON API (CareerJet-shaped responses).
+
+    Queue responses with ``respond(status, body, delay)``; once the queue is
+    empty every request gets ``default``. Requests and client connections are
+    recorded so tests can check retries and keep-alive reuse.
+    """
+
+    def __init__(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.queue = []
+        self.default = (200, {'type': 'JOBS', 'hits': 0, 'pages': 0, 'jobs': []}, 0)
+        self.requests = []
+        self.connections = set()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                import json
+                import time
+                from urllib.parse import urlsplit, parse_qs
+                api.requests.append(parse_qs(urlsplit(self.path).query))
+                api.connections.add(self.client_address)
+                status, body, delay = api.queue.pop(0) if api.queue else api.default
+                if delay:
+                    time.sleep(delay)
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/search'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def respond(self, status=200, body=None, delay=0):
+        self.queue.append((status, body if body is not None else self.default[1], delay))
+
+    @staticmethod
+    def jobs_payload(*titles, hits=None):
+        jobs = [{'title': t, 'company': 'Acme', 'locations': 'London', 'url': f'https://jobs.example/{i}',
+                 'salary': '', 'description': f'{t} role', 'date': 'today'} for i, t in enumerate(titles)]
+        return {'type': 'JOBS', 'hits': hits if hits is not None else len(jobs), 'pages': 1, 'jobs': jobs}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_jobs_api():
+    api = FakeJobsAPI()
+    yield api
+    api.close()
+
+
+@pytest.fixture
+def second_jobs_api():
+    """Another independent provider stand-in, for fan-out tests."""
+    api = FakeJobsAPI()
+    yield api
+    api.close()
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+from app import create_app
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_blueprints_registered_once():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    assert {'main', 'admin', 'jobs', 'residencies'} <= set(app.blueprints)
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()}
+    assert {'main.index', 'main.login', 'admin.admin_inquiries', 'jobs.job_search'} <= endpoints
+
+
+def test_index_renders(client):
+    resp = client.get('/')
+    assert resp.status_code == 200
+
+
+def test_startup_does_not_import_heavy_modules():
+    probe = (
+        "import sys, run\n"
+        "heavy = ('fitz', 'docx', 'openpyxl', 'weasyprint', 'pytesseract', 'fpdf', 'flask_mail')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1:] in ([], [''])
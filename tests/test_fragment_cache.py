@@ -0,0 +1,45 @@
+import pytest
+from flask import render_template_string
+
+from app import create_app
+from app.fragment_cache import COMPANY_INFO
+
+
+@pytest.fixture
+def app():
+    return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+
+
+TEMPLATE = "{% cache 'probe', key, timeout=60 %}{{ counter() }}{% endcache %}"
+
+
+def _counter():
+    calls = []
+
+    def counter():
+        calls.append(1)
+        return len(calls)
+    return counter
+
+
+def test_fragment_rendered_once_per_key(app):
+    counter = _counter()
+    with app.test_request_context():
+        assert render_template_string(TEMPLATE, key='a', counter=counter) == '1'
+        assert render_template_string(TEMPLATE, key='a', counter=counter) == '1'
+        assert render_template_string(TEMPLATE, key='b', counter=counter) == '2'
+
+
+def test_fragment_cache_disabled_with_null_backend():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'PAGE_CACHE_BACKEND': 'null'})
+    counter = _counter()
+    with app.test_request_context():
+        render_template_string(TEMPLATE, key='a', counter=counter)
+        assert render_template_string(TEMPLATE, key='a', counter=counter) == '2'
+
+
+def test_company_info_is_shared_global(app):
+    with app.test_request_context():
+        assert app.jinja_env.globals['company_info'] is COMPANY_INFO
+        assert render_template_string('{{ company_info.name }} {{ now().year }}').startswith('Aidni Global LLP')
@@ -0,0 +1,74 @@
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.images import probe_image, check_image, render_derivatives, ImageRejected
+
+
+def _encode(fmt, size=(300, 400)):
+    buf = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buf, fmt)
+    buf.seek(0)
+    return buf
+
+
+@pytest.mark.parametrize('fmt,expected', [('PNG', 'png'), ('JPEG', 'jpeg'), ('GIF', 'gif'), ('WEBP', 'webp')])
+def test_probe_reads_dimensions_from_header(fmt, expected):
+    buf = _encode(fmt)
+    info = probe_image(buf)
+    assert info.format == expected
+    assert (info.width, info.height) == (300, 400)
+    # stream position restored so the upload can still be saved
+    assert buf.tell() == 0
+
+
+def test_probe_jpeg_skips_large_exif_segment():
+    buf = BytesIO()
+    Image.new('RGB', (120, 80)).save(buf, 'JPEG', exif=b'Exif\x00\x00' + b'\x00' * 30000)
+    buf.seek(0)
+    info = probe_image(buf)
+    assert (info.width, info.height) == (120, 80)
+
+
+def test_decompression_bomb_rejected_without_decoding():
+    # A PNG header claiming 50000x50000 pixels with no image data behind it
+    ihdr = struct.pack('>IIBBBBB', 50000, 50000, 8, 2, 0, 0, 0)
+    chunk = struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr + struct.pack('>I', zlib.crc32(b'IHDR' + ihdr))
+    buf = BytesIO(b'\x89PNG\r\n\x1a\n' + chunk)
+    with pytest.raises(ImageRejected):
+        check_image(buf)
+
+
+def test_unsupported_format_rejected():
+    with pytest.raises(ImageRejected):
+        check_image(BytesIO(b'%PDF-1.4 not an image'))
+
+
+def test_render_derivatives_caps_size(tmp_path):
+    src = tmp_path / 'scan.png'
+    Image.new('RGB', (4000, 3000), (10, 120, 200)).save(src)
+
+    outputs = render_derivatives(str(src))
+
+    assert set(outputs) == {'display.jpeg', 'display.webp', 'thumb.jpeg', 'thumb.webp'}
+    with Image.open(outputs['display.jpeg']) as img:
+        assert max(img.size) == 1600
+    with Image.open(outputs['thumb.webp']) as img:
+        assert max(img.size) == 256
+
+
+def test_open_normalised_leaves_pillow_limit_alone(tmp_path):
+    from app.images import open_normalised
+    src = tmp_path / 'scan.png'
+    Image.new('RGB', (40, 30)).save(src)
+    limit = Image.MAX_IMAGE_PIXELS
+
+    assert open_normalised(str(src), 16).size == (40, 30)
+    assert Image.MAX_IMAGE_PIXELS == limit
+
+    src.write_bytes(b'%PDF-1.4 not an image')
+    with pytest.raises(ImageRejected):
+        open_normalised(str(src), 16)
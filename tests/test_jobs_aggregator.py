@@ -0,0 +1,82 @@
+import time
+
+from app import create_app
+from app.jobs.aggregator import merge
+from app.jobs.providers import Job, SearchResult
+
+
+def _job(title, company='Acme', location='London', provider='a'):
+    return Job(f'{provider}-{title}', title, company, location, 'https://example.com', provider=provider)
+
+
+def _app(fast, slow, **config):
+    return create_app(dict({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                            'JOBS_PROVIDER': 'aggregate', 'JOBS_AGGREGATE_PROVIDERS': 'fast,slow',
+                            'JOBS_AGGREGATE_DEADLINE': 0.5, 'JOBS_CACHE_ENABLED': False}, **config))
+
+
+def _register(monkeypatch, fast, slow):
+    from app.jobs import providers
+    from app.jobs.client import HttpClient
+    client = HttpClient(read_timeout=3, retries=0)
+    monkeypatch.setitem(providers.PROVIDERS, 'fast', lambda: providers.CareerJetProvider(client, fast.url))
+    monkeypatch.setitem(providers.PROVIDERS, 'slow', lambda: providers.CareerJetProvider(client, slow.url))
+
+
+def test_merge_dedupes_and_ranks_by_agreement():
+    a = SearchResult(jobs=[_job('Data Analyst'), _job('Python Developer')])
+    b = SearchResult(jobs=[_job('python  developer', company='ACME', provider='b'), _job('Chef', provider='b')])
+
+    jobs = merge([a, b], 'python')
+
+    assert [j.title for j in jobs] == ['Python Developer', 'Data Analyst', 'Chef']
+
+
+def test_fan_out_queries_providers_in_parallel(monkeypatch, fake_jobs_api, second_jobs_api):
+    _register(monkeypatch, fake_jobs_api, second_jobs_api)
+    fake_jobs_api.respond(200, fake_jobs_api.jobs_payload('Fast Role'), delay=0.3)
+    second_jobs_api.respond(200, second_jobs_api.jobs_payload('Slow Role'), delay=0.3)
+    app = _app(fake_jobs_api, second_jobs_api, JOBS_AGGREGATE_DEADLINE=2)
+
+    started = time.perf_counter()
+    with app.test_request_context('/job-search'):
+        from app.jobs.providers import get_provider
+        result = get_provider().search('role', 'London')
+    elapsed = time.perf_counter() - started
+
+    assert sorted(j.title for j in result.jobs) == ['Fast Role', 'Slow Role']
+    assert not result.partial
+    assert elapsed < 0.55
+
+
+def test_slow_provider_yields_partial_results(monkeypatch, fake_jobs_api, second_jobs_api):
+    _register(monkeypatch, fake_jobs_api, second_jobs_api)
+    fake_jobs_api.respond(200, fake_jobs_api.jobs_payload('Fast Role'))
+    second_jobs_api.respond(200, second_jobs_api.jobs_payload('Slow Role'), delay=1.5)
+    app = _app(fake_jobs_api, second_jobs_api)
+
+    started = time.perf_counter()
+    resp = app.test_client().get('/job-search?keywords=role&location=London')
+
+    assert time.perf_counter() - started < 1.2
+    assert b'Fast Role' in resp.data and b'Slow Role' not in resp.data
+    assert b'may be incomplete' in resp.data
+
+
+def test_slow_provider_frees_its_thread_at_the_deadline(monkeypatch, second_jobs_api):
+    from app.jobs import providers
+    from app.jobs.aggregator import get_executor
+    from app.jobs.client import HttpClient, UpstreamError
+    client = HttpClient(read_timeout=3, retries=2, sleep=lambda s: None)
+    monkeypatch.setitem(providers.PROVIDERS, 'slow', lambda: providers.CareerJetProvider(client, second_jobs_api.url))
+    second_jobs_api.default = (200, second_jobs_api.jobs_payload('Slow Role'), 2)
+    app = _app(None, second_jobs_api, JOBS_AGGREGATE_PROVIDERS='slow', JOBS_AGGREGATE_WORKERS=1)
+
+    with app.test_request_context('/job-search'):
+        try:
+            providers.get_provider().search('role', 'London')
+        except UpstreamError:
+            pass
+        # The only worker is back once the deadline has passed, not after 3 x 3 s of retries
+        assert get_executor().submit(lambda: 'free').result(timeout=1) == 'free'
+    assert len(second_jobs_api.requests) == 1
@@ -0,0 +1,66 @@
+from flask_mail import email_dispatched
+
+from models import db, JobApplication
+
+
+def _application(i, **overrides):
+    return dict({'job_id': f'cj-{i}', 'job_title': f'Role {i}', 'company': 'Acme', 'location': 'London',
+                 'full_name': f'Applicant {i}', 'email': f'a{i}@example.com', 'phone': '0123'}, **overrides)
+
+
+def test_bulk_api_requires_admin_or_partner_key(client):
+    resp = client.post('/api/job-applications/bulk', json={'applications': [_application(1)]})
+    assert resp.status_code == 403
+
+    client.application.config['JOBS_PARTNER_API_KEYS'] = 'k1, k2'
+    resp = client.post('/api/job-applications/bulk', json={'applications': [_application(1)]},
+                       headers={'X-API-Key': 'k2'})
+    assert resp.status_code == 201
+
+
+def test_bulk_create_is_all_or_nothing(login_admin):
+    client = login_admin
+    resp = client.post('/api/job-applications/bulk',
+                       json={'applications': [_application(1), _application(2, email='nope'), _application(3, phone='')]})
+
+    assert resp.status_code == 400
+    assert [e['index'] for e in resp.get_json()['errors']] == [1, 2]
+    with client.application.app_context():
+        assert db.session.query(JobApplication).count() == 0
+
+
+def test_bulk_create_and_status_updates_notify_through_queue(login_admin):
+    client = login_admin
+    app = client.application
+    app.config['MAIL_DEFAULT_SENDER'] = 'jobs@example.com'
+    sent = []
+
+    def record(app, message):
+        sent.append(message)
+
+    with email_dispatched.connected_to(record):
+        _bulk_workflow(client, app, sent)
+
+
+def _bulk_workflow(client, app, sent):
+    resp = client.post('/api/job-applications/bulk', json={'applications': [_application(i) for i in range(25)]})
+    assert resp.status_code == 201 and resp.get_json()['created'] == 25
+    with app.app_context():
+        ids = [a.id for a in db.session.query(JobApplication).order_by(JobApplication.id)]
+
+    updates = [{'id': ids[0], 'status': 'Viewed'}, {'id': ids[1], 'status': 'Rejected'},
+               {'id': ids[2], 'status': 'Applied'}]
+    resp = client.post('/api/job-applications/status', json={'updates': updates})
+    assert resp.get_json() == {'updated': 2, 'unchanged': 1, 'errors': []}
+
+    resp = client.post('/api/job-applications/status', json={'updates': [{'id': ids[1], 'status': 'Accepted'},
+                                                                         {'id': 10 ** 6, 'status': 'Viewed'}]})
+    assert resp.status_code == 400
+    assert [e['index'] for e in resp.get_json()['errors']] == [0, 1]
+
+    app.extensions['notifications'].join()
+    assert len(sent) == 27
+    assert sent[-1].subject == 'Application update - Role 1: Rejected'
+    with app.app_context():
+        statuses = {a.id: a.status for a in db.session.query(JobApplication)}
+    assert statuses[ids[0]] == 'Viewed' and statuses[ids[1]] == 'Rejected' and statuses[ids[2]] == 'Applied'
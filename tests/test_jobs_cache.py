@@ -0,0 +1,96 @@
+from app import create_app
+from app.jobs.cache import JobSearchCache
+from app.jobs.providers import Job, JobProvider, SearchResult
+from app.page_cache import LRUBackend
+
+
+class CountingProvider(JobProvider):
+    name = 'counting'
+
+    def __init__(self, titles=('Engineer',)):
+        self.titles = list(titles)
+        self.calls = []
+
+    def search(self, keywords, location, page=1, page_size=20):
+        self.calls.append((keywords, location, page))
+        jobs = [Job(f'id-{i}', title, 'Acme', location, 'https://example.com') for i, title in enumerate(self.titles)]
+        return SearchResult(jobs=jobs, total=len(jobs), pages=1, provider=self.name)
+
+
+def _cache(now):
+    return JobSearchCache(LRUBackend(), ttl=60, stale_ttl=600, negative_ttl=10, clock=lambda: now[0])
+
+
+def test_normalised_queries_share_one_entry():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    now, provider = [0.0], CountingProvider()
+    cache = _cache(now)
+    with app.app_context():
+        cache.search(provider, 'Python  Developer', 'London ')
+        result = cache.search(provider, 'python developer', 'london')
+        cache.search(provider, 'python developer', 'london', page=2)
+
+    assert [j.title for j in result.jobs] == ['Engineer']
+    assert provider.calls == [('python developer', 'london', 1), ('python developer', 'london', 2)]
+    assert cache.metrics()['hits'] == 1 and cache.metrics()['misses'] == 2
+
+
+def test_stale_entry_is_served_and_refreshed_in_background():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    now, provider = [0.0], CountingProvider(['Old'])
+    cache = _cache(now)
+    with app.app_context():
+        cache.search(provider, 'ops', 'remote')
+        provider.titles = ['New']
+        now[0] = 120  # past the TTL, inside the stale window
+        stale = cache.search(provider, 'ops', 'remote')
+        cache._executor.shutdown(wait=True)
+        fresh = cache.search(provider, 'ops', 'remote')
+
+    assert [j.title for j in stale.jobs] == ['Old']
+    assert [j.title for j in fresh.jobs] == ['New']
+    metrics = cache.metrics()
+    assert metrics['stale_hits'] == 1 and metrics['refreshes'] == 1 and metrics['hits'] == 1
+    assert len(provider.calls) == 2
+
+
+def test_empty_results_are_cached_briefly():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    now, provider = [0.0], CountingProvider([])
+    cache = _cache(now)
+    with app.app_context():
+        cache.search(provider, 'cobol', 'mars')
+        cache.search(provider, 'cobol', 'mars')
+        now[0] = 11  # negative TTL over: no stale window for empty results
+        cache.search(provider, 'cobol', 'mars')
+
+    assert len(provider.calls) == 2
+    assert cache.metrics()['negative_hits'] == 1
+
+
+def test_job_search_page_is_answered_from_cache(fake_jobs_api):
+    fake_jobs_api.default = (200, fake_jobs_api.jobs_payload('Cached Role'), 0)
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'JOBS_PROVIDER': 'careerjet', 'CAREERJET_API_URL': fake_jobs_api.url})
+    client = app.test_client()
+
+    for _ in range(3):
+        assert b'Cached Role' in client.get('/job-search?keywords=rust&location=berlin').data
+
+    assert len(fake_jobs_api.requests) == 1
+    assert app.extensions['jobs_cache'].metrics()['hit_ratio'] == round(2 / 3, 4)
+
+
+def test_cache_has_its_own_backend(tmp_path):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'JOBS_CACHE_MAX_ENTRIES': 3})
+    backend = app.extensions['jobs_cache'].backend
+    assert backend is not app.extensions['page_cache'].backend
+    for i in range(5):
+        backend.set(f'search-{i}', i, 60)
+    assert len(backend) == 3 and len(app.extensions['page_cache'].backend) == 0
+
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'PAGE_CACHE_BACKEND': 'filesystem', 'UPLOAD_FOLDER': str(tmp_path)})
+    assert app.extensions['jobs_cache'].backend.directory == str(tmp_path / '.jobs_cache')
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'PAGE_CACHE_BACKEND': 'null'})
+    assert isinstance(app.extensions['jobs_cache'].backend, LRUBackend)
@@ -0,0 +1,148 @@
+import pytest
+
+from app import create_app
+from app.jobs.client import HttpClient, CircuitBreaker, CircuitOpen, UpstreamError
+from app.jobs.providers import CareerJetProvider, get_provider
+
+
+def _client(**kw):
+    kw.setdefault('retries', 2)
+    return HttpClient(connect_timeout=1, read_timeout=0.5, backoff=0.01, sleep=lambda s: None, **kw)
+
+
+def test_keep_alive_reuses_one_connection(fake_jobs_api):
+    client = _client()
+    for _ in range(5):
+        client.get_json(fake_jobs_api.url)
+    assert len(fake_jobs_api.requests) == 5
+    assert len(fake_jobs_api.connections) == 1
+
+
+def test_retries_transient_errors_then_succeeds(fake_jobs_api):
+    fake_jobs_api.respond(503)
+    fake_jobs_api.respond(200, fake_jobs_api.jobs_payload('Engineer'))
+    delays = []
+    client = _client()
+    client.sleep = delays.append
+
+    data = client.get_json(fake_jobs_api.url)
+
+    assert data['jobs'][0]['title'] == 'Engineer'
+    assert len(fake_jobs_api.requests) == 2
+    assert len(delays) == 1 and 0 <= delays[0] <= 0.01
+
+
+def test_read_timeout_is_enforced(fake_jobs_api):
+    fake_jobs_api.respond(200, delay=1)
+    with pytest.raises(UpstreamError, match='Timeout'):
+        _client(retries=0).get_json(fake_jobs_api.url)
+
+
+def test_client_errors_are_not_retried(fake_jobs_api):
+    fake_jobs_api.respond(400)
+    with pytest.raises(UpstreamError) as exc:
+        _client().get_json(fake_jobs_api.url)
+    assert exc.value.status == 400
+    assert len(fake_jobs_api.requests) == 1
+
+
+def test_circuit_opens_after_repeated_failures(fake_jobs_api):
+    fake_jobs_api.default = (500, {}, 0)
+    client = _client(retries=0, breaker_threshold=2)
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            client.get_json(fake_jobs_api.url)
+    with pytest.raises(CircuitOpen):
+        client.get_json(fake_jobs_api.url)
+    assert len(fake_jobs_api.requests) == 2
+
+
+def test_breaker_half_open_lets_one_trial_through():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] = 10
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+class RaisingSession:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+def test_other_request_errors_are_wrapped_and_release_the_trial():
+    import requests
+    client = _client(retries=2, breaker_threshold=1, breaker_reset=0)
+    client._session = RaisingSession(requests.TooManyRedirects('Exceeded 30 redirects.'))
+    breaker = client.breaker('http://jobs.example/api')
+    breaker.record_failure()  # open; half-open straight away with reset 0
+
+    with pytest.raises(UpstreamError, match='TooManyRedirects'):
+        client.get_json('http://jobs.example/api')
+
+    assert client._session.calls == 1  # not a transient error: no retry
+    assert breaker.failures == 2
+    assert breaker.allow()  # the failed trial was settled; a new one may start
+
+
+def test_careerjet_provider_rejects_non_object_payload(fake_jobs_api):
+    fake_jobs_api.respond(200, ['not', 'an', 'object'])
+    provider = CareerJetProvider(_client(), fake_jobs_api.url)
+    with pytest.raises(UpstreamError, match='unexpected list'):
+        provider.search('data', 'London')
+
+
+@pytest.mark.parametrize('payload', [
+    {'jobs': [], 'hits': 'n/a'},
+    {'jobs': [], 'pages': '2 of 3'},
+    {'jobs': ['not a job']},
+])
+def test_careerjet_provider_rejects_malformed_fields(fake_jobs_api, payload):
+    fake_jobs_api.respond(200, payload)
+    provider = CareerJetProvider(_client(), fake_jobs_api.url)
+    with pytest.raises(UpstreamError, match='malformed'):
+        provider.search('data', 'London')
+
+
+def test_careerjet_provider_parses_results(fake_jobs_api):
+    fake_jobs_api.respond(200, fake_jobs_api.jobs_payload('Data Analyst', 'ML Engineer', hits=42))
+    provider = CareerJetProvider(_client(), fake_jobs_api.url, affid='aff', locale='en_GB')
+
+    result = provider.search('data', 'London', page=2)
+
+    assert result.total == 42 and [j.title for j in result.jobs] == ['Data Analyst', 'ML Engineer']
+    assert result.jobs[0].id.startswith('cj-') and result.jobs[0].location == 'London'
+    sent = fake_jobs_api.requests[0]
+    assert sent['keywords'] == ['data'] and sent['page'] == ['2'] and sent['affid'] == ['aff']
+
+
+def test_job_search_page_uses_configured_provider(fake_jobs_api):
+    fake_jobs_api.respond(200, fake_jobs_api.jobs_payload('Remote Python Developer'))
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'JOBS_PROVIDER': 'careerjet', 'CAREERJET_API_URL': fake_jobs_api.url})
+
+    resp = app.test_client().get('/job-search?keywords=python&location=remote')
+
+    assert resp.status_code == 200
+    assert b'Remote Python Developer' in resp.data
+    with app.app_context():
+        assert get_provider().name == 'careerjet'
+
+
+def test_job_search_page_reports_provider_outage(fake_jobs_api):
+    fake_jobs_api.default = (502, {}, 0)
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'JOBS_PROVIDER': 'careerjet', 'CAREERJET_API_URL': fake_jobs_api.url,
+                      'JOBS_HTTP_RETRIES': 0, 'JOBS_BREAKER_THRESHOLD': 1})
+    client = app.test_client()
+
+    assert b'did not respond in time' in client.get('/job-search?keywords=a&location=b').data
+    assert b'temporarily unavailable' in client.get('/job-search?keywords=a&location=b').data
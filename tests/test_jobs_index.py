@@ -0,0 +1,84 @@
+import gzip
+import json
+
+from app import create_app
+from app.jobs.index import JobIndex, iter_feed, normalise_location
+
+XML_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<jobs>
+  <job><title>Senior Python Developer</title><company>Acme</company><locations>London, UK</locations>
+       <url>https://jobs.example/1</url><description>Django and Postgres</description></job>
+  <job><title>Data Engineer</title><company>Pythonic Ltd</company><locations>Manchester, England</locations>
+       <url>https://jobs.example/2</url><description>Spark pipelines in Python</description></job>
+  <job><title>Chef</title><company>Bistro</company><locations>Paris, France</locations>
+       <url>https://jobs.example/3</url><description>French cuisine</description></job>
+</jobs>
+"""
+
+
+def _jsonl(path, *postings):
+    with gzip.open(path, 'wt') as f:
+        for p in postings:
+            f.write(json.dumps(p) + '\n')
+    return str(path)
+
+
+def test_normalise_location_expands_aliases():
+    assert normalise_location('London, UK') == 'london united kingdom'
+    assert normalise_location('  New York / USA ') == 'new york united states'
+
+
+def test_xml_feed_is_searchable_with_ranking_and_location(tmp_path):
+    feed = tmp_path / 'feed.xml'
+    feed.write_text(XML_FEED)
+    index = JobIndex(str(tmp_path / 'index.db'))
+
+    stats = index.ingest_file(str(feed), now=1000)
+    assert (stats.seen, stats.inserted) == (3, 3)
+
+    result = index.search('python', '', now=1000)
+    assert [j.title for j in result.jobs] == ['Senior Python Developer', 'Data Engineer']  # title beats description
+    assert [j.title for j in index.search('pyth', 'united kingdom', now=1000).jobs][0] == 'Senior Python Developer'
+    assert [j.title for j in index.search('python', 'London, GB', now=1000).jobs] == ['Senior Python Developer']
+    assert index.search('"); DROP TABLE postings; --', '', now=1000).total == 0
+    # LIKE wildcards in the location are literal
+    assert index.search('python', 'l_ndon', now=1000).total == 0
+
+
+def test_ingest_is_incremental_and_expires_old_postings(tmp_path):
+    index = JobIndex(str(tmp_path / 'index.db'), max_age_days=1)
+    first = _jsonl(tmp_path / 'a.jsonl.gz',
+                   {'title': 'Nurse', 'company': 'NHS', 'locations': 'Leeds', 'url': 'https://j/1'},
+                   {'title': 'Welder', 'company': 'Forge', 'locations': 'Leeds', 'url': 'https://j/2'})
+    index.ingest_file(first, now=0)
+
+    second = _jsonl(tmp_path / 'b.jsonl.gz',
+                    {'title': 'Nurse', 'company': 'NHS', 'locations': 'Leeds', 'url': 'https://j/1'},
+                    {'title': 'Head Welder', 'company': 'Forge', 'locations': 'Leeds', 'url': 'https://j/2'},
+                    {'title': 'Baker', 'company': 'Crumbs', 'locations': 'York', 'url': 'https://j/3'})
+    stats = index.ingest_file(second, now=50000)
+
+    assert (stats.inserted, stats.updated, stats.unchanged) == (1, 1, 1)
+    assert [j.title for j in index.search('welder', 'leeds', now=50000).jobs] == ['Head Welder']
+    assert [p['title'] for p in iter_feed(second)] == ['Nurse', 'Head Welder', 'Baker']
+
+    assert index.expire(now=86400 + 1) == 0
+    index.ingest_file(_jsonl(tmp_path / 'c.jsonl.gz',
+                             {'title': 'Baker', 'company': 'Crumbs', 'locations': 'York', 'url': 'https://j/3'}),
+                      now=100000)
+    assert index.expire(now=50000 + 86400 + 1) == 2
+    assert index.count() == 1 and index.search('nurse', '', now=100000).total == 0
+
+
+def test_ingest_command_and_local_provider(tmp_path):
+    feed = tmp_path / 'feed.xml'
+    feed.write_text(XML_FEED)
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'JOBS_PROVIDER': 'local', 'JOBS_INDEX_PATH': str(tmp_path / 'index.db')})
+
+    out = app.test_cli_runner().invoke(args=['ingest-jobs', str(feed)])
+    assert out.exit_code == 0, out.output
+    assert '3 new' in out.output
+
+    resp = app.test_client().get('/job-search?keywords=chef&location=paris')
+    assert b'Chef' in resp.data and b'Bistro' in resp.data
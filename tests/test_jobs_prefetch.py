@@ -0,0 +1,53 @@
+from app import create_app
+from app.jobs.prefetch import PrefetchLimiter, TokenBucket
+
+
+def _payload(api, title, pages=3):
+    return dict(api.jobs_payload(title), pages=pages)
+
+
+def test_token_bucket_refills_at_rate():
+    now = [0.0]
+    bucket = TokenBucket(rate=1, capacity=2, clock=lambda: now[0])
+    assert bucket.take() and bucket.take() and not bucket.take()
+    now[0] = 1.5
+    assert bucket.take() and not bucket.take()
+
+
+def test_limiter_bounds_each_user_and_provider():
+    now = [0.0]
+    limiter = PrefetchLimiter(user_rate_per_minute=2, provider_rate=1, provider_burst=3, clock=lambda: now[0])
+
+    assert [limiter.allow('ip:a', 'careerjet') for _ in range(3)] == [True, True, False]
+    assert limiter.allow('ip:b', 'careerjet')
+    assert not limiter.allow('ip:c', 'careerjet')  # provider bucket is empty now
+    assert limiter.stats == {'scheduled': 3, 'throttled_user': 1, 'throttled_provider': 1}
+
+
+def test_next_page_is_prefetched_into_cache(fake_jobs_api):
+    fake_jobs_api.respond(200, _payload(fake_jobs_api, 'Page One'))
+    fake_jobs_api.respond(200, _payload(fake_jobs_api, 'Page Two'))
+    fake_jobs_api.default = (200, _payload(fake_jobs_api, 'Later Page'), 0)
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'JOBS_PROVIDER': 'careerjet', 'CAREERJET_API_URL': fake_jobs_api.url})
+    client = app.test_client()
+    cache = app.extensions['jobs_cache']
+
+    assert b'Page One' in client.get('/job-search?keywords=go&location=paris').data
+    cache._executor.shutdown(wait=True)
+    cache._executor = None
+    assert [r['page'] for r in fake_jobs_api.requests] == [['1'], ['2']]
+
+    assert b'Page Two' in client.get('/job-search?keywords=go&location=paris&page=2').data
+    assert cache.metrics()['hits'] == 1 and cache.metrics()['prefetches'] == 2
+
+
+def test_last_page_is_not_prefetched(fake_jobs_api):
+    fake_jobs_api.default = (200, _payload(fake_jobs_api, 'Only Page', pages=1), 0)
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'JOBS_PROVIDER': 'careerjet', 'CAREERJET_API_URL': fake_jobs_api.url})
+
+    app.test_client().get('/job-search?keywords=go&location=paris')
+
+    assert len(fake_jobs_api.requests) == 1
+    assert app.extensions['jobs_cache'].metrics()['prefetches'] == 0
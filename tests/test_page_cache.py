@@ -0,0 +1,115 @@
+import pytest
+
+from app.page_cache import LRUBackend, FileSystemBackend, RedisBackend, LocalRedis
+
+
+def test_anonymous_page_served_from_cache(client):
+    first = client.get('/terms')
+    assert first.status_code == 200
+    assert first.headers['X-Page-Cache'] == 'MISS'
+
+    second = client.get('/terms')
+    assert second.headers['X-Page-Cache'] == 'HIT'
+    assert second.data == first.data
+
+
+def test_logged_in_users_bypass_cache(client):
+    from flask_login import current_user
+    from app.page_cache import cached_page
+
+    client.application.add_url_rule('/cache-probe', 'cache_probe',
+                                    cached_page()(lambda: f'hello {current_user.is_authenticated}'))
+    assert client.get('/cache-probe').headers['X-Page-Cache'] == 'MISS'
+
+    with client.application.app_context():
+        from models import db, User
+        admin = db.session.query(User).filter_by(email='admin@example.com').first()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(admin.id)
+
+    resp = client.get('/cache-probe')
+    assert resp.data == b'hello True'
+    assert 'X-Page-Cache' not in resp.headers
+
+
+def test_pages_that_write_the_session_are_not_cached(client):
+    from flask import session
+    from app.page_cache import cached_page
+
+    def touches_session():
+        session['seen_banner'] = True
+        return 'hello'
+
+    client.application.add_url_rule('/session-probe', 'session_probe', cached_page()(touches_session))
+    first = client.get('/session-probe')
+    assert 'session=' in first.headers.get('Set-Cookie', '')
+    client.delete_cookie('session')
+    assert client.get('/session-probe').headers['X-Page-Cache'] == 'MISS'
+
+
+def test_cached_pages_vary_on_cookie(client):
+    client.get('/terms')
+    hit = client.get('/terms')
+    assert hit.headers['X-Page-Cache'] == 'HIT' and 'Cookie' in hit.headers['Vary']
+
+
+def test_template_change_invalidates(client, monkeypatch):
+    import app.page_cache as pc
+
+    client.get('/faq')
+    assert client.get('/faq').headers['X-Page-Cache'] == 'HIT'
+
+    # Simulate a deploy / template edit by changing the version inputs
+    monkeypatch.setattr(pc, 'template_fingerprint', lambda app: 'changed')
+    client.application.extensions['page_cache']._version = None
+    assert client.get('/faq').headers['X-Page-Cache'] == 'MISS'
+
+
+def test_query_string_is_not_part_of_the_key(client):
+    client.get('/terms')
+    assert client.get('/terms?x=1').headers['X-Page-Cache'] == 'HIT'
+    assert client.get('/terms?x=2').headers['X-Page-Cache'] == 'HIT'
+
+
+def test_filesystem_backend_is_bounded(tmp_path):
+    backend = FileSystemBackend(str(tmp_path / 'pages'), max_entries=2)
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    backend.get('a')
+    backend.set('c', 3, 60)
+    assert backend.get('b') is None
+    assert backend.get('a') == 1 and backend.get('c') == 3
+
+
+def test_new_version_sweeps_old_files(tmp_path):
+    backend = FileSystemBackend(str(tmp_path / 'pages'))
+    backend.use_version('v1')
+    backend.set('v1:anon:/terms?', 'old', 60)
+    backend.use_version('v2')
+    backend.set('v2:anon:/terms?', 'new', 60)
+    assert len(list((tmp_path / 'pages').iterdir())) == 1
+    backend.use_version('v1')
+    assert backend.get('v1:anon:/terms?') is None
+
+
+def test_lru_backend_evicts_oldest():
+    backend = LRUBackend(max_entries=2)
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    backend.get('a')
+    backend.set('c', 3, 60)
+    assert backend.get('b') is None
+    assert backend.get('a') == 1 and backend.get('c') == 3
+
+
+@pytest.mark.parametrize('make_backend', [
+    lambda tmp: FileSystemBackend(str(tmp / 'pages')),
+    lambda tmp: RedisBackend(LocalRedis()),
+])
+def test_shared_backends_roundtrip(tmp_path, make_backend):
+    backend = make_backend(tmp_path)
+    entry = (b'<html></html>', 200, [('Content-Type', 'text/html')])
+    backend.set('k', entry, 60)
+    assert backend.get('k') == entry
+    backend.delete('k')
+    assert backend.get('k') is None
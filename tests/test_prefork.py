@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from app import create_app, images, prefork
+
+
+@pytest.fixture
+def app(tmp_path):
+    return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "p.db"}',
+                       'TEMPLATES_AUTO_RELOAD': False, 'TEMPLATE_BYTECODE_CACHE_DIR': None})
+
+
+def test_warm_up_compiles_templates_once(app):
+    assert prefork.warm_up(app) > 0
+    assert any(name == 'terms.html' for _, name in app.jinja_env.cache.keys())
+    assert prefork.warm_up(app) == 0
+
+
+def test_after_fork_resets_connections_and_pools(app):
+    from models import db
+    with app.app_context():
+        db.session.execute(db.text('select 1'))
+        pool = db.engine.pool
+    images._get_executor()
+
+    assert prefork.run_after_fork(app) >= 3
+    with app.app_context():
+        assert db.engine.pool is not pool
+    assert images._executor is None
+
+
+def test_failing_hook_does_not_stop_others(app):
+    calls = []
+    prefork.on_after_fork(app, lambda app: 1 / 0)
+    prefork.on_after_fork(app, lambda app: calls.append('ran'))
+    prefork.run_after_fork(app)
+    assert calls == ['ran']
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/smaps_rollup'), reason='needs Linux smaps_rollup')
+def test_memory_report():
+    report = prefork.memory_report()
+    assert report['rss_mb'] > 0 and report['pss_mb'] > 0
+    assert 'pss' in prefork.format_memory(report)
+
+
+def test_warm_up_builds_the_residency_catalog(app):
+    from app.residencies.models import ResidencyProgram
+    from models import db
+    with app.app_context():
+        db.create_all()
+        db.session.add(ResidencyProgram(country='Testland', program_name='Golden', investment_currency='USD',
+                                        investment_min_amount=250000))
+        db.session.commit()
+    service = app.extensions['residency_catalog']
+    service._catalog = None
+
+    prefork.warm_up(app)
+    assert len(service._catalog) == 1 and 'similar' in service._catalog.indexes
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+from flask import render_template_string
+from sqlalchemy import text
+
+from app import create_app, profiler
+from models import db, User
+
+
+def _slow_view():
+    db.session.execute(text('SELECT 1'))
+    db.session.execute(text('SELECT 2'))
+    time.sleep(0.03)
+    return render_template_string('{% for i in range(3) %}{{ i }}{% endfor %}')
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'profiler.db'}",
+                      'PROFILER_SAMPLE_RATE': 1.0, 'PROFILER_STORE_PATH': str(tmp_path / 'profiles.db'),
+                      'PROFILER_INTERVAL': 0.002})
+    app.add_url_rule('/slow', 'slow', _slow_view)
+    with app.app_context():
+        db.create_all()
+        admin = User(name='Admin', email='admin@example.com')
+        admin.set_password('password')
+        admin.is_admin = True
+        db.session.add(admin)
+        db.session.commit()
+    return app
+
+
+def _admin_client(app):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = '1'
+    return client
+
+
+def test_disabled_installs_nothing():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    assert 'profiler' not in app.extensions
+    assert not isinstance(app.wsgi_app, profiler.ProfilerMiddleware)
+
+
+def test_sample_records_sql_templates_and_stacks(app):
+    assert app.test_client().get('/slow').status_code == 200
+    store = app.extensions['profiler'].store
+    [row] = store.slowest_endpoints()
+    assert row['endpoint'] == 'slow' and row['samples'] == 1
+    sample = store.get(row['slowest_sample'])
+    assert sample['status'] == 200 and sample['latency_ms'] >= 30
+    assert sample['sql_count'] == 2 and sample['sql_ms'] > 0
+    assert sample['template_ms'] > 0
+    assert any('_slow_view' in stack for stack in sample['folded'])
+
+
+def test_cprofile_mode_builds_stacks(app):
+    app.extensions['profiler'].mode = 'cprofile'
+    app.test_client().get('/slow')
+    store = app.extensions['profiler'].store
+    sample = store.get(store.slowest_endpoints()[0]['slowest_sample'])
+    assert sample['mode'] == 'cprofile'
+    sleeping = [stack for stack in sample['folded'] if stack.endswith('time.sleep>')]
+    assert sleeping and all('_slow_view' in stack for stack in sleeping)
+    assert sum(sample['folded'][s] for s in sleeping) >= 25000
+
+
+def test_sampler_follows_a_switched_out_greenlet():
+    greenlet = pytest.importorskip('greenlet')
+
+    def parked_request():
+        greenlet.getcurrent().parent.switch()  # as when a gevent request waits on I/O
+
+    request_greenlet = greenlet.greenlet(parked_request)
+    request_greenlet.switch()
+    sampler = profiler.StackSampler(threading.get_ident(), 0.002, greenlet=request_greenlet)
+    time.sleep(0.05)  # this thread runs other code meanwhile
+    folded = sampler.stop()
+    request_greenlet.switch()
+
+    assert folded and all(stack.endswith('parked_request (test_profiler.py:{})'.format(
+        parked_request.__code__.co_firstlineno)) for stack in folded)
+
+
+def test_stopping_the_sampler_is_immediate():
+    sampler = profiler.StackSampler(threading.get_ident(), interval=1.0)
+    started = time.perf_counter()
+    sampler.stop()
+    assert time.perf_counter() - started < 0.1
+
+
+def test_unsampled_requests_are_not_stored(app):
+    app.extensions['profiler'].chance = lambda: 0.99
+    app.extensions['profiler'].rate = 0.5
+    app.test_client().get('/slow')
+    assert app.extensions['profiler'].store.slowest_endpoints() == []
+
+
+def test_store_keeps_newest_samples(tmp_path):
+    store = profiler.ProfileStore(str(tmp_path / 'p.db'), max_samples=3)
+    for ms in range(5):
+        store.add(profiler.Sample('GET', '/x', endpoint='x', latency_ms=float(ms)))
+    [row] = store.slowest_endpoints()
+    assert row['samples'] == 3 and row['ms_max'] == 4.0 and row['ms_p50'] == 3.0
+
+
+def test_admin_views(app):
+    app.test_client().get('/slow')
+    client = _admin_client(app)
+    listing = client.get('/admin/profiles').get_json()
+    assert listing['enabled'] and listing['endpoints'][0]['endpoint'] == 'slow'
+    sample_id = listing['endpoints'][0]['slowest_sample']
+    assert client.get(f'/admin/profiles/{sample_id}').get_json()['endpoint'] == 'slow'
+    folded = client.get(f'/admin/profiles/{sample_id}?format=folded').get_data(as_text=True)
+    assert '_slow_view' in folded and folded.splitlines()[0].rsplit(' ', 1)[1].isdigit()
+    assert '_slow_view' in client.get('/admin/profiles/flame?endpoint=slow').get_data(as_text=True)
+    assert client.get('/admin/profiles/999').status_code == 404
+    assert app.test_client().get('/admin/profiles').status_code in (302, 401)
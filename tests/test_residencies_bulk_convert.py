@@ -0,0 +1,42 @@
+import pytest
+
+from app import create_app
+from app.residencies import rates as rates_module
+from app.residencies.rates import DEFAULT_RATES, RateTable
+
+
+@pytest.fixture
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    return app.test_client()
+
+
+def test_convert_many_matches_single_conversions(monkeypatch):
+    table = RateTable(DEFAULT_RATES)
+    amounts, sources, targets = [100.0, 2500.0, 0.0, 42.0], ['USD', 'EUR', 'GBP', 'AED'], ['EUR', 'GBP', 'USD', 'CHF']
+    expected = [table.convert(a, f, t) for a, f, t in zip(amounts, sources, targets)]
+
+    converted, rates = table.convert_many(amounts, sources, targets)
+    assert converted == pytest.approx(expected)
+
+    monkeypatch.setattr(rates_module, 'np', None)  # pure-Python fallback gives the same answers
+    assert RateTable(DEFAULT_RATES).convert_many(amounts, sources, targets)[0] == pytest.approx(expected)
+
+
+def test_bulk_endpoint_broadcasts_single_codes(client):
+    resp = client.post('/residencies/api/currencies/convert-bulk',
+                       json={'amounts': [1000, 920], 'from_currency': ['USD', 'EUR'], 'to_currency': 'eur'})
+
+    data = resp.get_json()['data']
+    assert resp.status_code == 200
+    assert data['converted_amounts'] == [920.0, 920.0]
+    assert data['to_currencies'] == ['EUR', 'EUR'] and data['rate_version']
+
+
+def test_bulk_endpoint_rejects_mismatched_lengths(client):
+    resp = client.post('/residencies/api/currencies/convert-bulk',
+                       json={'amounts': [1, 2, 3], 'from_currency': ['USD', 'EUR']})
+    assert resp.status_code == 400
+    assert 'one code per amount' in resp.get_json()['message']
+
+    assert client.post('/residencies/api/currencies/convert-bulk', json={'amounts': [-5]}).status_code == 400
@@ -0,0 +1,88 @@
+import pytest
+
+from app import create_app
+from app.residencies.catalog import Catalog
+from app.residencies.comparison import compare
+from app.residencies.models import ResidencyProgram
+from models import db
+
+
+def _program(name, low, months, family, interview, documents):
+    return ResidencyProgram(country='Testland', program_name=name, investment_currency='USD',
+                            investment_min_amount=low, processing_time_months=months,
+                            family_size_limit=family, interview_required=interview,
+                            documents_required=['doc'] * documents)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'compare.db'}",
+                      'RESIDENCY_COMPARE_MAX': 3})
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([_program('Cheap', 100000, 12, 4, True, 5),
+                            _program('Fast', 500000, 2, None, False, 3),
+                            _program('Middle', 300000, 6, 4, False, 3)])
+        db.session.commit()
+    return app
+
+
+def test_scores_are_normalised_with_one_best():
+    catalog = Catalog([
+        {'id': 1, 'investment_min_usd': 100.0, 'processing_time_months': 10, 'family_size_limit': 2},
+        {'id': 2, 'investment_min_usd': 300.0, 'processing_time_months': None, 'family_size_limit': None},
+    ])
+    assert catalog.score_row(0) == [1.0, 1.0, 0.0, 1.0, 1.0]
+    # No family limit is the best there is; unknown processing time scores nothing
+    assert catalog.score_row(1) == [0.0, None, 1.0, 1.0, 1.0]
+
+
+def test_compare_aligns_rows_and_marks_best(app):
+    client = app.test_client()
+    with app.app_context():
+        ids = {p.program_name: p.id for p in ResidencyProgram.query.all()}
+
+    resp = client.get(f"/residencies/api/compare?programs={ids['Fast']},{ids['Cheap']}&programs=999")
+    data = resp.get_json()['data']
+    assert resp.status_code == 200
+    assert [p['program_name'] for p in data['programs']] == ['Fast', 'Cheap']
+    assert data['values'][1] == [100000.0, 12, 4, 1, 5]
+    assert data['best']['investment_usd'] == [ids['Cheap']]
+    assert data['best']['processing_months'] == [ids['Fast']]
+    assert data['best']['family_limit'] == [ids['Fast']]
+    assert data['missing'] == [999]
+
+
+def test_compare_ties_and_limits(app):
+    client = app.test_client()
+    with app.app_context():
+        ids = {p.program_name: p.id for p in ResidencyProgram.query.all()}
+
+    data = client.get(f"/residencies/api/compare?programs={ids['Fast']},{ids['Middle']}").get_json()['data']
+    assert data['best']['documents'] == [] and data['best']['interview'] == []
+    assert client.get('/residencies/api/compare?programs=1,2,3,4').status_code == 400
+    assert client.get('/residencies/api/compare?programs=x').status_code == 400
+
+
+def test_catalog_rebuilt_after_commit(app):
+    service = app.extensions['residency_catalog']
+    with app.app_context():
+        before = service.current()
+        assert service.current() is before
+        program = ResidencyProgram.query.filter_by(program_name='Middle').one()
+        program.processing_time_months = 1
+        db.session.commit()
+        after = service.current()
+        assert after is not before and after.version != before.version
+        assert compare(after, [program.id])['values'][0][1] == 1
+
+
+def test_compare_page_wires_the_currency_selector_once(app):
+    client = app.test_client()
+    with app.app_context():
+        ids = {p.program_name: p.id for p in ResidencyProgram.query.all()}
+    for names in (['Fast', 'Middle'], ['Cheap', 'Fast', 'Middle']):
+        query = '&'.join(f'programs={ids[name]}' for name in names)
+        html = client.get(f'/residencies/compare?{query}').get_data(as_text=True)
+        assert html.count('convert-bulk') == 1
+        assert html.count('interview-badge-no">No') == 2
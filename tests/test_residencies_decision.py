@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from app import create_app
+from app.residencies.catalog import get_catalog
+from app.residencies.eligibility import eligibility_checker
+from app.residencies.models import ResidencyProgram
+from app.residencies.rates import current_rates
+from app.residencies.schemas import EligibilityCheckRequest
+from models import db
+
+COUNTRIES = ['Portugal', 'Greece', 'UAE', 'Canada']
+TYPES = ['investor', 'startup', 'retired', None]
+
+
+@pytest.fixture
+def app(tmp_path):
+    rng = random.Random(7)
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'decision.db'}",
+                      'RESIDENCY_ELIGIBILITY_CACHE_SIZE': 0})
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([ResidencyProgram(
+            country=rng.choice(COUNTRIES), program_name=f'Program {i}',
+            investment_currency=rng.choice(['USD', 'EUR', 'GBP']),
+            investment_min_amount=rng.choice([None, 0] + [50000 * k for k in range(1, 30)]),
+            net_worth_required=rng.choice([None] + [250000 * k for k in range(1, 12)]),
+            family_size_limit=rng.choice([None, 1, 2, 4, 6]),
+            program_type=rng.choice(TYPES),
+        ) for i in range(300)])
+        db.session.commit()
+    return app
+
+
+def _request(rng):
+    return EligibilityCheckRequest(
+        investment_budget=round(rng.uniform(1000, 1600000), 2),
+        net_worth=rng.choice([0, 250000, rng.uniform(0, 3000000)]),
+        family_size=rng.randint(1, 7),
+        country_preference=rng.choice(COUNTRIES + [None, None]),
+        program_type_preference=rng.choice(['investor', 'startup', 'retired', None]),
+    )
+
+
+def test_index_matches_full_scan(app):
+    rng = random.Random(11)
+    with app.app_context():
+        index = get_catalog().indexes['decision']
+        rates = current_rates()
+        for _ in range(300):
+            request = _request(rng)
+            top = index.top(request.investment_budget, request.net_worth, request.family_size,
+                            program_type=request.program_type_preference.value if request.program_type_preference else None,
+                            country=request.country_preference, rates_version=rates.version)
+            programs, score = eligibility_checker._scan_matches(request, rates)
+            assert top is not None
+            assert [p['id'] for p, _ in top] == [p.id for p in programs]
+            assert (sum(s for _, s in top) / len(top) if top else 0) == score
+        assert index.stats['slice_hits'] > 0
+
+
+def test_budget_on_threshold_falls_back(app):
+    with app.app_context():
+        index = get_catalog().indexes['decision']
+        assert index.top(100000.4, 0, 1) is None
+        assert index.stats['fallbacks'] == 1
+        # The checker still answers, through the full scan
+        response = eligibility_checker.check_eligibility(EligibilityCheckRequest(investment_budget=100000.4, net_worth=0))
+        assert response.matching_programs
+
+
+def test_checker_uses_index(app):
+    with app.app_context():
+        index = get_catalog().indexes['decision']
+        eligibility_checker.check_eligibility(EligibilityCheckRequest(investment_budget=123456, net_worth=10))
+        eligibility_checker.check_eligibility(EligibilityCheckRequest(investment_budget=123999, net_worth=20))
+        assert index.stats['slices_built'] == 1 and index.stats['slice_hits'] == 1
@@ -0,0 +1,88 @@
+import pytest
+
+from app import create_app
+from app.residencies.eligibility import eligibility_checker
+from app.residencies.eligibility_cache import EligibilityCache
+from app.residencies.models import ResidencyProgram
+from app.residencies.schemas import EligibilityCheckRequest
+from models import db
+
+
+def _app(tmp_path, **config):
+    app = create_app(dict({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'elig.db'}"}, **config))
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            ResidencyProgram(country='Portugal', program_name='Golden Visa', investment_currency='EUR',
+                             investment_min_amount=450000, net_worth_required=1000000, family_size_limit=4),
+            ResidencyProgram(country='UAE', program_name='Startup Visa', investment_currency='USD',
+                             investment_min_amount=100000, program_type='startup'),
+        ])
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    return _app(tmp_path)
+
+
+def _check(budget, net_worth=500000, family_size=2, **kwargs):
+    request = EligibilityCheckRequest(investment_budget=budget, net_worth=net_worth, family_size=family_size, **kwargs)
+    return eligibility_checker.check_eligibility(request)
+
+
+def _answer(response):
+    return [p.program_name for p in response.matching_programs], response.eligibility_score
+
+
+def test_near_identical_profiles_hit_cache(app):
+    cache = app.extensions['residency_eligibility_cache']
+    with app.app_context():
+        first = _check(200000)
+        second = _check(201000, net_worth=600000)
+        # Crossing the Golden Visa minimum (EUR 450k ~ $489k) changes the answer
+        richer = _check(600000)
+    assert _answer(first) == _answer(second)
+    assert first.request_id != second.request_id
+    assert _answer(richer) != _answer(first)
+    assert cache.metrics()['hits'] == 1 and cache.metrics()['misses'] == 2
+
+
+def test_cached_answers_match_full_check(app, tmp_path):
+    profiles = [(150000, 0, 1), (150500, 2000000, 1), (500000, 2000000, 5), (520000, 2000000, 3), (100000, 0, 1)]
+    with app.app_context():
+        cached = [_answer(_check(*p)) for p in profiles + profiles]
+    (tmp_path / 'nocache').mkdir()
+    uncached_app = _app(tmp_path / 'nocache', RESIDENCY_ELIGIBILITY_CACHE_SIZE=0)
+    assert 'residency_eligibility_cache' not in uncached_app.extensions
+    with uncached_app.app_context():
+        uncached = [_answer(_check(*p)) for p in profiles + profiles]
+    assert cached == uncached
+
+
+def test_budget_on_threshold_bypasses_cache(app):
+    cache = app.extensions['residency_eligibility_cache']
+    with app.app_context():
+        _check(100000)
+    assert cache.metrics()['bypassed'] == 1 and cache.metrics()['size'] == 0
+
+
+def test_program_change_invalidates(app):
+    with app.app_context():
+        assert _answer(_check(200000, program_type_preference='startup'))[1] == 65.0
+        program = ResidencyProgram.query.filter_by(program_name='Startup Visa').one()
+        program.investment_min_amount = 300000
+        program.family_size_limit = 1
+        db.session.commit()
+        assert _answer(_check(200000, program_type_preference='startup'))[1] == 30.0
+
+
+def test_lru_evicts_oldest():
+    cache = EligibilityCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1
+    assert cache.metrics()['evictions'] == 1
@@ -0,0 +1,75 @@
+import json
+import time
+
+import pytest
+
+from app import create_app
+from app.residencies.rates import DEFAULT_RATES, FileRateSource, HttpRateSource, RateService, RateTable, StaticRateSource
+from app.jobs.client import HttpClient
+from models import db
+
+
+def test_rate_table_cross_rates_match_usd_legs():
+    table = RateTable(DEFAULT_RATES)
+    assert table.rate('USD', 'EUR') == pytest.approx(0.92)
+    assert table.rate('GBP', 'EUR') == pytest.approx(0.92 / 0.79)
+    assert table.rate('EUR', 'GBP') * table.rate('GBP', 'EUR') == pytest.approx(1.0)
+    assert table.convert(100, 'XXX', 'USD') == 100  # unknown currencies count as USD
+    assert table.version == RateTable(dict(DEFAULT_RATES)).version
+    assert table.version != RateTable(dict(DEFAULT_RATES, EUR=0.95)).version
+
+
+def test_file_source_rebases_to_usd(tmp_path):
+    path = tmp_path / 'rates.json'
+    path.write_text(json.dumps({'base': 'EUR', 'rates': {'USD': 1.25, 'GBP': 0.85}}))
+
+    rates = FileRateSource(str(path)).fetch()
+
+    assert rates['USD'] == 1.0 and rates['EUR'] == pytest.approx(0.8) and rates['GBP'] == pytest.approx(0.68)
+
+
+def test_http_source_and_failed_refresh_keeps_last_table(fake_jobs_api):
+    fake_jobs_api.respond(200, {'base': 'USD', 'rates': {'EUR': 0.9, 'JPY': 150.0}})
+    fake_jobs_api.default = (503, {}, 0)
+    source = HttpRateSource(fake_jobs_api.url, HttpClient(retries=0))
+    service = RateService(source, refresh_seconds=0.01)
+    changes = []
+    service.on_change(changes.append)
+
+    first = service.current()
+    assert first.rate('USD', 'JPY') == 150.0
+    time.sleep(0.02)
+    assert service.current() is first  # refresh starts in the background
+    for _ in range(50):
+        if not service._refreshing:
+            break
+        time.sleep(0.01)
+    assert service.current().version == first.version and changes == [first]
+
+
+def test_reload_with_new_rates_notifies_listeners():
+    source = StaticRateSource()
+    service = RateService(source, refresh_seconds=0)
+    seen = []
+    service.on_change(lambda table: seen.append(table.version))
+    service.load()
+    service.load()
+    source.rates['EUR'] = 0.95
+    service.load()
+    assert len(seen) == 2
+
+
+def test_eligibility_reports_rate_version(tmp_path):
+    path = tmp_path / 'rates.json'
+    path.write_text(json.dumps({'rates': {'EUR': 0.5}}))
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'RESIDENCY_RATES_SOURCE': 'file', 'RESIDENCY_RATES_FILE': str(path)})
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    rates = client.get('/residencies/api/currencies/rates').get_json()
+    result = client.post('/residencies/api/eligibility', json={'investment_budget': 100000, 'net_worth': 1}).get_json()
+
+    assert rates['rates']['EUR'] == 0.5
+    assert result['rate_version'] == rates['version'] == app.extensions['residency_rates'].current().version
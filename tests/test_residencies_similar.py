@@ -0,0 +1,57 @@
+import pytest
+
+from app import create_app
+from app.residencies import similarity
+from app.residencies.catalog import Catalog
+from app.residencies.models import ResidencyProgram
+from models import db
+
+
+PROGRAMS = [
+    dict(id=1, country='Portugal', program_name='Golden Visa', investment_min_usd=500000.0, processing_time_months=6,
+         family_size_limit=None, benefits='Schengen travel, path to citizenship', documents_required=['Passport']),
+    dict(id=2, country='Greece', program_name='Golden Visa GR', investment_min_usd=450000.0, processing_time_months=5,
+         family_size_limit=None, benefits='Schengen travel and family residence', documents_required=['Passport']),
+    dict(id=3, country='Portugal', program_name='Digital Nomad', investment_min_usd=None, processing_time_months=2,
+         family_size_limit=2, benefits='Remote work income permit', documents_required=['Contract', 'Payslips']),
+    dict(id=4, country='UAE', program_name='Startup Visa', investment_min_usd=50000.0, processing_time_months=1,
+         family_size_limit=3, interview_required=True, benefits='Business licence, tax free',
+         documents_required=['Business plan']),
+]
+
+
+def test_neighbours_combine_features_and_text():
+    index = similarity.SimilarityIndex(Catalog(PROGRAMS), k=2)
+    # Greece shares the budget, timeline and Schengen benefits; country alone does not win
+    assert index.similar(1)[0] == 2
+    assert index.similar(2)[0] == 1
+    assert len(index.similar(3)) == 2 and 3 not in index.similar(3)
+
+
+def test_python_fallback_matches_numpy(monkeypatch):
+    expected = similarity.SimilarityIndex(Catalog(PROGRAMS), k=3).neighbours
+    monkeypatch.setattr(similarity, 'np', None)
+    assert similarity.SimilarityIndex(Catalog(PROGRAMS), k=3).neighbours == expected
+
+
+def test_similar_api_reads_catalog_index(tmp_path):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'similar.db'}"})
+    with app.app_context():
+        db.create_all()
+        for p in PROGRAMS:
+            fields = {k: v for k, v in p.items() if k not in ('id', 'investment_min_usd')}
+            db.session.add(ResidencyProgram(investment_min_amount=p['investment_min_usd'], **fields))
+        db.session.commit()
+
+    resp = app.test_client().get('/residencies/api/programs/1/similar?limit=2')
+    assert resp.status_code == 200
+    assert [p['program_name'] for p in resp.get_json()['data']][0] == 'Golden Visa GR'
+    with app.app_context():
+        assert 'similar' in app.extensions['residency_catalog'].current().indexes
+    assert app.test_client().get('/residencies/api/programs/99/similar').status_code == 404
+
+
+def test_large_catalog_falls_back_to_country():
+    catalog = Catalog(PROGRAMS)
+    catalog.indexes['similar'] = similarity.SimilarityIndex(catalog, k=2, max_programs=3)
+    assert [p['id'] for p in similarity.similar_programs(catalog, 1)] == [3]
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.residencies.models import ResidencyProgram
+from models import db
+
+
+def _program(name, currency, low, high=None):
+    return ResidencyProgram(country='Testland', program_name=name, investment_currency=currency,
+                            investment_min_amount=low, investment_max_amount=high)
+
+
+@pytest.fixture
+def app(tmp_path):
+    rates = tmp_path / 'rates.json'
+    rates.write_text(json.dumps({'rates': {'EUR': 0.9, 'GBP': 0.8}}))
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'usd.db'}",
+                      'RESIDENCY_RATES_SOURCE': 'file', 'RESIDENCY_RATES_FILE': str(rates),
+                      'RESIDENCY_RATES_REFRESH': 0})
+    app.config['RATES_PATH'] = rates
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([_program('Euro Visa', 'EUR', 450000, 900000),
+                            _program('Pound Visa', 'GBP', 400000, 2000000),
+                            _program('Dollar Visa', 'USD', 800000, 1000000)])
+        db.session.commit()
+    return app
+
+
+def test_usd_columns_filled_on_insert(app):
+    with app.app_context():
+        euro = ResidencyProgram.query.filter_by(program_name='Euro Visa').one()
+        assert euro.investment_min_usd == 500000.0 and euro.investment_max_usd == 1000000.0
+        assert euro.usd_rate_version == app.extensions['residency_rates'].current().version
+
+
+def test_range_filter_compares_in_usd(app):
+    client = app.test_client()
+
+    names = lambda resp: [p['program_name'] for p in resp.get_json()['data']]
+    # €450k is $500k and £400k is $500k; a raw-amount filter would have dropped both
+    assert names(client.get('/residencies/api/programs?min_investment=500000&sort=investment')) == \
+        ['Euro Visa', 'Pound Visa', 'Dollar Visa']
+    assert names(client.get('/residencies/api/programs?max_investment=1000000&sort=-investment')) == \
+        ['Dollar Visa', 'Euro Visa']
+    assert names(client.get('/residencies/api/programs?min_investment=700000&currency=EUR')) == ['Dollar Visa']
+
+
+def test_range_filter_uses_index(app):
+    with app.app_context():
+        plan = db.session.execute(text(
+            'EXPLAIN QUERY PLAN SELECT id FROM residency_program WHERE investment_min_usd >= 100')).fetchall()
+    assert 'ix_residency_program_investment_min_usd' in ' '.join(str(row[-1]) for row in plan)
+
+
+def test_rate_change_renormalises_all_rows(app):
+    service = app.extensions['residency_rates']
+    with app.app_context():
+        service.current()
+        app.config['RATES_PATH'].write_text(json.dumps({'rates': {'EUR': 0.5, 'GBP': 0.8}}))
+        new = service.load()
+        db.session.expire_all()
+        euro = ResidencyProgram.query.filter_by(program_name='Euro Visa').one()
+        pound = ResidencyProgram.query.filter_by(program_name='Pound Visa').one()
+    assert euro.investment_min_usd == 900000.0 and euro.usd_rate_version == new.version
+    assert pound.investment_min_usd == 500000.0
+
+
+def test_failed_renormalisation_is_retried_and_not_trusted_meanwhile(app, monkeypatch):
+    from app.residencies import rates, usd_amounts
+    from app.residencies.catalog import get_catalog
+    from app.residencies.thresholds import thresholds_for
+
+    service = app.extensions['residency_rates']
+    recompute = usd_amounts.recompute_usd_amounts
+
+    def locked(table):
+        raise RuntimeError('database is locked')
+
+    with app.app_context():
+        service.current()
+        app.config['RATES_PATH'].write_text(json.dumps({'rates': {'EUR': 0.5, 'GBP': 0.8}}))
+        monkeypatch.setattr(usd_amounts, 'recompute_usd_amounts', locked)
+        new = service.load()
+        # Rows still carry the old rates: no bucketing, the decision index defers to the full check
+        stale = get_catalog()
+        assert stale.rates_version == new.version and not thresholds_for(stale).exact
+        assert stale.indexes['decision'].top(600000, 0, 1, rates_version=new.version) is None
+
+        monkeypatch.setattr(usd_amounts, 'recompute_usd_amounts', recompute)
+        monkeypatch.setattr(rates, 'LISTENER_RETRY_SECONDS', 0)
+        service.current()
+        fresh = get_catalog()
+    assert fresh is not stale and thresholds_for(fresh).exact
+    assert fresh.get(stale.programs[0]['id'])['usd_rate_version'] == new.version
@@ -0,0 +1,67 @@
+import pytest
+
+from app import create_app
+from app.residencies.eligibility import eligibility_checker
+from app.residencies.models import ResidencyProgram
+from app.residencies.schemas import EligibilityCheckRequest
+from models import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'whatif.db'}"})
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            ResidencyProgram(country='UAE', program_name='Startup', investment_min_amount=100000, family_size_limit=3),
+            ResidencyProgram(country='Portugal', program_name='Golden', investment_currency='EUR',
+                             investment_min_amount=450000, net_worth_required=500000),
+            ResidencyProgram(country='Portugal', program_name='Elite', investment_min_amount=1000000,
+                             net_worth_required=2000000, family_size_limit=2),
+            ResidencyProgram(country='Portugal', program_name='Nomad'),
+        ])
+        db.session.commit()
+    return app
+
+
+def _post(app, **profile):
+    resp = app.test_client().post('/residencies/api/eligibility/what-if', json=profile)
+    return resp.status_code, resp.get_json()
+
+
+def _names(step):
+    return [p['program_name'] for p in step['unlocks']]
+
+
+def test_unlock_curves(app):
+    status, body = _post(app, investment_budget=50000, net_worth=100000, family_size=4)
+    data = body['data']
+    assert status == 200 and data['programs_in_scope'] == 4
+    assert data['current'] == {'investment_fit_count': 1, 'net_worth_fit_count': 2, 'family_fit_count': 2}
+    assert [(round(s['budget_usd']), _names(s), s['fit_count']) for s in data['investment_curve']] == \
+        [(100000, ['Startup'], 2), (489130, ['Golden'], 3), (1000000, ['Elite'], 4)]
+    assert [(s['net_worth'], _names(s)) for s in data['net_worth_curve']] == \
+        [(500000, ['Golden']), (2000000, ['Elite'])]
+    assert [(s['family_size'], _names(s), s['fit_count']) for s in data['family_curve']] == \
+        [(3, ['Startup'], 3), (2, ['Elite'], 4)]
+
+
+def test_curve_agrees_with_eligibility_check(app):
+    _, body = _post(app, investment_budget=50000, net_worth=100000, family_size=1)
+    with app.app_context():
+        programs = ResidencyProgram.query.all()
+        for step in body['data']['investment_curve']:
+            request = EligibilityCheckRequest(investment_budget=step['budget_usd'] + 1, net_worth=0)
+            passing = [p for p in programs if eligibility_checker._check_investment_fit(p, request, [], [])]
+            assert len(passing) == step['fit_count']
+
+
+def test_country_scope_and_caps(app):
+    _, body = _post(app, investment_budget=50000, net_worth=100000, country_preference='Portugal',
+                    max_budget=600000, max_steps=1)
+    data = body['data']
+    assert data['programs_in_scope'] == 3
+    assert [_names(s) for s in data['investment_curve']] == [['Golden']]
+    assert data['truncated'] is True
+    assert _post(app, investment_budget=50000, net_worth=0, country_preference='Atlantis')[1]['data']['investment_curve'] == []
+    assert _post(app, investment_budget=-1, net_worth=0)[0] == 400
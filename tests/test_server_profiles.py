@@ -0,0 +1,91 @@
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _load_conf(monkeypatch, profile=None):
+    if profile:
+        monkeypatch.setenv('NEXORA_SERVER_PROFILE', profile)
+    else:
+        monkeypatch.delenv('NEXORA_SERVER_PROFILE', raising=False)
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(ROOT, 'gunicorn.conf.py'))
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+    return conf
+
+
+def test_gthread_is_default_profile(monkeypatch):
+    conf = _load_conf(monkeypatch)
+    assert conf.worker_class == 'gthread' and conf.threads > 1
+    assert conf.preload_app and conf.wsgi_app == 'run:app'
+
+
+def test_sync_and_asgi_profiles(monkeypatch):
+    sync = _load_conf(monkeypatch, 'sync')
+    assert sync.worker_class == 'sync' and sync.threads == 1
+    asgi = _load_conf(monkeypatch, 'asgi')
+    assert asgi.worker_class == 'uvicorn.workers.UvicornWorker' and asgi.wsgi_app == 'asgi:app'
+
+
+def test_unknown_profile_rejected(monkeypatch):
+    with pytest.raises(RuntimeError, match='NEXORA_SERVER_PROFILE'):
+        _load_conf(monkeypatch, 'fastest')
+
+
+def _asgi_get(app, path):
+    async def request():
+        sent = []
+        received = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            return received.pop()
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': [],
+                 'http_version': '1.1', 'server': ('testserver', 80), 'client': ('127.0.0.1', 1), 'root_path': ''}
+        await app(scope, receive, send)
+        return sent[0]['status']
+    return request()
+
+
+def test_asgi_app_serves_flask_app():
+    pytest.importorskip('asgiref')
+    import asgi
+
+    async def main():
+        return await asyncio.gather(*(_asgi_get(asgi.app, '/terms') for _ in range(4)))
+
+    assert asyncio.run(main()) == [200, 200, 200, 200]
+
+
+def test_asgi_adapter_runs_requests_concurrently():
+    pytest.importorskip('asgiref')
+    import threading
+    import asgi
+
+    # Each request waits for all four to arrive; run one at a time, the barrier breaks
+    barrier = threading.Barrier(4, timeout=5)
+
+    def blocking_app(environ, start_response):
+        try:
+            barrier.wait()
+            status = '200 OK'
+        except threading.BrokenBarrierError:
+            status = '504 Gateway Timeout'
+        start_response(status, [('Content-Type', 'text/plain')])
+        return [b'']
+
+    async def main(app):
+        return await asyncio.gather(*(_asgi_get(app, '/') for _ in range(4)))
+
+    assert asyncio.run(main(asgi.ThreadedWsgiToAsgi(blocking_app))) == [200, 200, 200, 200]
+
+    # And never more than max_threads at a time
+    barrier = threading.Barrier(4, timeout=0.5)
+    assert 504 in asyncio.run(main(asgi.ThreadedWsgiToAsgi(blocking_app, max_threads=2)))
@@ -0,0 +1,55 @@
+import json
+
+from app import create_app
+from app.startup_profile import parse_importtime, package_totals, compare_reports
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     sqlalchemy.sql
+import time:       500 |       3000 |   sqlalchemy
+import time:       300 |        300 | models
+"""
+
+
+def test_parse_importtime_rows():
+    rows = parse_importtime(SAMPLE)
+    assert [r['module'] for r in rows] == ['_io', 'sqlalchemy.sql', 'sqlalchemy', 'models']
+    assert rows[1] == {'module': 'sqlalchemy.sql', 'self_us': 2000, 'cumulative_us': 2500, 'depth': 2}
+    assert package_totals(rows)['sqlalchemy'] == 2500
+
+
+def _report(import_s, packages):
+    return {'commit': 'x', 'phases': {'import_seconds': import_s, 'create_app_seconds': 0.1, 'rss_delta_mb': 50},
+            'packages': packages}
+
+
+def test_compare_flags_only_real_regressions():
+    base = _report(0.400, {'sqlalchemy': 20_000, 'pydantic': 10_000})
+    noise = compare_reports(base, _report(0.402, {'sqlalchemy': 20_500, 'pydantic': 10_000}))
+    assert not noise['regressed']
+
+    slower = compare_reports(base, _report(0.400, {'sqlalchemy': 20_000, 'pydantic': 10_000, 'fitz': 80_000}))
+    assert slower['regressed']
+    assert slower['packages'][0]['package'] == 'fitz'
+
+
+def test_compare_with_phase_only_report():
+    base = _report(0.400, {})
+    del base['packages']
+    diff = compare_reports(base, _report(0.400, {'fitz': 80_000}))
+    assert diff['regressed'] and diff['packages'][0]['package'] == 'fitz'
+    assert not compare_reports(_report(0.400, {}), {'commit': 'y'})['regressed']
+
+
+def test_profile_startup_command_writes_report(tmp_path):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    output = tmp_path / 'startup.json'
+
+    result = app.test_cli_runner().invoke(args=['profile-startup', '--output', str(output), '--top', '3'])
+
+    assert result.exit_code == 0, result.output
+    report = json.loads(output.read_text())
+    assert report['phases']['create_app_seconds'] > 0
+    assert report['phases']['rss_after_create_app_mb'] >= report['phases']['rss_start_mb']
+    assert 'flask' in report['packages']
@@ -0,0 +1,43 @@
+import os
+
+from app import create_app
+
+
+def _make_app(cache_dir, **extra):
+    config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'TEMPLATE_BYTECODE_CACHE_DIR': str(cache_dir),
+        'TEMPLATES_AUTO_RELOAD': False,
+    }
+    config.update(extra)
+    return create_app(config)
+
+
+def test_compile_templates_command_fills_bytecode_cache(tmp_path):
+    cache_dir = tmp_path / 'jinja'
+    app = _make_app(cache_dir)
+
+    result = app.test_cli_runner().invoke(args=['compile-templates'])
+
+    assert result.exit_code == 0, result.output
+    assert 'Compiled' in result.output
+    cached = os.listdir(cache_dir)
+    assert len(cached) >= len([n for n in app.jinja_env.list_templates() if n.startswith('residencies/')])
+    assert all(name.startswith('nexora-') for name in cached)
+
+
+def test_fresh_app_loads_precompiled_bytecode(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'jinja'
+    _make_app(cache_dir).test_cli_runner().invoke(args=['compile-templates'])
+
+    fresh = _make_app(cache_dir)
+    compiled = []
+    monkeypatch.setattr(fresh.jinja_env, 'compile', lambda *a, **kw: compiled.append(a) or None)
+    fresh.jinja_env.get_template('terms.html')
+    assert compiled == []
+
+
+def test_auto_reload_follows_config(tmp_path):
+    assert _make_app(tmp_path).jinja_env.auto_reload is False
+    assert _make_app(tmp_path, TEMPLATES_AUTO_RELOAD=True).jinja_env.auto_reload is True
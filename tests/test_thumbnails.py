@@ -0,0 +1,86 @@
+import os
+
+import pytest
+from PIL import Image
+
+from app import create_app
+from app import thumbnails
+
+
+@pytest.fixture
+def app(tmp_path):
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+    })
+
+
+@pytest.fixture
+def scan(tmp_path):
+    path = tmp_path / 'passport_scan.jpg'
+    Image.new('RGB', (2400, 3200), (220, 220, 210)).save(path, 'JPEG')
+    return str(path)
+
+
+def test_thumbnail_is_cached_by_source_hash(app, scan):
+    with app.app_context():
+        first = thumbnails.render_thumbnail(scan, 128)
+        assert first.startswith(thumbnails.cache_dir())
+        assert os.path.basename(first).startswith(thumbnails.source_digest(scan))
+        with Image.open(first) as img:
+            assert max(img.size) == 128
+
+        mtime = os.path.getmtime(first)
+        assert thumbnails.render_thumbnail(scan, 128) == first
+        assert os.path.getmtime(first) == mtime
+
+
+def test_changed_source_gets_new_thumbnail(app, scan):
+    with app.app_context():
+        first = thumbnails.render_thumbnail(scan, 64)
+        Image.new('RGB', (800, 600), (0, 0, 0)).save(scan, 'JPEG')
+        assert thumbnails.render_thumbnail(scan, 64) != first
+
+
+def test_unsupported_sources(app, tmp_path):
+    doc = tmp_path / 'notes.docx'
+    doc.write_bytes(b'PK\x03\x04')
+    with app.app_context():
+        assert thumbnails.render_thumbnail(str(doc), 128) is None
+        with pytest.raises(ValueError):
+            thumbnails.render_thumbnail(str(doc), 100)
+
+
+def test_serve_thumbnail_sets_long_lived_cache_headers(app, scan):
+    with app.test_request_context(headers={'Accept': 'image/avif,image/webp,*/*'}):
+        response = thumbnails.serve_thumbnail(scan, 256)
+        assert response.mimetype == 'image/webp'
+        assert response.cache_control.max_age == thumbnails.CACHE_MAX_AGE
+        assert response.cache_control.immutable
+        assert response.cache_control.private
+        assert 'Accept' in response.vary
+        response.close()
+
+
+def test_serve_thumbnail_falls_back_to_jpeg(app, scan, monkeypatch):
+    with app.test_request_context(headers={'Accept': 'image/png,*/*'}):
+        response = thumbnails.serve_thumbnail(scan, 256)
+        assert response.mimetype == 'image/jpeg' and 'Accept' in response.vary
+        response.close()
+
+    monkeypatch.setattr(thumbnails, 'webp_supported', lambda: False)
+    with app.test_request_context(headers={'Accept': 'image/webp,*/*'}):
+        response = thumbnails.serve_thumbnail(scan, 256)
+        assert response.mimetype == 'image/jpeg'
+        response.close()
+        assert thumbnails.render_thumbnail(scan, 128).endswith('.jpg')
+
+
+def test_digest_cache_is_bounded(tmp_path):
+    for i in range(thumbnails.DIGEST_CACHE_SIZE + 10):
+        path = tmp_path / f'{i}.txt'
+        path.write_text(str(i))
+        thumbnails.source_digest(str(path))
+    info = thumbnails._file_digest.cache_info()
+    assert info.currsize == info.maxsize == thumbnails.DIGEST_CACHE_SIZE